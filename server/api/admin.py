@@ -1,10 +1,14 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from api.users.models import User
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from api.jobs.models import Job
+from api.users.models import User, RevokedToken
+from api.users.revocation import revoke_user_tokens
 from api.projects.models import Project, Task
 from api.moodboards.models import Moodboard, MoodboardItem
 from api.vendors.models import (
-    ServiceCategory, ArtisanProfile, PortfolioItem, Review
+    ServiceCategory, ArtisanProfile, PortfolioItem, Review, ArtisanBooking
 )
 
 
@@ -31,6 +35,27 @@ class UserAdmin(BaseUserAdmin):
             'fields': ('email', 'password1', 'password2', 'first_name', 'last_name', 'role'),
         }),
     )
+    actions = ['disable_and_revoke_tokens']
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and 'is_active' in form.changed_data and not obj.is_active:
+            revoke_user_tokens(obj)
+
+    @admin.action(description='Disable selected users and revoke their tokens')
+    def disable_and_revoke_tokens(self, request, queryset):
+        for user in queryset:
+            user.is_active = False
+            user.save(update_fields=['is_active'])
+            revoke_user_tokens(user)
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ['jti', 'user', 'token_type', 'reason', 'revoked_at', 'expires_at']
+    list_filter = ['reason', 'token_type']
+    search_fields = ['jti', 'user__email']
+    readonly_fields = ['jti', 'user', 'token_type', 'reason', 'revoked_at', 'expires_at']
 
 
 @admin.register(Project)
@@ -111,3 +136,34 @@ class ReviewAdmin(admin.ModelAdmin):
     search_fields = ['artisan__business_name', 'reviewer__email', 'title', 'comment']
     readonly_fields = ['created_at', 'updated_at']
 
+
+@admin.register(ArtisanBooking)
+class ArtisanBookingAdmin(admin.ModelAdmin):
+    list_display = ['artisan', 'kind', 'start_date', 'end_date', 'project']
+    list_filter = ['kind', 'start_date']
+    search_fields = ['artisan__business_name', 'note']
+    date_hierarchy = 'start_date'
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'queue', 'status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'finished_at']
+    list_filter = ['status', 'queue', 'name']
+    search_fields = ['name', 'dedupe_key', 'last_error']
+    readonly_fields = ['created_at', 'finished_at', 'locked_by', 'locked_at']
+    actions = ['retry_now']
+
+    @admin.action(description='Queue selected failed jobs to run again now')
+    def retry_now(self, request, queryset):
+        skipped = 0
+        for job in queryset.filter(status=Job.FAILED):
+            try:
+                with transaction.atomic():
+                    Job.objects.filter(pk=job.pk).update(
+                        status=Job.QUEUED, attempts=0, run_at=timezone.now(), finished_at=None,
+                    )
+            except IntegrityError:
+                # Another job with the same dedupe key is already queued
+                skipped += 1
+        if skipped:
+            self.message_user(request, f'{skipped} jobs skipped: an equivalent job is already queued')
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .db.sqlite import configure_connection
+        connection_created.connect(configure_connection, dispatch_uid='api.db.sqlite')
+
+        from .middleware import get_config, install_query_recorder, install_serializer_timing
+        connection_created.connect(install_query_recorder, dispatch_uid='api.middleware.queries')
+        if get_config()['ENABLED']:
+            install_serializer_timing()
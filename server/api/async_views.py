@@ -0,0 +1,201 @@
+"""
+Async list/retrieve for the read-heavy viewsets, served under ASGI.
+
+With ``ASYNC_READS`` on (opt-in, for ASGI deployments), the list and
+detail routes of ``ASYNC_READ_VIEWSETS`` are served by a coroutine instead
+of the DRF view. Authentication, permissions and throttling still run
+through the viewset's ``initial()``. That is one worker-thread hop, because
+the JWT user lookup is sync. The queryset comes from the viewset's own
+``get_queryset``/``filter_queryset`` and is read with ``acount``,
+``aiterator`` and ``aget``. The relations each serializer touches are
+prefetched, so serialization never queries from the event loop. Any other
+method on the same URLs goes to the regular DRF view.
+
+Identical concurrent artisan searches share one in-flight list, as on the
+sync path, through ``SingleFlight.ado``.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import SynchronousOnlyOperation, ValidationError
+from django.core.paginator import InvalidPage, Page
+from django.http import Http404, HttpResponse
+from django.urls import URLPattern
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from api.middleware import note_view_finished
+from api.streaming import wants_stream
+from api.moodboards.views import MoodboardItemViewSet, MoodboardViewSet
+from api.projects.views import ProjectViewSet, TaskViewSet
+from api.vendors.cache import VersionedCacheMixin, request_fingerprint
+from api.vendors.views import ArtisanProfileViewSet
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = ('GET', 'HEAD')
+
+# Relations each action's serializer reads, loaded with the page
+ASYNC_READ_VIEWSETS = {
+    ProjectViewSet: {
+        'list': {'prefetch_related': ['tasks']},
+        'retrieve': {'prefetch_related': ['tasks']},
+    },
+    TaskViewSet: {},
+    MoodboardViewSet: {
+        'list': {'prefetch_related': ['items']},
+        'retrieve': {'prefetch_related': ['items']},
+    },
+    MoodboardItemViewSet: {},
+    ArtisanProfileViewSet: {
+        'list': {'select_related': ['user'], 'prefetch_related': ['services']},
+        'retrieve': {
+            'select_related': ['user'],
+            'prefetch_related': ['services', 'portfolio', 'reviews__reviewer'],
+        },
+    },
+}
+
+
+class AsyncReadView:
+    def __init__(self, viewset, actions, initkwargs, sync_view, related):
+        self.viewset = viewset
+        self.actions = actions
+        self.initkwargs = initkwargs
+        self.sync_view = sync_view
+        self.related = related
+
+    def as_view(self):
+        async def view(request, *args, **kwargs):
+            return await self.dispatch(request, *args, **kwargs)
+
+        # What DRF's as_view() exposes, for introspection and the metrics middleware
+        view.cls = self.viewset
+        view.actions = self.actions
+        view.initkwargs = self.initkwargs
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        # Streamed lists come from the DRF view; api.streaming adapts them to ASGI
+        if request.method not in READ_METHODS or wants_stream(request):
+            return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+
+        view = self.viewset(**self.initkwargs, action_map={'head': self.actions['get'], **self.actions})
+        view.args, view.kwargs = args, kwargs
+        drf_request = view.initialize_request(request, *args, **kwargs)
+        view.request = drf_request
+        view.headers = view.default_response_headers
+        try:
+            await sync_to_async(view.initial)(drf_request, *args, **kwargs)
+            handler = self.list if view.action == 'list' else self.retrieve
+
+            async def respond():
+                return await handler(view, drf_request, **kwargs)
+
+            async def cached():
+                if isinstance(view, VersionedCacheMixin):
+                    return await view.acached_response(respond, drf_request, **kwargs)
+                return await respond()
+
+            response = await self.coalesced(view, drf_request, cached)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+        note_view_finished()
+        return self.render(view.finalize_response(drf_request, response, *args, **kwargs))
+
+    async def coalesced(self, view, request, fetch):
+        """Share one ``fetch()`` between identical concurrent lists of viewsets with a ``list_flight``"""
+        flight = getattr(view, 'list_flight', None)
+        if flight is None or view.action != 'list':
+            return await fetch()
+        # Same key as the sync list, so both paths coalesce the same requests
+        key = request_fingerprint(request, str(request.user.is_authenticated))
+        response, shared = await flight.ado(key, fetch)
+        if shared:
+            # Each caller needs its own response object to render
+            response = Response(response.data, status=response.status_code)
+            response['X-Coalesced'] = '1'
+        return response
+
+    def render(self, response):
+        """
+        Render here and hand Django a plain response: a response with a
+        ``render()`` method would be rendered on a worker thread.
+        """
+        response.render()
+        plain = HttpResponse(response.content, status=response.status_code)
+        for header, value in response.items():
+            plain[header] = value
+        plain.cookies = response.cookies
+        return plain
+
+    def optimize(self, view, queryset):
+        related = self.related.get(view.action, {})
+        if related.get('select_related'):
+            queryset = queryset.select_related(*related['select_related'])
+        if related.get('prefetch_related'):
+            queryset = queryset.prefetch_related(*related['prefetch_related'])
+        return queryset
+
+    async def serialize(self, view, instance, many=False):
+        try:
+            return view.get_serializer(instance, many=many).data
+        except SynchronousOnlyOperation:
+            # A relation missing from ASYNC_READ_VIEWSETS; still correct, just slower
+            logger.warning('%s.%s queried while serializing; add its relations to ASYNC_READ_VIEWSETS',
+                           self.viewset.__name__, view.action)
+            serializer = view.get_serializer(instance, many=many)
+            return await sync_to_async(lambda: serializer.data)()
+
+    async def list(self, view, request):
+        queryset = self.optimize(view, view.filter_queryset(view.get_queryset()))
+        pagination = view.paginator
+        if pagination is not None and not isinstance(pagination, PageNumberPagination):
+            return await sync_to_async(view.list)(request)
+        page_size = pagination.get_page_size(request) if pagination is not None else None
+        if not page_size:
+            objects = [obj async for obj in queryset.aiterator(chunk_size=2000)]
+            return Response(await self.serialize(view, objects, many=True))
+
+        paginator = pagination.django_paginator_class([], page_size)
+        # Count in the database; the paginator only does the page arithmetic
+        paginator.count = await queryset.acount()
+        number = pagination.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(number)
+        except InvalidPage as exc:
+            raise NotFound(pagination.invalid_page_message.format(page_number=number, message=str(exc)))
+        offset = (number - 1) * page_size
+        objects = [obj async for obj in queryset[offset:offset + page_size].aiterator(chunk_size=page_size)]
+
+        pagination.request = request
+        pagination.page = Page(objects, number, paginator)
+        return pagination.get_paginated_response(await self.serialize(view, objects, many=True))
+
+    async def retrieve(self, view, request, **kwargs):
+        queryset = self.optimize(view, view.filter_queryset(view.get_queryset()))
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        try:
+            obj = await queryset.aget(**{view.lookup_field: kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        view.check_object_permissions(request, obj)
+        return Response(await self.serialize(view, obj))
+
+
+def async_read_urls(patterns):
+    """``patterns`` with the list/detail routes of ``ASYNC_READ_VIEWSETS`` served async"""
+    result = []
+    for pattern in patterns:
+        callback = pattern.callback
+        viewset = getattr(callback, 'cls', None)
+        actions = getattr(callback, 'actions', None) or {}
+        if viewset in ASYNC_READ_VIEWSETS and actions.get('get') in ('list', 'retrieve'):
+            view = AsyncReadView(
+                viewset, actions, callback.initkwargs, callback, ASYNC_READ_VIEWSETS[viewset],
+            ).as_view()
+            pattern = URLPattern(pattern.pattern, view, pattern.default_args, pattern.name)
+        result.append(pattern)
+    return result
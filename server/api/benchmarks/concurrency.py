@@ -0,0 +1,157 @@
+"""
+Closed-loop load against the project's WSGI or ASGI application, in process.
+
+``clients`` asyncio tasks each send ``requests_per_client`` GET requests, one
+after another, cycling through ``paths``. In ``wsgi`` mode every request runs
+on a pool of ``threads`` worker threads, as in a threaded WSGI server
+(gunicorn ``gthread``, mod_wsgi). In ``asgi`` mode the event loop awaits the
+ASGI application directly, as uvicorn does. Latency runs from sending a
+request to its last body byte, so it includes waiting for a free worker.
+No sockets are involved: the comparison is between the two request
+pipelines, not HTTP servers.
+"""
+import asyncio
+import io
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from api.benchmarks.runner import percentile
+
+MODES = ('wsgi', 'asgi')
+
+
+def wsgi_environ(path, headers):
+    path, _, query = path.partition('?')
+    environ = {
+        'REQUEST_METHOD': 'GET', 'SCRIPT_NAME': '', 'PATH_INFO': path, 'QUERY_STRING': query,
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'REMOTE_ADDR': '127.0.0.1',
+        'HTTP_HOST': 'localhost',
+        'wsgi.version': (1, 0), 'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+    for name, value in headers.items():
+        environ[f'HTTP_{name.upper().replace("-", "_")}'] = value
+    return environ
+
+
+def call_wsgi(application, path, headers):
+    """Send one request through ``application``; return the status code"""
+    status = []
+
+    def start_response(value, response_headers, exc_info=None):
+        status.append(int(value.split()[0]))
+
+    body = application(wsgi_environ(path, headers), start_response)
+    try:
+        for _ in body:
+            pass
+    finally:
+        # Fires request_finished, which returns the thread's database connection
+        body.close()
+    return status[0]
+
+
+async def call_asgi(application, path, headers):
+    """Send one request through ``application``; return the status code"""
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': query.encode(), 'root_path': '',
+        'headers': [(b'host', b'localhost')] + [
+            (name.lower().encode(), value.encode()) for name, value in headers.items()
+        ],
+        'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+    }
+    body_sent = False
+    status = []
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # The client never disconnects; Django cancels this wait when it's done
+        await asyncio.Future()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await application(scope, receive, send)
+    return status[0]
+
+
+def run_load(mode, paths, headers, clients=500, requests_per_client=10, threads=32):
+    """Return throughput, latency percentiles, errors and the peak thread count"""
+    return asyncio.run(_run_load(mode, paths, headers, clients, requests_per_client, threads))
+
+
+async def _run_load(mode, paths, headers, clients, requests_per_client, threads):
+    if mode == 'wsgi':
+        from django.core.wsgi import get_wsgi_application
+
+        application = get_wsgi_application()
+        executor = ThreadPoolExecutor(threads, thread_name_prefix='wsgi-worker')
+        loop = asyncio.get_running_loop()
+
+        async def send(path):
+            return await loop.run_in_executor(executor, call_wsgi, application, path, headers)
+    else:
+        from django.core.asgi import get_asgi_application
+
+        application = get_asgi_application()
+        executor = None
+
+        async def send(path):
+            return await call_asgi(application, path, headers)
+
+    # Warm up each route once: imports, URL resolution, serializer fields
+    for path in paths:
+        await send(path)
+
+    latencies, errors = [], Counter()
+    peak_threads = threading.active_count()
+    done = asyncio.Event()
+
+    async def client(index):
+        for number in range(requests_per_client):
+            path = paths[(index + number) % len(paths)]
+            started = time.perf_counter()
+            try:
+                status = await send(path)
+            except Exception as exc:
+                errors[type(exc).__name__] += 1
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status >= 400:
+                errors[f'HTTP {status}'] += 1
+
+    async def watch_threads():
+        nonlocal peak_threads
+        while not done.is_set():
+            peak_threads = max(peak_threads, threading.active_count())
+            await asyncio.sleep(0.05)
+
+    watcher = asyncio.create_task(watch_threads())
+    started = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(clients)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await watcher
+    if executor is not None:
+        executor.shutdown()
+
+    return {
+        'mode': mode,
+        'requests': len(latencies),
+        'seconds': round(elapsed, 2),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5), 1) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95), 1) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99), 1) if latencies else None,
+        'errors': dict(errors),
+        'peak_threads': peak_threads,
+    }
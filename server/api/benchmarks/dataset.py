@@ -0,0 +1,201 @@
+"""
+Parametrized, reproducible dataset for benchmarks.
+
+``build_dataset(scale, seed)`` inserts ``SIZES`` times ``scale`` rows of
+every marketplace and project model with ``bulk_create`` in batches. The
+same seed always produces the same rows. The first designer owns the
+sample objects that detail routes are measured on, and is staff so that
+admin routes can be measured too.
+"""
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from api.moodboards.models import Moodboard, MoodboardItem
+from api.projects.models import Project, Task
+from api.vendors.autocomplete import INDEX_VERSION
+from api.vendors.cache import bump_version
+from api.vendors.models import ArtisanBooking, ArtisanProfile, PortfolioItem, Review, ServiceCategory
+from api.vendors.stats import refresh_artisan_stats
+
+User = get_user_model()
+
+# Rows per unit of scale
+SIZES = {
+    'designers': 20,
+    'clients': 40,
+    'artisans': 30,
+    'projects_per_designer': 5,
+    'tasks_per_project': 10,
+    'moodboards_per_project': 2,
+    'items_per_moodboard': 12,
+    'portfolio_per_artisan': 6,
+    'reviews_per_artisan': 12,
+    'bookings_per_artisan': 4,
+}
+
+CATEGORIES = ['Carpentry', 'Painting', 'Flooring', 'Upholstery', 'Lighting', 'Metalwork', 'Tiling', 'Plumbing']
+FIRST_NAMES = ['Adaeze', 'Chidi', 'Amina', 'Tunde', 'Ngozi', 'Emeka', 'Fatima', 'Bola', 'Kemi', 'Musa', 'Ifeoma', 'Yusuf']
+LAST_NAMES = ['Okonkwo', 'Nnamdi', 'Yusuf', 'Adeyemi', 'Bello', 'Okoro', 'Nwosu', 'Balogun', 'Eze', 'Lawal']
+CITIES = [('Lagos', 'Lagos'), ('Abuja', 'FCT'), ('Ibadan', 'Oyo'), ('Enugu', 'Enugu'), ('Port Harcourt', 'Rivers'), ('Kaduna', 'Kaduna')]
+STATUSES = ['todo', 'in_progress', 'done']
+LEVELS = ['beginner', 'intermediate', 'expert', 'master']
+WORDS = (
+    'bespoke walnut oak brass linen velvet terrazzo marble pendant sconce alcove mural '
+    'shelving wardrobe headboard joinery veneer lacquer patina rattan cane plaster'
+).split()
+
+PASSWORD = 'bench-pass-123'
+
+
+class Dataset:
+    """Primary keys of the sample objects, by router basename, plus the users to request as"""
+
+    def __init__(self, counts, pks, users):
+        self.counts = counts
+        self.pks = pks
+        self.users = users
+
+
+def sentence(rng, words=8):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def bulk(model, objects, batch_size):
+    return model.objects.bulk_create(objects, batch_size=batch_size)
+
+
+def build_dataset(scale=1, seed=0, batch_size=1000, email_domain='bench.example.com'):
+    """Insert the dataset and return a ``Dataset``"""
+    rng = random.Random(seed)
+    # Top-level counts grow with scale; per-parent counts stay fixed
+    sizes = {key: value if '_per_' in key else value * scale for key, value in SIZES.items()}
+    # One hash for everyone; hashing per user would dominate build time
+    password_hash = make_password(PASSWORD)
+    today = date.today()
+
+    def person(role, index):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        city, state = rng.choice(CITIES)
+        return User(
+            email=f'{role}{index}@{email_domain}', password=password_hash, first_name=first, last_name=last,
+            role=role, location=f'{city}, {state}',
+            is_verified=role == 'artisan' and rng.random() < 0.7,
+            business_name=f'{last} {rng.choice(CATEGORIES)} Works' if role == 'artisan' else '',
+        )
+
+    with transaction.atomic():
+        categories = bulk(ServiceCategory, [
+            ServiceCategory(name=name, description=sentence(rng), icon='') for name in CATEGORIES
+        ], batch_size)
+
+        designers = [person('designer', i) for i in range(sizes['designers'])]
+        designers[0].is_staff = True
+        clients = [person('client', i) for i in range(sizes['clients'])]
+        artisan_users = [person('artisan', i) for i in range(sizes['artisans'])]
+        bulk(User, designers + clients + artisan_users, batch_size)
+
+        projects = bulk(Project, [
+            Project(
+                user=designer, name=f'{rng.choice(WORDS).title()} {rng.choice(["Residence", "Office", "Suite", "Villa"])}',
+                description=sentence(rng, 20), client_name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                start_date=today - timedelta(days=rng.randrange(365)), end_date=today + timedelta(days=rng.randrange(365)),
+            )
+            for designer in designers for _ in range(sizes['projects_per_designer'])
+        ], batch_size)
+        tasks = bulk(Task, [
+            Task(
+                project=project, title=sentence(rng, 4), description=sentence(rng, 15),
+                status=rng.choice(STATUSES), due_date=today + timedelta(days=rng.randrange(120)),
+            )
+            for project in projects for _ in range(sizes['tasks_per_project'])
+        ], batch_size)
+        moodboards = bulk(Moodboard, [
+            Moodboard(project=project, title=sentence(rng, 3), description=sentence(rng, 10))
+            for project in projects for _ in range(sizes['moodboards_per_project'])
+        ], batch_size)
+        items = bulk(MoodboardItem, [
+            MoodboardItem(
+                moodboard=moodboard, image=f'https://images.example.com/{rng.getrandbits(48):x}.jpg',
+                x=rng.uniform(0, 1200), y=rng.uniform(0, 800), width=rng.uniform(80, 400), height=rng.uniform(80, 400),
+            )
+            for moodboard in moodboards for _ in range(sizes['items_per_moodboard'])
+        ], batch_size)
+
+        artisans = []
+        for user in artisan_users:
+            city, state = rng.choice(CITIES)
+            artisans.append(ArtisanProfile(
+                user=user, business_name=user.business_name, description=sentence(rng, 30),
+                experience_level=rng.choice(LEVELS), years_of_experience=rng.randrange(1, 30),
+                phone=f'+234{rng.randrange(10 ** 9, 10 ** 10)}', email=user.email, city=city, state=state,
+                hourly_rate=rng.randrange(20, 200), min_project_budget=rng.randrange(500, 20000, 500),
+                is_available=rng.random() < 0.8, is_featured=rng.random() < 0.1,
+            ))
+        bulk(ArtisanProfile, artisans, batch_size)
+        Through = ArtisanProfile.services.through
+        bulk(Through, [
+            Through(artisanprofile_id=artisan.pk, servicecategory_id=category.pk)
+            for artisan in artisans for category in rng.sample(categories, rng.randrange(1, 4))
+        ], batch_size)
+
+        portfolio = bulk(PortfolioItem, [
+            PortfolioItem(
+                artisan=artisan, title=sentence(rng, 4), description=sentence(rng, 12),
+                image=f'https://images.example.com/{rng.getrandbits(48):x}.jpg',
+                project_date=today - timedelta(days=rng.randrange(2000)),
+            )
+            for artisan in artisans for _ in range(sizes['portfolio_per_artisan'])
+        ], batch_size)
+        reviewers = designers + clients
+        reviews = []
+        for artisan in artisans:
+            # unique (artisan, reviewer, project): distinct reviewers, no project
+            for reviewer in rng.sample(reviewers, min(sizes['reviews_per_artisan'], len(reviewers))):
+                reviews.append(Review(
+                    artisan=artisan, reviewer=reviewer, rating=rng.randint(1, 5), title=sentence(rng, 3),
+                    comment=sentence(rng, 25), professionalism=rng.randint(1, 5), quality_of_work=rng.randint(1, 5),
+                    timeliness=rng.randint(1, 5), communication=rng.randint(1, 5),
+                ))
+        reviews = bulk(Review, reviews, batch_size)
+        bookings = []
+        for artisan in artisans:
+            start = today
+            for _ in range(sizes['bookings_per_artisan']):
+                start += timedelta(days=rng.randrange(1, 20))
+                end = start + timedelta(days=rng.randrange(0, 10))
+                bookings.append(ArtisanBooking(
+                    artisan=artisan, kind=rng.choice(['booked', 'blocked']), start_date=start, end_date=end,
+                    note=sentence(rng, 3)[:200],
+                ))
+                start = end
+        bookings = bulk(ArtisanBooking, bookings, batch_size)
+
+        refresh_artisan_stats()
+    for model in (ServiceCategory, ArtisanProfile, PortfolioItem, Review, ArtisanBooking, User, INDEX_VERSION):
+        bump_version(model)
+
+    owner = designers[0]
+    owned_project = projects[0]
+    owned_moodboard = moodboards[0]
+    counts = {
+        'users': len(designers) + len(clients) + len(artisan_users), 'projects': len(projects), 'tasks': len(tasks),
+        'moodboards': len(moodboards), 'moodboard_items': len(items), 'artisans': len(artisans),
+        'portfolio_items': len(portfolio), 'reviews': len(reviews), 'bookings': len(bookings),
+    }
+    pks = {
+        'user': owner.pk,
+        'project': owned_project.pk,
+        'task': tasks[0].pk,
+        'moodboard': owned_moodboard.pk,
+        'moodboard-item': items[0].pk,
+        'service-category': categories[0].pk,
+        'artisan': artisans[0].pk,
+        'portfolio-item': portfolio[0].pk,
+        'review': reviews[0].pk,
+        'artisan-booking': bookings[0].pk,
+    }
+    return Dataset(counts, pks, users={'owner': owner.pk, 'artisan': artisan_users[0].pk})
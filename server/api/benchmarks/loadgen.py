@@ -0,0 +1,309 @@
+"""
+Synthetic data at load-testing scale.
+
+``LoadGenerator`` writes users with their projects, tasks, moodboards and
+moodboard items, then artisans with portfolios, reviews and bookings. Rows
+are generated and inserted one block of parents at a time, each block in
+its own transaction, so memory stays flat however many rows are written.
+Primary keys are assigned up front from the table's current maximum. That
+way children reference their parents without reading ids back, and the
+same seed against the same starting ids produces identical rows. Dates are
+relative to today.
+
+Parents (users, projects, moodboards, artisan profiles) go through
+``bulk_create``. The high-volume child tables are written as plain tuples
+with ``executemany``: on Django 5.0 ``bulk_create`` spends most of its time
+in per-value ``pre_save``/``get_db_prep_save`` calls and tops out at a few
+thousand rows per second, an order of magnitude below the raw insert.
+
+Every user shares one password hash. ``hasher`` picks the algorithm, so
+under ``PASSWORD_HASHER_PROFILE=fast`` load-test logins cost an MD5 rather
+than a PBKDF2 run.
+"""
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from api.moodboards.models import Moodboard, MoodboardItem
+from api.projects.models import Project, Task
+from api.vendors.autocomplete import INDEX_VERSION
+from api.vendors.cache import bump_version
+from api.vendors.models import ArtisanBooking, ArtisanProfile, PortfolioItem, Review, ServiceCategory
+from api.vendors.stats import refresh_artisan_stats
+
+from .dataset import CATEGORIES, CITIES, FIRST_NAMES, LAST_NAMES, LEVELS, PASSWORD, STATUSES, WORDS
+
+User = get_user_model()
+
+DEFAULTS = {
+    'users': 10000,
+    'projects_per_user': 5,
+    'tasks_per_project': 20,
+    'boards_per_project': 2,
+    'items_per_board': 20,
+    'artisans': 2000,
+    'portfolio_per_artisan': 6,
+    'reviews_per_artisan': 25,
+    'bookings_per_artisan': 4,
+}
+
+
+class IdRange:
+    """Hands out consecutive primary keys after the table's current maximum"""
+
+    def __init__(self, model):
+        self.model = model
+        self.next = (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+    def take(self):
+        value = self.next
+        self.next += 1
+        return value
+
+
+class RowWriter:
+    """``executemany`` INSERTs of value tuples ordered like ``fields``"""
+
+    def __init__(self, model, fields):
+        qn = connection.ops.quote_name
+        columns = [model._meta.get_field(name).column for name in fields]
+        self.sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            qn(model._meta.db_table), ', '.join(qn(column) for column in columns), ', '.join(['%s'] * len(columns)),
+        )
+
+    def write(self, rows, chunk_size):
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), chunk_size):
+                cursor.executemany(self.sql, rows[start:start + chunk_size])
+
+
+class LoadGenerator:
+    def __init__(self, seed=0, chunk_size=5000, password=PASSWORD, hasher='default',
+                 email_domain='load.example.com', progress=None, **sizes):
+        unknown = set(sizes) - set(DEFAULTS)
+        if unknown:
+            raise TypeError(f'Unknown sizes: {", ".join(sorted(unknown))}')
+        self.sizes = {**DEFAULTS, **sizes}
+        if self.sizes['reviews_per_artisan'] > self.sizes['users']:
+            raise ValueError('reviews_per_artisan cannot exceed users: each review needs a distinct reviewer')
+        self.rng = random.Random(seed)
+        self.chunk_size = chunk_size
+        self.password_hash = make_password(password, hasher=hasher)
+        self.email_domain = email_domain
+        self.progress = progress
+        self.today = date.today()
+        self.days = {}
+        self.written = {}
+
+    def plan(self):
+        """Rows each model will receive"""
+        s = self.sizes
+        projects = s['users'] * s['projects_per_user']
+        boards = projects * s['boards_per_project']
+        return {
+            'users': s['users'] + s['artisans'],
+            'projects': projects,
+            'tasks': projects * s['tasks_per_project'],
+            'moodboards': boards,
+            'moodboard_items': boards * s['items_per_board'],
+            'artisans': s['artisans'],
+            'portfolio_items': s['artisans'] * s['portfolio_per_artisan'],
+            'reviews': s['artisans'] * s['reviews_per_artisan'],
+            'bookings': s['artisans'] * s['bookings_per_artisan'],
+        }
+
+    # Helpers
+
+    def sentence(self, words=8):
+        return ' '.join(self.rng.choices(WORDS, k=words)).capitalize() + '.'
+
+    def image(self):
+        return f'https://images.example.com/{self.rng.getrandbits(48):x}.jpg'
+
+    def insert(self, name, model, objects):
+        model.objects.bulk_create(objects, batch_size=self.chunk_size)
+        self.written[name] = self.written.get(name, 0) + len(objects)
+
+    def insert_rows(self, name, writer, rows):
+        writer.write(rows, self.chunk_size)
+        self.written[name] = self.written.get(name, 0) + len(rows)
+
+    def parents_per_block(self, rows_per_parent):
+        return max(1, self.chunk_size // max(1, rows_per_parent))
+
+    def report(self, started):
+        if self.progress:
+            total = sum(self.written.values())
+            elapsed = time.perf_counter() - started
+            self.progress(f'{total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)')
+
+    def user(self, pk, role):
+        rng = self.rng
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        city, state = rng.choice(CITIES)
+        return User(
+            pk=pk, email=f'{role}{pk}@{self.email_domain}', password=self.password_hash,
+            first_name=first, last_name=last, role=role, location=f'{city}, {state}',
+            is_verified=role == 'artisan' and rng.random() < 0.7,
+            business_name=f'{last} {rng.choice(CATEGORIES)} Works' if role == 'artisan' else '',
+        )
+
+    # Generation
+
+    def run(self):
+        """Write everything and return the rows written per model"""
+        started = time.perf_counter()
+        self.ids = {model: IdRange(model) for model in (
+            User, Project, Task, Moodboard, MoodboardItem, ArtisanProfile, PortfolioItem, Review, ArtisanBooking,
+        )}
+        self.first_user = self.ids[User].next
+        self.writers = {
+            Task: RowWriter(Task, ['id', 'project', 'title', 'description', 'status', 'due_date', 'created_at', 'updated_at']),
+            MoodboardItem: RowWriter(MoodboardItem, [
+                'id', 'moodboard', 'image', 'x', 'y', 'width', 'height', 'created_at', 'updated_at',
+            ]),
+            PortfolioItem: RowWriter(PortfolioItem, [
+                'id', 'artisan', 'title', 'description', 'image', 'project_date', 'client_name', 'created_at',
+            ]),
+            Review: RowWriter(Review, [
+                'id', 'artisan', 'reviewer', 'rating', 'title', 'comment', 'professionalism', 'quality_of_work',
+                'timeliness', 'communication', 'created_at', 'updated_at',
+            ]),
+            ArtisanBooking: RowWriter(ArtisanBooking, [
+                'id', 'artisan', 'kind', 'start_date', 'end_date', 'note', 'created_at', 'updated_at',
+            ]),
+        }
+        self.categories = self.service_categories()
+
+        s = self.sizes
+        rows_per_user = s['projects_per_user'] * (1 + s['tasks_per_project'] + s['boards_per_project'] * (1 + s['items_per_board']))
+        self.in_blocks(s['users'], self.parents_per_block(rows_per_user), self.designers, started)
+        rows_per_artisan = 2 + s['portfolio_per_artisan'] + s['reviews_per_artisan'] + s['bookings_per_artisan']
+        self.in_blocks(s['artisans'], self.parents_per_block(rows_per_artisan), self.artisans, started)
+
+        self.reset_sequences()
+        refresh_artisan_stats()
+        for model in (ServiceCategory, ArtisanProfile, PortfolioItem, Review, ArtisanBooking, User, INDEX_VERSION):
+            bump_version(model)
+        return dict(self.written)
+
+    def in_blocks(self, total, block_size, write, started):
+        for offset in range(0, total, block_size):
+            with transaction.atomic():
+                write(min(block_size, total - offset))
+            self.report(started)
+
+    def service_categories(self):
+        ServiceCategory.objects.bulk_create(
+            [ServiceCategory(name=name) for name in CATEGORIES], ignore_conflicts=True,
+        )
+        return list(ServiceCategory.objects.filter(name__in=CATEGORIES).values_list('pk', flat=True))
+
+    def timestamps(self):
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        return now, now
+
+    def day(self, offset):
+        # Few distinct offsets; skip the connection lookup on every row
+        if offset not in self.days:
+            self.days[offset] = connection.ops.adapt_datefield_value(self.today + timedelta(days=offset))
+        return self.days[offset]
+
+    def designers(self, count):
+        rng, ids = self.rng, self.ids
+        created = self.timestamps()
+        users = [self.user(ids[User].take(), 'designer') for _ in range(count)]
+        projects, tasks, boards, items = [], [], [], []
+        for user in users:
+            for _ in range(self.sizes['projects_per_user']):
+                project = Project(
+                    pk=ids[Project].take(), user_id=user.pk,
+                    name=f'{rng.choice(WORDS).title()} {rng.choice(["Residence", "Office", "Suite", "Villa"])}',
+                    description=self.sentence(20), client_name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                    start_date=self.today - timedelta(days=rng.randrange(365)),
+                    end_date=self.today + timedelta(days=rng.randrange(365)),
+                )
+                projects.append(project)
+                tasks.extend(
+                    (ids[Task].take(), project.pk, self.sentence(4), self.sentence(15), rng.choice(STATUSES),
+                     self.day(rng.randrange(120)), *created)
+                    for _ in range(self.sizes['tasks_per_project'])
+                )
+                for _ in range(self.sizes['boards_per_project']):
+                    board = Moodboard(pk=ids[Moodboard].take(), project_id=project.pk,
+                                      title=self.sentence(3), description=self.sentence(10))
+                    boards.append(board)
+                    items.extend(
+                        (ids[MoodboardItem].take(), board.pk, self.image(), rng.uniform(0, 1200), rng.uniform(0, 800),
+                         rng.uniform(80, 400), rng.uniform(80, 400), *created)
+                        for _ in range(self.sizes['items_per_board'])
+                    )
+        self.insert('users', User, users)
+        self.insert('projects', Project, projects)
+        self.insert_rows('tasks', self.writers[Task], tasks)
+        self.insert('moodboards', Moodboard, boards)
+        self.insert_rows('moodboard_items', self.writers[MoodboardItem], items)
+
+    def artisans(self, count):
+        rng, ids, s = self.rng, self.ids, self.sizes
+        created = self.timestamps()
+        users = [self.user(ids[User].take(), 'artisan') for _ in range(count)]
+        reviewer_ids = range(self.first_user, self.first_user + s['users'])
+        Through = ArtisanProfile.services.through
+        profiles, services, portfolio, reviews, bookings = [], [], [], [], []
+        for user in users:
+            city, state = rng.choice(CITIES)
+            profile = ArtisanProfile(
+                pk=ids[ArtisanProfile].take(), user_id=user.pk, business_name=user.business_name,
+                description=self.sentence(30), experience_level=rng.choice(LEVELS),
+                years_of_experience=rng.randrange(1, 30), phone=f'+234{rng.randrange(10 ** 9, 10 ** 10)}',
+                email=user.email, city=city, state=state, hourly_rate=rng.randrange(20, 200),
+                min_project_budget=rng.randrange(500, 20000, 500),
+                is_available=rng.random() < 0.8, is_featured=rng.random() < 0.01,
+            )
+            profiles.append(profile)
+            services.extend(
+                Through(artisanprofile_id=profile.pk, servicecategory_id=category)
+                for category in rng.sample(self.categories, rng.randrange(1, 4))
+            )
+            portfolio.extend(
+                (ids[PortfolioItem].take(), profile.pk, self.sentence(4), self.sentence(12), self.image(),
+                 self.day(-rng.randrange(2000)), '', created[0])
+                for _ in range(s['portfolio_per_artisan'])
+            )
+            # unique (artisan, reviewer, project): distinct reviewers, no project
+            reviews.extend(
+                (ids[Review].take(), profile.pk, reviewer, rng.randint(1, 5), self.sentence(3), self.sentence(25),
+                 rng.randint(1, 5), rng.randint(1, 5), rng.randint(1, 5), rng.randint(1, 5), *created)
+                for reviewer in rng.sample(reviewer_ids, s['reviews_per_artisan'])
+            )
+            start = 0
+            for _ in range(s['bookings_per_artisan']):
+                start += rng.randrange(1, 20)
+                end = start + rng.randrange(0, 10)
+                bookings.append((
+                    ids[ArtisanBooking].take(), profile.pk, rng.choice(['booked', 'blocked']),
+                    self.day(start), self.day(end), self.sentence(3)[:200], *created,
+                ))
+                start = end
+        self.insert('users', User, users)
+        self.insert('artisans', ArtisanProfile, profiles)
+        self.insert('artisan_services', Through, services)
+        self.insert_rows('portfolio_items', self.writers[PortfolioItem], portfolio)
+        self.insert_rows('reviews', self.writers[Review], reviews)
+        self.insert_rows('bookings', self.writers[ArtisanBooking], bookings)
+
+    def reset_sequences(self):
+        """Explicit ids leave PostgreSQL sequences behind; SQLite tracks them itself"""
+        statements = connection.ops.sequence_reset_sql(no_style(), list(self.ids))
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
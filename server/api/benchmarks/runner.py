@@ -0,0 +1,231 @@
+"""
+Measure every route in ``api/urls.py`` against a ``Dataset``.
+
+Each route is requested ``warmup + iterations`` times through the full
+middleware stack with a JWT for the route's user. For each route the
+runner records min/p50/p95 latency, the SQL queries of one request and the
+peak memory allocated while serving one request (tracemalloc). Routes
+that only accept writes are skipped, except the idempotent token
+endpoints.
+
+Query counts and memory are deterministic enough to gate on. Timings
+depend on the machine and its load, so by default they are only
+reported; ``compare(..., strict_latency=True)`` gates on the minimum and
+median, which are far steadier than p95.
+"""
+import json
+import math
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .dataset import PASSWORD
+
+BASELINES_PATH = Path(__file__).with_name('baselines.json')
+
+# Routes measured as a user other than the staff designer
+ROUTE_USERS = {
+    'artisan-my-profile': 'artisan',
+    'artisan-booking-list': 'artisan',
+    'artisan-booking-detail': 'artisan',
+}
+
+# Write-only routes that are safe to repeat
+POST_ROUTES = {
+    'token_obtain_pair': lambda dataset, client: {'email': dataset.owner_email, 'password': PASSWORD},
+    'token_refresh': lambda dataset, client: {'refresh': client.refresh},
+}
+
+
+def query_strings():
+    today = date.today()
+    return {
+        'artisan-autocomplete': 'q=a',
+        'artisan-availability': f'from={today}&to={today + timedelta(days=60)}',
+    }
+
+
+class Route:
+    def __init__(self, name, pattern, callback):
+        self.name = name
+        self.pattern = pattern
+        self.callback = callback
+
+    @property
+    def kwargs(self):
+        return list(self.pattern.regex.groupindex)
+
+    @property
+    def methods(self):
+        actions = getattr(self.callback, 'actions', None)
+        if actions:
+            return set(actions)
+        cls = getattr(self.callback, 'cls', None)
+        if cls is not None:
+            return {method for method in cls.http_method_names if hasattr(cls, method) and method != 'options'}
+        return {'get'}
+
+
+def iter_routes(patterns=None):
+    """Named routes of ``api/urls.py``, without format-suffix duplicates"""
+    if patterns is None:
+        from api import urls
+        patterns = urls.urlpatterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern.url_patterns)
+        elif pattern.name and 'format' not in pattern.pattern.regex.groupindex:
+            yield Route(pattern.name, pattern.pattern, pattern.callback)
+
+
+def basename_for(route_name, basenames):
+    matches = [basename for basename in basenames if route_name.startswith(f'{basename}-')]
+    return max(matches, key=len) if matches else None
+
+
+class AuthenticatedClient(Client):
+    def __init__(self, user, **defaults):
+        refresh = RefreshToken.for_user(user)
+        self.refresh = str(refresh)
+        super().__init__(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}', **defaults)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(len(ordered) * fraction) - 1)]
+
+
+def run(dataset, iterations=30, warmup=3, only=None):
+    """Return ``(results, skipped)``; results map route name to measurements"""
+    from django.contrib.auth import get_user_model
+    from api.urls import router
+
+    User = get_user_model()
+    users = {role: User.objects.get(pk=pk) for role, pk in dataset.users.items()}
+    dataset.owner_email = users['owner'].email
+    clients = {role: AuthenticatedClient(user) for role, user in users.items()}
+    basenames = [basename for _, _, basename in router.registry]
+    queries = query_strings()
+
+    results, skipped = {}, {}
+    for route in iter_routes():
+        if only and route.name not in only:
+            continue
+        client = clients[ROUTE_USERS.get(route.name, 'owner')]
+        kwargs = {}
+        if set(route.kwargs) - {'pk'}:
+            skipped[route.name] = 'no sample object'
+            continue
+        if 'pk' in route.kwargs:
+            basename = basename_for(route.name, basenames)
+            if basename not in dataset.pks:
+                skipped[route.name] = 'no sample object'
+                continue
+            kwargs['pk'] = dataset.pks[basename]
+        path = reverse(route.name, kwargs=kwargs)
+        if route.name in queries:
+            path = f'{path}?{queries[route.name]}'
+
+        if 'get' in route.methods:
+            def send():
+                return client.get(path)
+        elif route.name in POST_ROUTES:
+            data = POST_ROUTES[route.name](dataset, client)
+
+            def send():
+                return client.post(path, data, content_type='application/json')
+        else:
+            skipped[route.name] = 'write-only'
+            continue
+
+        results[route.name] = measure(send, iterations, warmup)
+    return results, skipped
+
+
+def measure(send, iterations, warmup):
+    for _ in range(warmup):
+        response = send()
+        if response.status_code >= 400:
+            return {'error': response.status_code}
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        send()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    with CaptureQueriesContext(connection) as captured:
+        send()
+    # Read now: the next request clears the connection's query log
+    query_count = len(captured.captured_queries)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        send()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'min_ms': round(min(samples), 3),
+        'p50_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(percentile(samples, 0.95), 3),
+        'queries': query_count,
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def load_baselines(path=BASELINES_PATH):
+    if not path.exists():
+        return {'meta': {}, 'routes': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(results, meta, path=BASELINES_PATH):
+    with open(path, 'w') as f:
+        json.dump({'meta': meta, 'routes': dict(sorted(results.items()))}, f, indent=2)
+        f.write('\n')
+
+
+def compare(results, baselines, latency_tolerance=1.0, latency_floor_ms=5.0, query_tolerance=0,
+            memory_tolerance=0.3, memory_floor_kb=64, strict_latency=False):
+    """
+    ``(regressions, warnings)`` of ``results`` against ``baselines['routes']``.
+
+    Any query beyond ``query_tolerance`` extra queries is a regression.
+    Latency (min and median) and memory exceed the baseline when they are
+    over it by more than the relative tolerance *and* the absolute floor, so
+    sub-millisecond routes don't trip on noise. Slow timings are warnings
+    unless ``strict_latency``.
+    """
+    regressions, warnings = [], []
+    for name, result in results.items():
+        if 'error' in result:
+            regressions.append(f'{name}: HTTP {result["error"]}')
+            continue
+        baseline = baselines.get('routes', {}).get(name)
+        if baseline is None:
+            continue
+        for key in ('min_ms', 'p50_ms'):
+            if key not in baseline:
+                continue
+            limit = max(baseline[key] * (1 + latency_tolerance), baseline[key] + latency_floor_ms)
+            if result[key] > limit:
+                message = f'{name}: {key} {result[key]:.2f} > {limit:.2f} (baseline {baseline[key]:.2f})'
+                (regressions if strict_latency else warnings).append(message)
+        if result['queries'] > baseline['queries'] + query_tolerance:
+            regressions.append(f'{name}: {result["queries"]} queries (baseline {baseline["queries"]})')
+        limit = max(baseline['peak_kb'] * (1 + memory_tolerance), baseline['peak_kb'] + memory_floor_kb)
+        if result['peak_kb'] > limit:
+            regressions.append(f'{name}: peak {result["peak_kb"]:.0f}KB > {limit:.0f}KB (baseline {baseline["peak_kb"]:.0f}KB)')
+    return regressions, warnings
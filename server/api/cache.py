@@ -0,0 +1,314 @@
+"""
+Two-tier cache backend: a small per-process LRU in front of a shared cache.
+
+Only keys starting with one of ``LOCAL_KEY_PREFIXES`` (auth stamps, model
+versions, service categories...) are kept in the local tier; everything
+else goes straight to the shared alias. Each prefix has a generation
+counter in the shared tier. Writing a local key through this backend
+bumps its prefix's generation, and every process re-reads the generations
+at most every ``CHECK_INTERVAL`` seconds; local entries (including
+remembered misses) recorded under an older generation are discarded. A
+write is therefore visible at once in the writing process and within
+``CHECK_INTERVAL`` everywhere else.
+
+Generations are per prefix, not per key: any write under a prefix
+discards every process's local entries for that prefix, which then
+re-read the shared tier. Local prefixes suit keys that are read far more
+often than any key under them is written.
+
+Keys starting with one of ``COUNTER_KEY_PREFIXES`` (never-expiring
+version counters) and the generation counters live in the
+``COUNTERS`` alias instead of the shared one. That alias needs an atomic
+``incr`` and must not evict: Redis, or ``CounterFileCache`` for local
+processes sharing a directory.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+
+try:
+    import fcntl
+except ImportError:  # Windows: counters are only atomic within one process
+    fcntl = None
+
+GENERATION_KEY = 'tiered:generation:{}'
+
+_missing = object()
+# Stored locally for keys the shared tier doesn't have
+_absent = object()
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.shared_alias = options.get('SHARED', 'shared')
+        self.counters_alias = options.get('COUNTERS', self.shared_alias)
+        self.counter_prefixes = tuple(options.get('COUNTER_KEY_PREFIXES', ())) + (GENERATION_KEY.format(''),)
+        self.prefixes = tuple(options.get('LOCAL_KEY_PREFIXES', ()))
+        self.local_max_entries = options.get('LOCAL_MAX_ENTRIES', 1024)
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 60)
+        self.check_interval = options.get('CHECK_INTERVAL', 1)
+        self._lock = threading.Lock()
+        self._local = OrderedDict()
+        self._generations = {}
+        self._next_check = 0
+        self.reset_stats()
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    @property
+    def counters(self):
+        return caches[self.counters_alias]
+
+    def _backend(self, key):
+        """Where ``key`` is stored below the local tier"""
+        return self.counters if key.startswith(self.counter_prefixes) else self.shared
+
+    # Metrics
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {
+                'local': {'hits': 0, 'misses': 0},
+                'shared': {'hits': 0, 'misses': 0},
+                'invalidations': 0,
+            }
+
+    def _record(self, tier, outcome, count=1):
+        with self._lock:
+            self.stats[tier][outcome] += count
+
+    def describe(self):
+        with self._lock:
+            return {
+                'local': dict(self.stats['local']),
+                'shared': dict(self.stats['shared']),
+                'invalidations': self.stats['invalidations'],
+                'local_entries': len(self._local),
+                'shared_backend': type(self.shared).__name__,
+                'counters_backend': type(self.counters).__name__,
+            }
+
+    # Local tier
+
+    def _prefix(self, key):
+        for prefix in self.prefixes:
+            if key.startswith(prefix):
+                return prefix
+        return None
+
+    def _refresh_generations(self):
+        now = time.monotonic()
+        if now < self._next_check or not self.prefixes:
+            return
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+        keys = {GENERATION_KEY.format(prefix): prefix for prefix in self.prefixes}
+        current = self.counters.get_many(list(keys))
+        with self._lock:
+            for key, prefix in keys.items():
+                self._generations[prefix] = current.get(key, 0)
+
+    def _local_get(self, made_key, prefix):
+        with self._lock:
+            entry = self._local.get(made_key)
+            if entry is None:
+                return _missing
+            value, expires_at, generation = entry
+            if generation != self._generations.get(prefix, 0) or expires_at < time.monotonic():
+                del self._local[made_key]
+                self.stats['invalidations'] += 1
+                return _missing
+            self._local.move_to_end(made_key)
+            return value
+
+    def _local_set(self, made_key, prefix, value, generation=None):
+        with self._lock:
+            if generation is None:
+                generation = self._generations.get(prefix, 0)
+            self._local[made_key] = (value, time.monotonic() + self.local_timeout, generation)
+            self._local.move_to_end(made_key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def _local_delete(self, made_key):
+        with self._lock:
+            self._local.pop(made_key, None)
+
+    def _invalidate(self, prefix):
+        """Tell every process its local copies under ``prefix`` are stale"""
+        key = GENERATION_KEY.format(prefix)
+        try:
+            generation = self.counters.incr(key)
+        except ValueError:
+            # Restart from the clock, so no generation seen before the loss repeats
+            self.counters.add(key, time.time_ns(), timeout=None)
+            generation = self.counters.incr(key)
+        with self._lock:
+            self._generations[prefix] = generation
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        prefix = self._prefix(key)
+        if prefix is None:
+            value = self._backend(key).get(key, _missing, version=version)
+            self._record('shared', 'misses' if value is _missing else 'hits')
+            return default if value is _missing else value
+
+        self._refresh_generations()
+        made_key = self.make_key(key, version)
+        value = self._local_get(made_key, prefix)
+        if value is not _missing:
+            self._record('local', 'hits')
+            return default if value is _absent else value
+        self._record('local', 'misses')
+
+        # Tag with the generation seen before the read, so a concurrent
+        # invalidation can't be overwritten by an older value
+        generation = self._generations.get(prefix, 0)
+        value = self._backend(key).get(key, _missing, version=version)
+        if value is _missing:
+            self._record('shared', 'misses')
+            self._local_set(made_key, prefix, _absent, generation)
+            return default
+        self._record('shared', 'hits')
+        self._local_set(made_key, prefix, value, generation)
+        return value
+
+    def get_many(self, keys, version=None):
+        result = {}
+        remote = []
+        for key in keys:
+            prefix = self._prefix(key)
+            if prefix is None:
+                remote.append(key)
+                continue
+            value = self.get(key, _missing, version=version)
+            if value is not _missing:
+                result[key] = value
+        for backend in {self._backend(key) for key in remote}:
+            wanted = [key for key in remote if self._backend(key) is backend]
+            found = backend.get_many(wanted, version=version)
+            self._record('shared', 'hits', len(found))
+            self._record('shared', 'misses', len(wanted) - len(found))
+            result.update(found)
+        return result
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._backend(key).set(key, value, timeout=timeout, version=version)
+        prefix = self._prefix(key)
+        if prefix is not None:
+            self._invalidate(prefix)
+            self._local_set(self.make_key(key, version), prefix, value)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = []
+        for backend in {self._backend(key) for key in data}:
+            part = {key: value for key, value in data.items() if self._backend(key) is backend}
+            failed += backend.set_many(part, timeout=timeout, version=version)
+        prefixes = {self._prefix(key) for key in data} - {None}
+        for prefix in prefixes:
+            self._invalidate(prefix)
+        for key, value in data.items():
+            prefix = self._prefix(key)
+            if prefix is not None and key not in failed:
+                self._local_set(self.make_key(key, version), prefix, value)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self._backend(key).add(key, value, timeout=timeout, version=version)
+        prefix = self._prefix(key)
+        if added and prefix is not None:
+            # Other processes may have cached the key as absent
+            self._invalidate(prefix)
+            self._local_set(self.make_key(key, version), prefix, value)
+        return added
+
+    def incr(self, key, delta=1, version=None):
+        value = self._backend(key).incr(key, delta, version=version)
+        prefix = self._prefix(key)
+        if prefix is not None:
+            self._invalidate(prefix)
+            self._local_set(self.make_key(key, version), prefix, value)
+        return value
+
+    def delete(self, key, version=None):
+        deleted = self._backend(key).delete(key, version=version)
+        prefix = self._prefix(key)
+        if prefix is not None:
+            self._local_delete(self.make_key(key, version))
+            self._invalidate(prefix)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self.delete(key, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._backend(key).touch(key, timeout=timeout, version=version)
+
+    def has_key(self, key, version=None):
+        return self.get(key, _missing, version=version) is not _missing
+
+    def clear(self):
+        self.shared.clear()
+        if self.counters_alias != self.shared_alias:
+            self.counters.clear()
+        with self._lock:
+            self._local.clear()
+            self._generations.clear()
+            self._next_check = 0
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+        if self.counters_alias != self.shared_alias:
+            self.counters.close(**kwargs)
+
+
+class CounterFileCache(FileBasedCache):
+    """
+    File cache for counters shared by the processes of one host.
+
+    ``add`` and ``incr``/``decr`` hold an exclusive lock on the cache
+    directory, so concurrent bumps from different workers aren't lost.
+    Counters never expire and nothing is culled: losing a counter would reset
+    it. (``BaseCache.incr`` re-sets the value with the default timeout.)
+    """
+
+    _thread_lock = threading.Lock()
+
+    def _cull(self):
+        pass
+
+    @contextmanager
+    def _locked(self):
+        self._createdir()
+        with self._thread_lock, open(os.path.join(self._dir, 'counters.lock'), 'a+b') as lock_file:
+            if fcntl is not None:
+                # Released when the file is closed
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        with self._locked():
+            return super().add(key, value, timeout=timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        with self._locked():
+            value = self.get(key, version=version)
+            if value is None:
+                raise ValueError(f"Key '{key}' not found")
+            self.set(key, value + delta, timeout=None, version=version)
+            return value + delta
@@ -0,0 +1,13 @@
+from django.db.backends.sqlite3 import base
+
+from api.db.sqlite import get_config
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite backend that can open transactions with ``BEGIN IMMEDIATE``"""
+
+    def _start_transaction_under_autocommit(self):
+        if get_config()['IMMEDIATE_TRANSACTIONS']:
+            self.cursor().execute('BEGIN IMMEDIATE')
+        else:
+            super()._start_transaction_under_autocommit()
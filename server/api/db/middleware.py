@@ -0,0 +1,94 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.core.cache import cache
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from .routers import allow_replica_reads, get_config, get_replicas, reset_replica_reads
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_KEY = 'db_pin:{}'
+
+
+def client_user_id(request):
+    """Id of the session or JWT user, without loading the user; None for anonymous clients"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    try:
+        raw_token = header and authentication.get_raw_token(header)
+        if not raw_token:
+            return None
+        return authentication.get_validated_token(raw_token).get(api_settings.USER_ID_CLAIM)
+    except (APIException, TokenError):
+        return None
+
+
+class ReplicaPinningMiddleware:
+    """
+    Allow replica reads for safe requests, unless the client wrote recently.
+
+    A successful unsafe request pins the client to the primary for
+    ``PIN_SECONDS``, longer than the expected replication lag. Authenticated
+    users are pinned by id in the shared cache, which covers every device and
+    clients that don't send cookies (the web app's cross-origin, token-only
+    requests). Anonymous clients get a cookie instead.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not get_replicas():
+            return self.get_response(request)
+
+        token = allow_replica_reads(self.read_only(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_replica_reads(token)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        if not get_replicas():
+            return await self.get_response(request)
+
+        # The session user and the shared cache are sync
+        token = allow_replica_reads(await sync_to_async(self.read_only)(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            reset_replica_reads(token)
+        return await sync_to_async(self.pin)(request, response)
+
+    def read_only(self, request):
+        if request.method not in SAFE_METHODS:
+            return False
+        user_id = client_user_id(request)
+        if user_id is not None:
+            return not cache.get(PIN_KEY.format(user_id))
+        return get_config()['COOKIE'] not in request.COOKIES
+
+    def pin(self, request, response):
+        config = get_config()
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            # DRF has set request.user by now, for JWT clients too
+            user_id = client_user_id(request)
+            if user_id is not None:
+                cache.set(PIN_KEY.format(user_id), 1, timeout=config['PIN_SECONDS'])
+            else:
+                response.set_cookie(
+                    config['COOKIE'], '1', max_age=config['PIN_SECONDS'], httponly=True, samesite='Lax',
+                )
+        return response
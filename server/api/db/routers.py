@@ -0,0 +1,86 @@
+"""
+Read-replica routing for marketplace reads.
+
+Within a request marked read-only by ``ReplicaPinningMiddleware``, reads of
+models in ``REPLICA_ROUTING['APPS']`` go to one alias from
+``DATABASE_REPLICAS``, picked at random when the request starts. Every read
+in the request uses that replica, so replicas lagging by different amounts
+can't serve a page rows from different points in time. Everything else
+stays on ``default``:
+
+* writes, and any read after a write in the same request;
+* reads inside ``transaction.atomic()`` on the primary;
+* requests from a client that wrote within the last ``PIN_SECONDS``
+  (read-your-writes, tracked per user in the shared cache, or with a
+  short-lived cookie for anonymous clients);
+* management commands and other code outside a request;
+* code wrapped in ``use_primary()``.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# The replica the current request reads from; None while reads must use the primary
+_replica = ContextVar('replica', default=None)
+
+
+def get_config():
+    config = {'APPS': ['vendors'], 'PIN_SECONDS': 5, 'COOKIE': 'db_pin'}
+    config.update(getattr(settings, 'REPLICA_ROUTING', {}))
+    return config
+
+
+def get_replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def allow_replica_reads(allowed=True):
+    """
+    Set whether reads may go to a replica, picking the one to use; returns a
+    token for ``reset_replica_reads``
+    """
+    replicas = get_replicas()
+    return _replica.set(random.choice(replicas) if allowed and replicas else None)
+
+
+def reset_replica_reads(token):
+    _replica.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Route every read in the block to the primary"""
+    token = _replica.set(None)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replica = _replica.get()
+        if replica is None:
+            return None
+        if model._meta.app_label not in get_config()['APPS']:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return replica
+
+    def db_for_write(self, model, **hints):
+        # Read-your-writes for the rest of the request
+        _replica.set(None)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in get_replicas():
+            return False
+        return None
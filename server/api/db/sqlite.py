@@ -0,0 +1,60 @@
+"""
+SQLite tuning profiles, applied to every new connection.
+
+The ``production`` profile switches to WAL so readers don't block the
+writer, relaxes fsyncs to ``synchronous=NORMAL`` (safe with WAL: a crash can
+lose the last commits but never corrupts), memory-maps the file, enlarges
+the page cache and makes lock waits block for ``busy_timeout`` ms instead
+of failing with "database is locked". Write transactions are started with
+``BEGIN IMMEDIATE`` (see ``api.db.backends.sqlite3``) so a transaction that
+reads before writing takes the write lock up front; a deferred transaction
+that later tries to upgrade its lock fails immediately without waiting.
+"""
+from django.conf import settings
+
+PROFILES = {
+    # Stock Django behaviour
+    'default': {
+        'PRAGMAS': {},
+        'IMMEDIATE_TRANSACTIONS': False,
+    },
+    'production': {
+        'PRAGMAS': {
+            'journal_mode': 'wal',
+            'synchronous': 'normal',
+            'busy_timeout': 5000,
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64000,  # KiB, i.e. 64 MB per connection
+            'temp_store': 'memory',
+        },
+        'IMMEDIATE_TRANSACTIONS': True,
+    },
+}
+
+
+def get_config():
+    config = getattr(settings, 'SQLITE_TUNING', {})
+    profile = PROFILES[config.get('PROFILE', 'default')]
+    return {
+        'PRAGMAS': {**profile['PRAGMAS'], **config.get('PRAGMAS', {})},
+        'IMMEDIATE_TRANSACTIONS': config.get('IMMEDIATE_TRANSACTIONS', profile['IMMEDIATE_TRANSACTIONS']),
+    }
+
+
+def pragma_statements(pragmas):
+    return [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+
+def apply_pragmas(cursor, pragmas):
+    for statement in pragma_statements(pragmas):
+        cursor.execute(statement)
+
+
+def configure_connection(sender, connection, **kwargs):
+    """``connection_created`` receiver"""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = get_config()['PRAGMAS']
+    if pragmas:
+        with connection.cursor() as cursor:
+            apply_pragmas(cursor, pragmas)
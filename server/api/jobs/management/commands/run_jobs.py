@@ -0,0 +1,50 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.jobs.queue import get_config
+from api.jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Run background jobs from the database queue until stopped'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue', action='append', dest='queues', metavar='NAME[:CONCURRENCY]',
+            help='Queue to work on, optionally with its concurrency limit (default: every queue in JOBS["QUEUES"])',
+        )
+        parser.add_argument('--burst', action='store_true', help='Exit once no jobs are due')
+        parser.add_argument('--poll-interval', type=float, help='Seconds between polls of an empty queue')
+
+    def handle(self, *args, **options):
+        queues = dict(get_config()['QUEUES'])
+        if options['queues']:
+            selected = {}
+            for value in options['queues']:
+                name, _, limit = value.partition(':')
+                try:
+                    selected[name] = int(limit) if limit else queues.get(name, 1)
+                except ValueError:
+                    raise CommandError(f'Invalid concurrency in {value!r}')
+            queues = selected
+        if not queues or min(queues.values()) < 1:
+            raise CommandError('Every queue needs a concurrency of at least 1')
+
+        worker = Worker(queues, burst=options['burst'], poll_interval=options['poll_interval'])
+        signal.signal(signal.SIGTERM, worker.stop)
+        self.stdout.write(
+            f'Worker {worker.worker_id} on ' + ', '.join(f'{name} (x{limit})' for name, limit in queues.items())
+        )
+        started = time.perf_counter()
+        worker.start()
+        try:
+            worker.supervise()
+        except KeyboardInterrupt:
+            worker.stop()
+            self.stdout.write('Stopping after the running jobs finish...')
+            worker.supervise()
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {worker.processed} jobs ({worker.failed} failed) in {time.perf_counter() - started:.1f}s'
+        ))
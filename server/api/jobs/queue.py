@@ -0,0 +1,199 @@
+"""
+Database-backed background jobs; the database is the queue, no broker.
+
+Decorate a module-level function with ``@job(queue=...)`` and call
+``func.enqueue(*args, **kwargs)``. The ``Job`` row is inserted when the
+surrounding transaction commits, so a job never runs before its data is
+visible and never runs for a rolled-back write. Arguments must be JSON
+serializable.
+
+``run_jobs`` workers claim due jobs. Each queue's concurrency limit
+(``JOBS['QUEUES']``) holds across all workers. Failed jobs are retried with
+exponential backoff until ``max_attempts``. A ``dedupe_key`` allows at most
+one queued job per key, so a burst of writes collapses into one run. Jobs
+whose worker died are requeued after ``LOCK_TIMEOUT`` seconds.
+
+With ``JOBS['ALWAYS_EAGER']`` jobs run inline at commit instead, for tests
+and single-process development.
+"""
+import functools
+import json
+import logging
+import random
+import traceback
+import zlib
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.db import IntegrityError, connections, router, transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def get_config():
+    config = {
+        'ALWAYS_EAGER': False,
+        # Concurrency limit per queue, across all workers
+        'QUEUES': {'default': 2},
+        'POLL_INTERVAL': 1.0,
+        'LOCK_TIMEOUT': 600,
+        'RETRY_BACKOFF': 10,
+        'RETRY_BACKOFF_MAX': 3600,
+        'KEEP_FINISHED_DAYS': 7,
+    }
+    config.update(getattr(settings, 'JOBS', {}))
+    return config
+
+
+class JobFunction:
+    def __init__(self, func, queue, max_attempts):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.name = f'{func.__module__}.{func.__name__}'
+        self.queue = queue
+        self.max_attempts = max_attempts
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, dedupe_key=None, delay=None, **kwargs):
+        enqueue(
+            self.name, args, kwargs, queue=self.queue, dedupe_key=dedupe_key, delay=delay,
+            max_attempts=self.max_attempts,
+        )
+
+
+def job(queue='default', max_attempts=5):
+    """Register a module-level function as a job"""
+    def decorator(func):
+        function = JobFunction(func, queue, max_attempts)
+        _registry[function.name] = function
+        return function
+    return decorator
+
+
+def get_job_function(name):
+    if name not in _registry:
+        # Importing the module registers its jobs
+        import_module(name.rpartition('.')[0])
+    return _registry[name]
+
+
+def enqueue(name, args=(), kwargs=None, queue='default', dedupe_key=None, delay=None, max_attempts=5):
+    """Queue a call of job ``name`` once the current transaction commits (at once outside one)"""
+    args, kwargs = list(args), kwargs or {}
+    # Fail in the caller, not at commit
+    json.dumps([args, kwargs])
+    using = router.db_for_write(Job)
+
+    if get_config()['ALWAYS_EAGER']:
+        transaction.on_commit(lambda: get_job_function(name)(*args, **kwargs), using=using)
+        return
+
+    def insert():
+        row = Job(
+            name=name, queue=queue, args=args, kwargs=kwargs, dedupe_key=dedupe_key, max_attempts=max_attempts,
+            run_at=timezone.now() + (delay or timedelta()),
+        )
+        # A queued job with the same key already covers this one
+        Job.objects.using(using).bulk_create([row], ignore_conflicts=dedupe_key is not None)
+
+    transaction.on_commit(insert, using=using)
+
+
+def _lock_queue(connection, queue):
+    """Serialize claims on ``queue`` until the transaction ends"""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [zlib.crc32(f'jobs:{queue}'.encode())])
+    # On SQLite the transaction already holds the database write lock
+    # (BEGIN IMMEDIATE, see api.db.backends.sqlite3)
+
+
+def claim(queue, limit, worker_id):
+    """Mark the next due job of ``queue`` running and return it; None if none is due or the queue is at ``limit``"""
+    using = router.db_for_write(Job)
+    now = timezone.now()
+    with transaction.atomic(using=using):
+        _lock_queue(connections[using], queue)
+        jobs = Job.objects.using(using).filter(queue=queue)
+        if jobs.filter(status=Job.RUNNING).count() >= limit:
+            return None
+        claimed = jobs.filter(status=Job.QUEUED, run_at__lte=now).order_by('run_at', 'id').first()
+        if claimed is None:
+            return None
+        claimed.status = Job.RUNNING
+        claimed.attempts += 1
+        claimed.locked_by = worker_id
+        claimed.locked_at = now
+        claimed.save(update_fields=['status', 'attempts', 'locked_by', 'locked_at'])
+    return claimed
+
+
+def has_due_jobs(queue):
+    return Job.objects.filter(queue=queue, status=Job.QUEUED, run_at__lte=timezone.now()).exists()
+
+
+def run(claimed):
+    """Run a claimed job and record the outcome; return whether it succeeded"""
+    try:
+        get_job_function(claimed.name).func(*claimed.args, **claimed.kwargs)
+    except Exception:
+        logger.exception('Job %s (%s) failed on attempt %s', claimed.pk, claimed.name, claimed.attempts)
+        retry_or_fail(claimed, traceback.format_exc())
+        return False
+    _owned(claimed).update(
+        status=Job.DONE, finished_at=timezone.now(), locked_by='', locked_at=None, last_error='',
+    )
+    return True
+
+
+def _owned(claimed):
+    # Unchanged since the claim, i.e. not requeued as stale in the meantime
+    return Job.objects.filter(pk=claimed.pk, status=Job.RUNNING, attempts=claimed.attempts)
+
+
+def backoff(attempts):
+    config = get_config()
+    delay = min(config['RETRY_BACKOFF'] * 2 ** (attempts - 1), config['RETRY_BACKOFF_MAX'])
+    # Jitter spreads out retries of jobs that failed together
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def retry_or_fail(claimed, error):
+    now = timezone.now()
+    if claimed.attempts < claimed.max_attempts:
+        try:
+            with transaction.atomic(using=router.db_for_write(Job)):
+                if _owned(claimed).update(
+                    status=Job.QUEUED, run_at=now + backoff(claimed.attempts), locked_by='', locked_at=None,
+                    last_error=error,
+                ):
+                    return
+        except IntegrityError:
+            # A job with the same dedupe key was queued meanwhile and will do the work
+            error = f'{error}\nNot retried: a job with the same dedupe key is queued'
+    _owned(claimed).update(status=Job.FAILED, finished_at=now, locked_by='', locked_at=None, last_error=error)
+
+
+def recover_stale():
+    """Requeue (or fail, when out of attempts) running jobs whose worker stopped responding"""
+    cutoff = timezone.now() - timedelta(seconds=get_config()['LOCK_TIMEOUT'])
+    recovered = 0
+    for stale in Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff):
+        logger.warning('Job %s (%s) locked by %s since %s; recovering', stale.pk, stale.name, stale.locked_by, stale.locked_at)
+        retry_or_fail(stale, f'Worker {stale.locked_by} stopped responding')
+        recovered += 1
+    return recovered
+
+
+def prune_finished():
+    cutoff = timezone.now() - timedelta(days=get_config()['KEEP_FINISHED_DAYS'])
+    deleted, _ = Job.objects.filter(status=Job.DONE, finished_at__lt=cutoff).delete()
+    return deleted
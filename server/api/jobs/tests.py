@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import queue as jobs
+from .models import Job
+
+calls = []
+
+
+@jobs.job(queue='tests')
+def record(value):
+    calls.append(value)
+
+
+@jobs.job(queue='tests', max_attempts=2)
+def explode():
+    raise RuntimeError('boom')
+
+
+@override_settings(JOBS={'ALWAYS_EAGER': False, 'LOCK_TIMEOUT': 60})
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def enqueue(self, func, *args, **kwargs):
+        # Rows are inserted when the surrounding transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            func.enqueue(*args, **kwargs)
+
+    def test_dedupe_key_collapses_queued_jobs(self):
+        for value in range(3):
+            self.enqueue(record, value, dedupe_key='same')
+        self.assertEqual(Job.objects.count(), 1)
+        jobs.claim('tests', 1, 'worker')
+        # A running job doesn't cover writes made after it started
+        self.enqueue(record, 3, dedupe_key='same')
+        self.assertEqual(Job.objects.filter(status=Job.QUEUED).count(), 1)
+
+    def test_claim_respects_queue_limit(self):
+        self.enqueue(record, 1)
+        self.enqueue(record, 2)
+        claimed = jobs.claim('tests', 1, 'worker')
+        self.assertEqual((claimed.status, claimed.attempts, claimed.args), (Job.RUNNING, 1, [1]))
+        self.assertIsNone(jobs.claim('tests', 1, 'worker'))
+        self.assertTrue(jobs.run(claimed))
+        self.assertEqual(calls, [1])
+        self.assertEqual(Job.objects.get(pk=claimed.pk).status, Job.DONE)
+        self.assertEqual(jobs.claim('tests', 1, 'worker').args, [2])
+
+    def test_failed_jobs_retry_with_backoff_then_fail(self):
+        self.enqueue(explode)
+        with self.assertLogs('api.jobs.queue', 'ERROR'):
+            self.assertFalse(jobs.run(jobs.claim('tests', 1, 'worker')))
+        retried = Job.objects.get()
+        self.assertEqual((retried.status, retried.attempts), (Job.QUEUED, 1))
+        self.assertGreater(retried.run_at, timezone.now())
+        self.assertIn('boom', retried.last_error)
+        # Not due until the backoff has passed
+        self.assertIsNone(jobs.claim('tests', 1, 'worker'))
+
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs('api.jobs.queue', 'ERROR'):
+            self.assertFalse(jobs.run(jobs.claim('tests', 1, 'worker')))
+        self.assertEqual(Job.objects.get().status, Job.FAILED)
+
+    def test_stale_jobs_are_requeued(self):
+        self.enqueue(record, 1)
+        stale = jobs.claim('tests', 1, 'dead-worker')
+        self.assertEqual(jobs.recover_stale(), 0)
+        Job.objects.update(locked_at=timezone.now() - timedelta(seconds=61))
+        with self.assertLogs('api.jobs.queue', 'WARNING'):
+            self.assertEqual(jobs.recover_stale(), 1)
+        recovered = Job.objects.get()
+        self.assertEqual((recovered.status, recovered.locked_by), (Job.QUEUED, ''))
+        # The dead worker's late result doesn't overwrite the requeued job
+        jobs.run(stale)
+        self.assertEqual(Job.objects.get().status, Job.QUEUED)
+
+    @override_settings(JOBS={'ALWAYS_EAGER': True})
+    def test_eager_jobs_run_at_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            record.enqueue(1)
+        self.assertEqual(calls, [])
+        callbacks[0]()
+        self.assertEqual(calls, [1])
+        self.assertFalse(Job.objects.exists())
@@ -0,0 +1,84 @@
+import logging
+import os
+import socket
+import threading
+import time
+
+from django.db import OperationalError, close_old_connections, connection
+
+from . import queue as jobs
+
+logger = logging.getLogger(__name__)
+
+# How often the supervising thread requeues stale jobs and prunes old ones
+MAINTENANCE_INTERVAL = 30
+PRUNE_INTERVAL = 3600
+
+
+class Worker:
+    """Runs up to ``limit`` jobs at a time from each queue, one thread per slot"""
+
+    def __init__(self, queues, burst=False, poll_interval=None):
+        self.queues = queues
+        self.burst = burst
+        self.poll_interval = poll_interval or jobs.get_config()['POLL_INTERVAL']
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = threading.Event()
+        self.processed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self.threads = []
+
+    def stop(self, *args):
+        self.stopping.set()
+
+    def run(self):
+        self.start()
+        self.supervise()
+
+    def start(self):
+        self.threads = [
+            threading.Thread(target=self.loop, args=(name, limit), name=f'jobs-{name}-{slot}', daemon=True)
+            for name, limit in self.queues.items()
+            for slot in range(limit)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def supervise(self):
+        """Recover stale jobs and prune old ones until every slot has exited"""
+        last_maintenance = last_prune = 0
+        while any(thread.is_alive() for thread in self.threads):
+            now = time.monotonic()
+            if now - last_maintenance >= MAINTENANCE_INTERVAL:
+                jobs.recover_stale()
+                last_maintenance = now
+            if now - last_prune >= PRUNE_INTERVAL:
+                jobs.prune_finished()
+                last_prune = now
+            close_old_connections()
+            self.stopping.wait(1)
+        connection.close()
+
+    def loop(self, name, limit):
+        try:
+            while not self.stopping.is_set():
+                try:
+                    claimed = jobs.claim(name, limit, self.worker_id)
+                except OperationalError as e:
+                    # e.g. SQLite busy; try again next poll
+                    logger.warning('Could not claim from %s: %s', name, e)
+                    claimed = None
+                if claimed is None:
+                    if self.burst and not jobs.has_due_jobs(name):
+                        return
+                    self.stopping.wait(self.poll_interval)
+                    continue
+
+                succeeded = jobs.run(claimed)
+                with self._lock:
+                    self.processed += 1
+                    self.failed += not succeeded
+                close_old_connections()
+        finally:
+            connection.close()
@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+
+from api.benchmarks.concurrency import MODES, run_load
+from api.management.commands.bench_endpoints import QUIET_METRICS, bench_caches
+
+
+def simulate_db_latency(milliseconds):
+    """Sleep before every query, like a database across the network"""
+    delay = milliseconds / 1000
+
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(delay)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        connection.execute_wrappers.append(wrapper)
+
+    connection_created.connect(install, weak=False)
+
+
+class Command(BaseCommand):
+    help = 'Compare WSGI worker threads with ASGI async views under many concurrent clients on the same dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=500, help='Concurrent clients')
+        parser.add_argument('--requests-per-client', type=int, default=10)
+        parser.add_argument('--threads', type=int, default=32, help='WSGI worker threads')
+        parser.add_argument('--scale', type=int, default=1, help='Dataset size multiplier')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--db-latency-ms', type=float, default=0.0, help='Added to every query')
+        parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+        # Internal: each step runs in its own process against the scratch database
+        parser.add_argument('--worker', choices=['prepare', *MODES], help=argparse.SUPPRESS)
+        parser.add_argument('--state', help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['worker'] == 'prepare':
+            return self.prepare(options)
+        if options['worker']:
+            return self.load(options)
+
+        with tempfile.TemporaryDirectory(prefix='bench-concurrency-') as directory:
+            env = {
+                **os.environ,
+                'DATABASE_URL': f'sqlite:///{Path(directory) / "bench.sqlite3"}',
+                'DEBUG': 'False',
+            }
+            state = str(Path(directory) / 'state.json')
+            self.child(['migrate', '--verbosity', '0'], env)
+            self.child(self.worker_args('prepare', state, options), env)
+
+            results = []
+            for mode in options['modes']:
+                self.stdout.write(f"Running {mode} with {options['clients']} clients...")
+                # Async views are on for ASGI (ASYNC_READS=True) and off for WSGI
+                output = self.child(
+                    self.worker_args(mode, state, options), {**env, 'ASYNC_READS': str(mode == 'asgi')},
+                )
+                results.append(json.loads(output.splitlines()[-1]))
+        self.report(results, options)
+
+    def worker_args(self, worker, state, options):
+        return [
+            'bench_concurrency', '--worker', worker, '--state', state,
+            '--clients', str(options['clients']), '--requests-per-client', str(options['requests_per_client']),
+            '--threads', str(options['threads']), '--scale', str(options['scale']), '--seed', str(options['seed']),
+            '--db-latency-ms', str(options['db_latency_ms']),
+        ]
+
+    def child(self, args, env):
+        result = subprocess.run(
+            [sys.executable, str(Path(settings.BASE_DIR) / 'manage.py'), *args],
+            env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"{' '.join(args[:3])} failed:\n{result.stderr or result.stdout}")
+        return result.stdout
+
+    def prepare(self, options):
+        from django.contrib.auth import get_user_model
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        from api.benchmarks.dataset import build_dataset
+
+        dataset = build_dataset(scale=options['scale'], seed=options['seed'])
+        owner = get_user_model().objects.get(pk=dataset.users['owner'])
+        pks = dataset.pks
+        state = {
+            'token': str(RefreshToken.for_user(owner).access_token),
+            'paths': [
+                '/api/projects/', f"/api/projects/{pks['project']}/",
+                '/api/tasks/', f"/api/tasks/{pks['task']}/",
+                '/api/moodboards/', f"/api/moodboards/{pks['moodboard']}/",
+                '/api/artisans/', f"/api/artisans/{pks['artisan']}/",
+                '/api/artisans/?ordering=-average_rating',
+            ],
+        }
+        Path(options['state']).write_text(json.dumps(state))
+
+    def load(self, options):
+        state = json.loads(Path(options['state']).read_text())
+        if options['db_latency_ms']:
+            simulate_db_latency(options['db_latency_ms'])
+        with override_settings(CACHES=bench_caches(), REQUEST_METRICS=QUIET_METRICS):
+            result = run_load(
+                options['worker'], state['paths'], {'Authorization': f"Bearer {state['token']}"},
+                clients=options['clients'], requests_per_client=options['requests_per_client'],
+                threads=options['threads'],
+            )
+        self.stdout.write(json.dumps(result))
+
+    def report(self, results, options):
+        self.stdout.write(
+            f"\n{options['clients']} clients x {options['requests_per_client']} requests, "
+            f"{options['threads']} WSGI threads, +{options['db_latency_ms']:g}ms per query\n"
+        )
+        self.stdout.write(f"{'mode':<6} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'threads':>8}  errors")
+        for result in results:
+            self.stdout.write(
+                f"{result['mode']:<6} {result['rps']:>8.1f} {result['p50_ms']:>7.1f}ms {result['p95_ms']:>7.1f}ms "
+                f"{result['p99_ms']:>7.1f}ms {result['peak_threads']:>8}  {result['errors'] or '-'}"
+            )
+        by_mode = {result['mode']: result for result in results}
+        if set(by_mode) == set(MODES):
+            ratio = by_mode['asgi']['rps'] / by_mode['wsgi']['rps']
+            self.stdout.write(f'\nASGI throughput is {ratio:.2f}x WSGI')
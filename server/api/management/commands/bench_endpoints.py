@@ -0,0 +1,100 @@
+import platform
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from api.benchmarks.dataset import build_dataset
+from api.benchmarks.runner import compare, load_baselines, run, save_baselines
+
+QUIET_METRICS = {'LOG_REQUESTS': False, 'SLOW_REQUEST_MS': 10 ** 9, 'SLOW_REQUEST_QUERIES': 10 ** 9}
+
+
+def bench_caches():
+    """The configured cache tiers, with private in-memory shared and counter tiers"""
+    caches = {alias: dict(config) for alias, config in settings.CACHES.items()}
+    options = caches['default'].get('OPTIONS', {})
+    for alias in {options.get('SHARED', 'shared'), options.get('COUNTERS', 'counters')} & set(caches):
+        caches[alias] = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'bench-{alias}'}
+    return caches
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark every API route on a seeded test database and fail on query or memory regressions '
+        'against the stored baselines; slower timings are reported, and fail only with --strict-latency'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1, help='Dataset size multiplier')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--iterations', type=int, default=30, help='Timed requests per route')
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--routes', nargs='*', help='Only these route names')
+        parser.add_argument('--tolerance', type=float, default=1.0, help='Allowed relative min/median latency increase')
+        parser.add_argument('--strict-latency', action='store_true', help='Fail, not just warn, on slower timings')
+        parser.add_argument('--latency-floor', type=float, default=5.0, help='Ignore latency increases below this many ms')
+        parser.add_argument('--query-tolerance', type=int, default=0, help='Allowed extra queries per request')
+        parser.add_argument('--memory-tolerance', type=float, default=0.3, help='Allowed relative peak memory increase')
+        parser.add_argument('--update-baselines', action='store_true', help='Store these results as the new baselines')
+
+    def handle(self, *args, **options):
+        baselines = load_baselines()
+        meta = {'scale': options['scale'], 'seed': options['seed'], 'iterations': options['iterations']}
+        if baselines['meta'] and not options['update_baselines']:
+            stored = {key: baselines['meta'].get(key) for key in ('scale', 'seed')}
+            if stored != {key: meta[key] for key in ('scale', 'seed')}:
+                raise CommandError(f'Baselines were recorded with {stored}; run with the same --scale/--seed')
+
+        # DEBUG off as in production; it also keeps the query log from filling up
+        setup_test_environment(debug=False)
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with override_settings(CACHES=bench_caches(), REQUEST_METRICS=QUIET_METRICS):
+                started = time.perf_counter()
+                dataset = build_dataset(scale=options['scale'], seed=options['seed'])
+                self.stdout.write(
+                    f'Dataset built in {time.perf_counter() - started:.1f}s: '
+                    + ', '.join(f'{count} {name}' for name, count in dataset.counts.items())
+                )
+                results, skipped = run(
+                    dataset, iterations=options['iterations'], warmup=options['warmup'], only=options['routes'],
+                )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.report(results, skipped, baselines)
+        if options['update_baselines']:
+            routes = dict(baselines['routes']) if options['routes'] else {}
+            routes.update({name: result for name, result in results.items() if 'error' not in result})
+            save_baselines(routes, {**meta, 'machine': f'{platform.system()} {platform.machine()}, Python {platform.python_version()}'})
+            self.stdout.write(self.style.SUCCESS(f'Baselines updated for {len(results)} routes'))
+            return
+
+        regressions, warnings = compare(
+            results, baselines, latency_tolerance=options['tolerance'], latency_floor_ms=options['latency_floor'],
+            query_tolerance=options['query_tolerance'], memory_tolerance=options['memory_tolerance'],
+            strict_latency=options['strict_latency'],
+        )
+        for warning in warnings:
+            self.stdout.write(self.style.WARNING(f'Slower: {warning}'))
+        if regressions:
+            raise CommandError('Performance regressions:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f'No regressions across {len(results)} routes'))
+
+    def report(self, results, skipped, baselines):
+        self.stdout.write(f"\n{'route':<28} {'min':>8} {'p50':>8} {'p95':>8} {'queries':>8} {'peak':>9}  baseline p50/queries")
+        for name, result in results.items():
+            if 'error' in result:
+                self.stdout.write(f"{name:<28} HTTP {result['error']}")
+                continue
+            baseline = baselines['routes'].get(name)
+            against = f"{baseline['p50_ms']:.2f}ms/{baseline['queries']}" if baseline else '-'
+            self.stdout.write(
+                f"{name:<28} {result['min_ms']:6.2f}ms {result['p50_ms']:6.2f}ms {result['p95_ms']:6.2f}ms {result['queries']:>8} "
+                f"{result['peak_kb']:7.0f}KB  {against}"
+            )
+        for name, reason in skipped.items():
+            self.stdout.write(f'{name:<28} skipped ({reason})')
@@ -0,0 +1,73 @@
+import io
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.moodboards.models import Moodboard
+from api.moodboards.serializers import MoodboardSerializer
+from api.parsers import ORJSONParser
+from api.projects.models import Project
+from api.projects.serializers import ProjectSerializer
+from api.renderers import ORJSONRenderer
+from api.vendors.models import ArtisanProfile
+from api.vendors.serializers import ArtisanProfileSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compare DRF JSON rendering/parsing with the orjson pair on real serializer output'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--copies', type=int, default=50, help='Repeat each list this many times to enlarge payloads')
+        parser.add_argument('--rounds', type=int, default=20, help='Timed rounds per payload')
+
+    def payloads(self):
+        return {
+            'projects+tasks': ProjectSerializer(Project.objects.prefetch_related('tasks'), many=True).data,
+            'moodboards+items': MoodboardSerializer(Moodboard.objects.prefetch_related('items'), many=True).data,
+            'artisan detail': ArtisanProfileSerializer(
+                ArtisanProfile.objects.select_related('user').prefetch_related(
+                    'services', 'portfolio', 'reviews__reviewer'
+                ),
+                many=True, context={'request': None},
+            ).data,
+        }
+
+    def timed(self, fn, rounds):
+        samples = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - started)
+        return statistics.median(samples) * 1000
+
+    def handle(self, *args, **options):
+        stock_renderer, fast_renderer = JSONRenderer(), ORJSONRenderer()
+        stock_parser, fast_parser = JSONParser(), ORJSONParser()
+        rounds = options['rounds']
+        self.stdout.write(
+            f"{'payload':<17} {'size':>9} {'render drf':>11} {'orjson':>9} {'speedup':>8} "
+            f"{'parse drf':>10} {'orjson':>9} {'speedup':>8} identical"
+        )
+        for name, data in self.payloads().items():
+            data = list(data) * options['copies']
+            if not data:
+                self.stdout.write(f'{name:<17} (no rows; run seed_data)')
+                continue
+            stock = stock_renderer.render(data)
+            fast = fast_renderer.render(data)
+            if json.loads(stock) != json.loads(fast):
+                raise CommandError(f'{name}: orjson output differs from DRF output')
+
+            render_stock = self.timed(lambda: stock_renderer.render(data), rounds)
+            render_fast = self.timed(lambda: fast_renderer.render(data), rounds)
+            parse_stock = self.timed(lambda: stock_parser.parse(io.BytesIO(stock)), rounds)
+            parse_fast = self.timed(lambda: fast_parser.parse(io.BytesIO(stock)), rounds)
+            self.stdout.write(
+                f"{name:<17} {len(stock) / 1024:7.0f}KB {render_stock:9.2f}ms {render_fast:7.2f}ms "
+                f"{render_stock / render_fast:7.1f}x {parse_stock:8.2f}ms {parse_fast:7.2f}ms "
+                f"{parse_stock / parse_fast:7.1f}x {'yes' if stock == fast else 'no'}"
+            )
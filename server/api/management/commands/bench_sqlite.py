@@ -0,0 +1,120 @@
+import math
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.db.sqlite import PROFILES, apply_pragmas
+
+
+class Command(BaseCommand):
+    help = 'Mixed read/write concurrency benchmark of the SQLite tuning profiles on a scratch database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', nargs='+', default=['default', 'production'], choices=sorted(PROFILES))
+        parser.add_argument('--readers', type=int, default=8, help='Reader threads')
+        parser.add_argument('--writers', type=int, default=4, help='Writer threads')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile')
+        parser.add_argument('--rows', type=int, default=20000, help='Rows in the scratch table')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{options['readers']} readers, {options['writers']} writers, {options['duration']}s per profile, "
+            f"{options['rows']} rows (SQLite {sqlite3.sqlite_version})\n"
+        )
+        for name in options['profiles']:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'bench.sqlite3')
+                self.build(path, options['rows'])
+                self.run(name, PROFILES[name], path, options)
+
+    def connect(self, path, profile):
+        # Same as Django: autocommit at the driver level, explicit BEGIN
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        apply_pragmas(conn, profile['PRAGMAS'])
+        return conn
+
+    def build(self, path, rows):
+        conn = sqlite3.connect(path, isolation_level=None)
+        conn.execute('CREATE TABLE item (id INTEGER PRIMARY KEY, owner INTEGER, views INTEGER, note TEXT)')
+        conn.execute('CREATE INDEX item_owner ON item (owner)')
+        conn.execute('BEGIN')
+        conn.executemany(
+            'INSERT INTO item (owner, views, note) VALUES (?, 0, ?)',
+            ((i % 500, 'x' * 100) for i in range(rows)),
+        )
+        conn.execute('COMMIT')
+        conn.close()
+
+    def run(self, name, profile, path, options):
+        begin = 'BEGIN IMMEDIATE' if profile['IMMEDIATE_TRANSACTIONS'] else 'BEGIN'
+        rows = options['rows']
+        deadline = time.perf_counter() + options['duration']
+        results = {'read': [], 'write': []}
+        errors = {'read': 0, 'write': 0}
+        lock = threading.Lock()
+
+        def reader():
+            conn = self.connect(path, profile)
+            rng = random.Random()
+            latencies, failed = [], 0
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    conn.execute('SELECT count(*), sum(views) FROM item WHERE owner = ?', (rng.randrange(500),)).fetchone()
+                    latencies.append(time.perf_counter() - started)
+                except sqlite3.OperationalError:
+                    failed += 1
+            conn.close()
+            with lock:
+                results['read'].extend(latencies)
+                errors['read'] += failed
+
+        def writer():
+            conn = self.connect(path, profile)
+            rng = random.Random()
+            latencies, failed = [], 0
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    # Read-modify-write, like a view inside transaction.atomic()
+                    conn.execute(begin)
+                    item_id = rng.randrange(1, rows + 1)
+                    (views,) = conn.execute('SELECT views FROM item WHERE id = ?', (item_id,)).fetchone()
+                    conn.execute('UPDATE item SET views = ? WHERE id = ?', (views + 1, item_id))
+                    conn.execute('INSERT INTO item (owner, views, note) VALUES (?, 0, ?)', (rng.randrange(500), 'y'))
+                    conn.execute('COMMIT')
+                    latencies.append(time.perf_counter() - started)
+                except sqlite3.OperationalError:
+                    failed += 1
+                    if conn.in_transaction:
+                        conn.execute('ROLLBACK')
+            conn.close()
+            with lock:
+                results['write'].extend(latencies)
+                errors['write'] += failed
+
+        threads = [threading.Thread(target=reader) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=writer) for _ in range(options['writers'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        if not results['read'] and not results['write']:
+            raise CommandError(f'Profile {name} completed no operations')
+
+        for kind in ('read', 'write'):
+            latencies = sorted(results[kind])
+            p95 = latencies[max(0, math.ceil(len(latencies) * 0.95) - 1)] if latencies else 0
+            self.stdout.write(
+                f"{name:<11} {kind:<5} {len(latencies) / elapsed:9.1f} ops/s  "
+                f"p50 {statistics.median(latencies) * 1000 if latencies else 0:7.2f}ms  "
+                f"p95 {p95 * 1000:7.2f}ms  locked {errors[kind]}"
+            )
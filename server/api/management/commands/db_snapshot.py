@@ -0,0 +1,33 @@
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+
+from api.db.snapshot import SnapshotError, restore_snapshot, save_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Save the SQLite database to a snapshot file, or restore it from one'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['save', 'restore'])
+        parser.add_argument('--path', help='Snapshot file (default: <database>.snapshot.sqlite3)')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            if options['action'] == 'save':
+                path = save_snapshot(options['path'], using=options['database'])
+            else:
+                path = restore_snapshot(options['path'], using=options['database'])
+        except SnapshotError as e:
+            raise CommandError(str(e))
+        elapsed = (time.perf_counter() - started) * 1000
+
+        if options['action'] == 'save':
+            self.stdout.write(self.style.SUCCESS(f'Snapshot saved to {path} in {elapsed:.0f}ms'))
+            return
+        # Cached responses, auth stamps and revocation marks describe the old rows
+        caches['default'].clear()
+        self.stdout.write(self.style.SUCCESS(f'Restored {path} in {elapsed:.0f}ms; cache cleared'))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarks.loadgen import DEFAULTS, LoadGenerator
+
+
+class Command(BaseCommand):
+    help = 'Generate a large synthetic dataset for load testing with chunked bulk inserts'
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULTS.items():
+            parser.add_argument(f'--{name.replace("_", "-")}', type=int, default=default, dest=name)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per INSERT and roughly per transaction')
+        parser.add_argument('--hasher', default='default', help="Password hasher for the shared hash, e.g. 'md5' (needs PASSWORD_HASHER_PROFILE=fast)")
+        parser.add_argument('--email-domain', default='load.example.com')
+        parser.add_argument('--plan', action='store_true', help='Only print the rows that would be written')
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] for name in DEFAULTS}
+        try:
+            generator = LoadGenerator(
+                seed=options['seed'], chunk_size=options['chunk_size'], hasher=options['hasher'],
+                email_domain=options['email_domain'], progress=self.stdout.write, **sizes,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        plan = generator.plan()
+        self.stdout.write(', '.join(f'{count:,} {name}' for name, count in plan.items()) + f' = {sum(plan.values()):,} rows')
+        if options['plan']:
+            return
+
+        started = time.perf_counter()
+        written = generator.run()
+        elapsed = time.perf_counter() - started
+        total = sum(written.values())
+        self.stdout.write(self.style.SUCCESS(f'Wrote {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)'))
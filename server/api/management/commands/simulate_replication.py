@@ -0,0 +1,64 @@
+import sqlite3
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database to the SQLite replicas with an artificial lag (local replica testing)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lag', type=float, default=2.0, help='Seconds a snapshot waits before reaching the replicas')
+        parser.add_argument('--interval', type=float, default=0.5, help='Seconds between snapshots of the primary')
+        parser.add_argument('--duration', type=float, default=0, help='Stop after this many seconds (0: run until interrupted)')
+        parser.add_argument('--once', action='store_true', help='Copy once, without lag, and exit')
+
+    def handle(self, *args, **options):
+        primary = self.sqlite_path('default')
+        replicas = [self.sqlite_path(alias) for alias in settings.DATABASE_REPLICAS]
+        if not replicas:
+            raise CommandError('No replicas configured; set DATABASE_REPLICA_URLS')
+
+        # Replicas start in sync so they have the schema
+        self.apply(self.snapshot(primary), replicas)
+        self.stdout.write(f"Synced {len(replicas)} replica(s) from {primary}")
+        if options['once']:
+            return
+
+        self.stdout.write(f"Replicating every {options['interval']}s with {options['lag']}s lag; Ctrl+C to stop")
+        pending = deque()
+        deadline = time.monotonic() + options['duration'] if options['duration'] else None
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                now = time.monotonic()
+                pending.append((now, self.snapshot(primary)))
+                # Only the newest due snapshot matters
+                due = None
+                while pending and now - pending[0][0] >= options['lag']:
+                    due = pending.popleft()[1]
+                if due is not None:
+                    self.apply(due, replicas)
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+    def sqlite_path(self, alias):
+        database = settings.DATABASES[alias]
+        if 'sqlite3' not in database['ENGINE']:
+            raise CommandError(f'{alias} is not SQLite; lag simulation only works with SQLite files')
+        return str(database['NAME'])
+
+    def snapshot(self, path):
+        source = sqlite3.connect(path)
+        copy = sqlite3.connect(':memory:')
+        source.backup(copy)
+        source.close()
+        return copy
+
+    def apply(self, snapshot, replicas):
+        for path in replicas:
+            target = sqlite3.connect(path, timeout=30)
+            snapshot.backup(target)
+            target.close()
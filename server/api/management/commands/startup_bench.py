@@ -0,0 +1,77 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so nothing is imported yet
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+from django.conf import settings
+settings.INSTALLED_APPS
+imported = time.perf_counter()
+import django
+django.setup()
+ready = time.perf_counter()
+from django.test import Client
+client = Client(HTTP_HOST='localhost')
+before_request = time.perf_counter()
+status = client.get(sys.argv[1]).status_code
+done = time.perf_counter()
+print(json.dumps({
+    'settings_ms': (imported - started) * 1000,
+    'setup_ms': (ready - imported) * 1000,
+    'first_request_ms': (done - before_request) * 1000,
+    'status': status,
+    'modules': len(sys.modules),
+    'apps': len(settings.INSTALLED_APPS),
+}))
+"""
+
+FIELDS = ('settings_ms', 'setup_ms', 'first_request_ms', 'process_ms')
+
+
+class Command(BaseCommand):
+    help = 'Measure cold start: settings import, app registry setup and first request, full vs API-only profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Fresh processes per profile')
+        parser.add_argument('--path', default='/api/artisans/', help='URL of the first request')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{options['runs']} cold starts per profile, first request GET {options['path']}\n")
+        self.stdout.write(
+            f"{'profile':<9} {'settings':>9} {'setup':>9} {'1st req':>9} {'process':>9} {'modules':>8} {'apps':>5}"
+        )
+        for profile, api_only in (('full', '0'), ('api-only', '1')):
+            runs = [self.run(api_only, options['path']) for _ in range(options['runs'])]
+            medians = {field: statistics.median(run[field] for run in runs) for field in FIELDS}
+            self.stdout.write(
+                f"{profile:<9} "
+                + ' '.join(f"{medians[field]:7.1f}ms" for field in FIELDS)
+                + f" {runs[0]['modules']:>8} {runs[0]['apps']:>5}"
+            )
+
+    def run(self, api_only, path):
+        env = {
+            **os.environ,
+            'API_ONLY': api_only,
+            'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'project.settings'),
+        }
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-c', CHILD, path], env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        if result.returncode != 0:
+            raise CommandError(f'Child process failed:\n{result.stderr}')
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        if data['status'] >= 500:
+            raise CommandError(f"First request returned {data['status']}")
+        data['process_ms'] = elapsed
+        return data
@@ -0,0 +1,263 @@
+"""
+Per-request instrumentation.
+
+``RequestMetricsMiddleware`` records, for every request, the number of SQL
+queries and their total time, time spent producing ``serializer.data``,
+time in the view and time rendering the response. The figures go out as a
+JSON log line on ``api.requests`` and, in DEBUG or to staff users, as a
+``Server-Timing`` header. Requests over ``SLOW_REQUEST_MS`` or
+``SLOW_REQUEST_QUERIES`` additionally log their SQL on
+``api.slow_requests``, tagged with the resolved view and action. Every
+query is counted, but only the first ``MAX_LOGGED_QUERIES`` statements are
+kept.
+
+Queries are counted by an execute wrapper installed once on every database
+connection (``install_query_recorder``) that reports to the metrics of the
+current context. Async views run their queries on worker threads; the
+context variable follows them there, so sync and async requests are
+measured the same way.
+"""
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject, empty
+
+logger = logging.getLogger('api.requests')
+slow_logger = logging.getLogger('api.slow_requests')
+
+_current = ContextVar('request_metrics', default=None)
+
+
+def get_config():
+    config = {
+        'ENABLED': True,
+        'SERVER_TIMING': True,
+        'LOG_REQUESTS': False,
+        'SLOW_REQUEST_MS': 500,
+        'SLOW_REQUEST_QUERIES': 50,
+        'MAX_LOGGED_QUERIES': 100,
+    }
+    config.update(getattr(settings, 'REQUEST_METRICS', {}))
+    return config
+
+
+class RequestMetrics:
+    def __init__(self, max_queries=100):
+        self.started = time.perf_counter()
+        # (alias, sql, duration, started) of the first max_queries queries
+        self.queries = []
+        self.max_queries = max_queries
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.serializing = False
+        self.view_started = None
+        self.view_time = None
+        self.view_finished = None
+        # Called on the querying thread after each query
+        self.after_query = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.query_count += 1
+            self.db_time += duration
+            if len(self.queries) < self.max_queries:
+                self.queries.append((context['connection'].alias, sql, duration, started))
+            if self.after_query is not None:
+                self.after_query()
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """``connection_created`` receiver"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def note_view_finished():
+    """Mark the end of the view; what follows counts as rendering"""
+    metrics = _current.get()
+    if metrics is not None and metrics.view_started is not None and metrics.view_finished is None:
+        metrics.view_finished = time.perf_counter()
+        metrics.view_time = metrics.view_finished - metrics.view_started
+
+
+def install_serializer_timing():
+    """
+    Time the outermost ``serializer.data`` evaluation of each request.
+
+    This replaces DRF's ``BaseSerializer.data`` for the whole process, so it
+    is only installed when metrics are enabled (see ``ApiConfig.ready``).
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data.fget
+    if getattr(original, 'timed', False):
+        return
+
+    def data(self):
+        metrics = _current.get()
+        if metrics is None or metrics.serializing:
+            return original(self)
+        metrics.serializing = True
+        started = time.perf_counter()
+        try:
+            return original(self)
+        finally:
+            metrics.serialize_time += time.perf_counter() - started
+            metrics.serializing = False
+
+    data.timed = True
+    data.original = original
+    BaseSerializer.data = property(data)
+
+
+def uninstall_serializer_timing():
+    """Put DRF's own ``BaseSerializer.data`` back"""
+    from rest_framework.serializers import BaseSerializer
+
+    timed = BaseSerializer.data.fget
+    if getattr(timed, 'timed', False):
+        BaseSerializer.data = property(timed.original)
+
+
+def is_staff_request(request):
+    """Whether the view authenticated a staff user"""
+    user = getattr(request, 'user', None)
+    # DRF sets request.user once it authenticates; don't resolve a session
+    # user the view never looked at just to decide on a header
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return False
+    return bool(getattr(user, 'is_staff', False))
+
+
+def view_name(request):
+    """``ViewSet.action`` for DRF views, else the view's dotted name"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    func = match.func
+    cls = getattr(func, 'cls', None)
+    if cls is None:
+        return match.view_name or f'{func.__module__}.{func.__name__}'
+    actions = getattr(func, 'actions', None)
+    if actions:
+        action = actions.get(request.method.lower())
+        if action:
+            return f'{cls.__name__}.{action}'
+    return cls.__name__
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Coroutine hooks, so Django doesn't run them on a worker thread
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        config = get_config()
+        if not config['ENABLED']:
+            return self.get_response(request)
+
+        metrics = RequestMetrics(config['MAX_LOGGED_QUERIES'])
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, config)
+
+    async def __acall__(self, request):
+        config = get_config()
+        if not config['ENABLED']:
+            return await self.get_response(request)
+
+        metrics = RequestMetrics(config['MAX_LOGGED_QUERIES'])
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, config)
+
+    def finish(self, request, response, metrics, config):
+        finished = time.perf_counter()
+        total = finished - metrics.started
+
+        timings = self.timings(metrics, total, finished)
+        if config['SERVER_TIMING'] and (settings.DEBUG or is_staff_request(request)):
+            response['Server-Timing'] = ', '.join(
+                f'{name};dur={duration:.1f}' + (f';desc="{metrics.query_count} queries"' if name == 'db' else '')
+                for name, duration in timings.items()
+            )
+
+        name = view_name(request)
+        entry = {
+            'method': request.method,
+            'path': request.path,
+            'view': name,
+            'status': response.status_code,
+            'queries': metrics.query_count,
+            **{f'{key}_ms': round(value, 2) for key, value in timings.items()},
+        }
+        if config['LOG_REQUESTS']:
+            logger.info(json.dumps(entry))
+        if total * 1000 >= config['SLOW_REQUEST_MS'] or metrics.query_count >= config['SLOW_REQUEST_QUERIES']:
+            limit = config['MAX_LOGGED_QUERIES']
+            slow_logger.warning(json.dumps({
+                **entry,
+                'sql': [
+                    {'db': alias, 'ms': round(duration * 1000, 2), 'sql': sql}
+                    for alias, sql, duration, _ in metrics.queries[:limit]
+                ],
+                'sql_truncated': max(0, metrics.query_count - limit),
+            }))
+        return response
+
+    def timings(self, metrics, total, finished):
+        timings = {'db': metrics.db_time * 1000, 'serialize': metrics.serialize_time * 1000}
+        if metrics.view_time is not None:
+            timings['view'] = metrics.view_time * 1000
+            # Rendering plus the response half of inner middleware
+            timings['render'] = (finished - metrics.view_finished) * 1000
+        timings['total'] = total * 1000
+        return timings
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF responses pass through here after the view returns, before rendering
+        note_view_finished()
+        return response
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        RequestMetricsMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
+
+    async def aprocess_template_response(self, request, response):
+        return RequestMetricsMiddleware.process_template_response(self, request, response)
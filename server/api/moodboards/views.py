@@ -1,18 +1,21 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from api.streaming import StreamingListMixin
 from .models import Moodboard, MoodboardItem
 from .serializers import MoodboardSerializer, MoodboardItemSerializer
 
 
-class MoodboardViewSet(viewsets.ModelViewSet):
+class MoodboardViewSet(StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = MoodboardSerializer
     permission_classes = [IsAuthenticated]
+    stream_prefetch_related = ['items']
+    stream_chunk_size = 50
 
     def get_queryset(self):
         return Moodboard.objects.filter(project__user=self.request.user)
 
 
-class MoodboardItemViewSet(viewsets.ModelViewSet):
+class MoodboardItemViewSet(StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = MoodboardItemSerializer
     permission_classes = [IsAuthenticated]
 
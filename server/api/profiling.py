@@ -0,0 +1,383 @@
+"""
+Opt-in profiling of single requests, for staff.
+
+A staff user who sends ``X-Profile: 1`` or ``?_profile=1``
+has that request profiled by ``RequestProfilerMiddleware``. Everyone else's
+flag is ignored, and requests without the flag cost a header lookup.
+
+``sample`` (the default) polls the request thread's stack every
+``SAMPLE_INTERVAL_MS``. It writes collapsed stacks, which speedscope,
+flamegraph.pl and inferno render as a flamegraph. ``cprofile`` (send
+``X-Profile: cprofile``) traces every call and writes a ``.prof`` file for
+pstats or snakeviz. Both write a JSON summary with the SQL timeline: each
+query's offset from the start of the request, duration and statement.
+
+Under ASGI the profile follows the request's thread-sensitive worker
+thread rather than the event loop. That thread runs sync views and the
+ORM calls of async views, and no other request's work.
+
+Off by default (``ENABLED``). Limits keep it safe to turn on:
+- ``RATE_LIMIT`` profiles per ``RATE_WINDOW`` across all workers.
+- One profile at a time per process.
+- Profiling stops after ``MAX_SECONDS``. cProfile can only be stopped from
+  the profiled thread, so it stops at the first query past the deadline.
+- At most ``MAX_STACKS`` stacks and ``MAX_QUERIES`` queries are kept.
+- Artifacts over ``MAX_ARTIFACT_BYTES`` are dropped.
+- Only the newest ``MAX_ARTIFACTS`` profiles stay on disk.
+
+The response carries ``X-Profile-Id``, or ``X-Profile-Skipped`` with the
+reason. ``/api/profiles/`` lists and serves the artifacts.
+"""
+import cProfile
+import concurrent.futures.thread
+import io
+import json
+import logging
+import marshal
+import os
+import pstats
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import APIException
+
+from api.middleware import RequestMetrics, _current
+from api.users.authentication import CachedJWTAuthentication
+
+logger = logging.getLogger(__name__)
+
+PROFILERS = ('sample', 'cprofile')
+ARTIFACT_SUFFIXES = {'sample': '.folded', 'cprofile': '.prof'}
+RATE_KEY = 'profiler:window:{}'
+
+
+def get_config():
+    config = {
+        'ENABLED': False,
+        'HEADER': 'X-Profile',
+        'QUERY_PARAM': '_profile',
+        'RATE_LIMIT': 6,
+        'RATE_WINDOW': 60,
+        'SAMPLE_INTERVAL_MS': 2,
+        'MAX_SECONDS': 30,
+        'MAX_STACKS': 2000,
+        'MAX_QUERIES': 500,
+        'MAX_SQL_LENGTH': 2000,
+        'MAX_ARTIFACT_BYTES': 5 * 1024 * 1024,
+        'MAX_ARTIFACTS': 50,
+        'DIRECTORY': Path(settings.BASE_DIR) / 'profiles',
+    }
+    config.update(getattr(settings, 'REQUEST_PROFILER', {}))
+    return config
+
+
+class StackSampler(threading.Thread):
+    """Counts the stacks of one thread, polled every ``interval`` seconds"""
+
+    def __init__(self, thread_id, interval, max_seconds):
+        super().__init__(name='request-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks = Counter()
+        self.samples = 0
+        self.truncated = False
+        self._stopped = threading.Event()
+
+    def run(self):
+        deadline = time.perf_counter() + self.max_seconds
+        while not self._stopped.wait(self.interval):
+            if time.perf_counter() > deadline:
+                self.truncated = True
+                return
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            if self.idle(frame):
+                continue
+            self.stacks[self.collapse(frame)] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+    @staticmethod
+    def idle(frame):
+        """Whether an executor thread is waiting for its next call"""
+        return frame.f_code.co_name == '_worker' and frame.f_code.co_filename == concurrent.futures.thread.__file__
+
+    @staticmethod
+    def collapse(frame, max_depth=128):
+        names = []
+        while frame is not None and len(names) < max_depth:
+            code = frame.f_code
+            names.append(f'{code.co_name} ({short_path(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+
+def short_path(filename):
+    for prefix in sorted({str(settings.BASE_DIR), *sys.path}, key=len, reverse=True):
+        if prefix and filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1:]
+    return filename
+
+
+class Profile:
+    def __init__(self, kind, config):
+        self.kind = kind
+        self.config = config
+        self.id = f'{time.strftime("%Y%m%dT%H%M%S")}-{secrets.token_hex(4)}'
+        self.profiler = None
+        self.sampler = None
+        self.truncated = False
+
+    def start(self):
+        """Profile the calling thread"""
+        self.started = time.perf_counter()
+        self.deadline = self.started + self.config['MAX_SECONDS']
+        self.thread_id = threading.get_ident()
+        if self.kind == 'cprofile':
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            self.sampler = StackSampler(
+                self.thread_id, self.config['SAMPLE_INTERVAL_MS'] / 1000, self.config['MAX_SECONDS'],
+            )
+            self.sampler.start()
+
+    def check(self):
+        """Stop cProfile past the deadline; only works on the profiled thread"""
+        if (self.profiler is not None and not self.truncated and threading.get_ident() == self.thread_id
+                and time.perf_counter() > self.deadline):
+            self.profiler.disable()
+            self.truncated = True
+
+    def stop(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+        else:
+            self.sampler.stop()
+        self.elapsed = time.perf_counter() - self.started
+
+    def artifact(self):
+        """``(bytes, truncated)`` of the .prof or .folded file"""
+        if self.profiler is not None:
+            # The format Profile.dump_stats() writes
+            self.profiler.create_stats()
+            return marshal.dumps(self.profiler.stats), self.truncated
+        stacks = self.sampler.stacks.most_common(self.config['MAX_STACKS'])
+        data = ''.join(f'{stack} {count}\n' for stack, count in stacks).encode()
+        return data, len(self.sampler.stacks) > len(stacks) or self.sampler.truncated
+
+    def hotspots(self, limit=25):
+        if self.profiler is not None:
+            stream = io.StringIO()
+            pstats.Stats(self.profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
+            return stream.getvalue().splitlines()
+        # Own time: how often each function was on top of the stack
+        leaves = Counter()
+        for stack, count in self.sampler.stacks.items():
+            leaves[stack.rpartition(';')[2]] += count
+        return [f'{count:6d}  {name}' for name, count in leaves.most_common(limit)]
+
+    def sql_timeline(self, metrics):
+        limit, length = self.config['MAX_QUERIES'], self.config['MAX_SQL_LENGTH']
+        return [
+            {
+                'offset_ms': round((started - metrics.started) * 1000, 2),
+                'ms': round(duration * 1000, 2),
+                'db': alias,
+                'sql': sql if len(sql) <= length else sql[:length] + '...',
+            }
+            for alias, sql, duration, started in metrics.queries[:limit]
+        ]
+
+
+def is_staff(request):
+    """Whether the request's JWT belongs to a staff user; never raises"""
+    # Runs ahead of the session and auth middleware, so there's no request.user yet
+    try:
+        result = CachedJWTAuthentication().authenticate(request)
+    except APIException:
+        return False
+    return result is not None and result[0].is_staff
+
+
+def take_slot(config, lock):
+    """Reason the profile can't run now, or None after taking the slot"""
+    window = int(time.time() // config['RATE_WINDOW'])
+    key = RATE_KEY.format(window)
+    cache.add(key, 0, timeout=config['RATE_WINDOW'] * 2)
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        count = 1
+    if count > config['RATE_LIMIT']:
+        return 'rate limit'
+    if not lock.acquire(blocking=False):
+        return 'busy'
+    return None
+
+
+def save(profile, request, response, metrics):
+    config = profile.config
+    directory = Path(config['DIRECTORY'])
+    directory.mkdir(parents=True, exist_ok=True)
+
+    data, truncated = profile.artifact()
+    artifact = None
+    if len(data) <= config['MAX_ARTIFACT_BYTES']:
+        artifact = f'{profile.id}{ARTIFACT_SUFFIXES[profile.kind]}'
+        (directory / artifact).write_bytes(data)
+    summary = {
+        'id': profile.id,
+        'profiler': profile.kind,
+        'method': request.method,
+        'path': request.get_full_path(),
+        'status': response.status_code,
+        'user': getattr(getattr(request, 'user', None), 'pk', None),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'total_ms': round(profile.elapsed * 1000, 2),
+        'samples': profile.sampler.samples if profile.sampler else None,
+        'query_count': metrics.query_count,
+        'db_ms': round(metrics.db_time * 1000, 2),
+        'artifact': artifact,
+        'artifact_bytes': len(data),
+        'truncated': truncated or artifact is None or metrics.query_count > config['MAX_QUERIES'],
+        'hotspots': profile.hotspots(),
+        'sql': profile.sql_timeline(metrics),
+    }
+    (directory / f'{profile.id}.json').write_text(json.dumps(summary, indent=1))
+    prune(directory, config['MAX_ARTIFACTS'])
+
+
+def prune(directory, keep):
+    summaries = sorted(directory.glob('*.json'), key=lambda path: path.stat().st_mtime, reverse=True)
+    for summary in summaries[keep:]:
+        for path in directory.glob(f'{summary.stem}.*'):
+            path.unlink(missing_ok=True)
+
+
+def list_profiles():
+    directory = Path(get_config()['DIRECTORY'])
+    if not directory.is_dir():
+        return []
+    return sorted((path.stem for path in directory.glob('*.json')), reverse=True)
+
+
+def load_profile(profile_id):
+    """Summary dict and artifact path of a stored profile; None if unknown"""
+    directory = Path(get_config()['DIRECTORY'])
+    summary_path = directory / f'{profile_id}.json'
+    # Ids are generated here; anything path-like is not one of ours
+    if Path(profile_id).name != profile_id or not summary_path.is_file():
+        return None, None
+    summary = json.loads(summary_path.read_text())
+    artifact = directory / summary['artifact'] if summary.get('artifact') else None
+    return summary, artifact
+
+
+class RequestProfilerMiddleware:
+    """Profiles flagged requests of staff users; see the module docstring"""
+    sync_capable = True
+    async_capable = True
+    _lock = threading.Lock()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def requested(self, request, config):
+        value = request.headers.get(config['HEADER']) or request.GET.get(config['QUERY_PARAM'])
+        if not value or value.lower() in ('0', 'false', 'off'):
+            return None
+        return value.lower() if value.lower() in PROFILERS else 'sample'
+
+    def prepare(self, request):
+        """``(profile, skipped_reason)``; both None when the request isn't profiled"""
+        config = get_config()
+        kind = self.requested(request, config) if config['ENABLED'] else None
+        if kind is None or not is_staff(request):
+            return None, None
+        skipped = take_slot(config, self._lock)
+        if skipped:
+            return None, skipped
+        return Profile(kind, config), None
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        profile, skipped = self.prepare(request)
+        if profile is None:
+            return self.finish(self.get_response(request), skipped)
+
+        metrics, token = self.metrics(profile.config['MAX_QUERIES'])
+        metrics.after_query = profile.check
+        try:
+            profile.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                profile.stop()
+            self.store(profile, request, response, metrics)
+        finally:
+            self._lock.release()
+            if token is not None:
+                _current.reset(token)
+        response['X-Profile-Id'] = profile.id
+        return response
+
+    async def __acall__(self, request):
+        profile, skipped = await sync_to_async(self.prepare)(request)
+        if profile is None:
+            return self.finish(await self.get_response(request), skipped)
+
+        metrics, token = self.metrics(profile.config['MAX_QUERIES'])
+        metrics.after_query = profile.check
+        try:
+            # The request's thread-sensitive thread, which runs a sync view
+            # and an async view's ORM calls, not the event loop
+            await sync_to_async(profile.start)()
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(profile.stop)()
+            await sync_to_async(self.store)(profile, request, response, metrics)
+        finally:
+            self._lock.release()
+            if token is not None:
+                _current.reset(token)
+        response['X-Profile-Id'] = profile.id
+        return response
+
+    def metrics(self, max_queries):
+        """The request's metrics, started here when RequestMetricsMiddleware is off"""
+        metrics = _current.get()
+        if metrics is not None:
+            # Keep enough statements for the profile's SQL timeline
+            metrics.max_queries = max(metrics.max_queries, max_queries)
+            return metrics, None
+        metrics = RequestMetrics(max_queries)
+        return metrics, _current.set(metrics)
+
+    def store(self, profile, request, response, metrics):
+        try:
+            save(profile, request, response, metrics)
+        except OSError:
+            logger.exception('Could not store profile %s', profile.id)
+
+    def finish(self, response, skipped):
+        if skipped:
+            response['X-Profile-Skipped'] = skipped
+        return response
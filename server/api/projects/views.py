@@ -1,18 +1,21 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from api.streaming import StreamingListMixin
 from .models import Project, Task
 from .serializers import ProjectSerializer, TaskSerializer
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated]
+    stream_prefetch_related = ['tasks']
+    stream_chunk_size = 50
 
     def get_queryset(self):
         return Project.objects.filter(user=self.request.user)
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
 
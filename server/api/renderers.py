@@ -0,0 +1,44 @@
+"""
+orjson-backed JSON rendering.
+
+Produces the same output as DRF's ``JSONRenderer`` for everything our views
+return: types orjson doesn't handle natively (``Decimal``, lazy strings,
+``timedelta``, querysets, ...) go through DRF's own encoder, and UTC
+datetimes end in ``Z``. Indented output (e.g. for the browsable API) is
+left to the stock renderer, as is anything orjson refuses (integers beyond
+64 bits), so those render or fail exactly as DRF's would.
+
+One known difference: NaN and infinite floats (e.g. a float column set to
+NaN on PostgreSQL) render as ``null``. DRF, with ``STRICT_JSON``, raises
+``ValueError`` instead and the whole response fails with a 500. orjson has
+no strict mode, and finding such values first would mean walking every
+response in Python.
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_default = JSONEncoder().default
+
+
+def dumps(data):
+    content = orjson.dumps(data, default=_default, option=OPTIONS)
+    # Escape U+2028/U+2029 like DRF, so the output is also valid JavaScript
+    if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return dumps(data)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
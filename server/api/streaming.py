@@ -0,0 +1,134 @@
+"""
+Streamed JSON arrays for large list responses.
+
+``?stream=1`` on a list route (or the artisan ``portfolio``/``reviews``
+actions) returns every matching row as a single, unpaginated JSON array in
+a ``StreamingHttpResponse``. Rows are read with ``.iterator(chunk_size=...)``
+and serialized one chunk at a time, so memory stays flat however many rows
+match. Prefetches run per chunk. When the client accepts gzip, the body is
+compressed as it streams.
+
+Streamed responses are never cached. A query error after the first chunk
+can't change the status code any more; it ends the response early.
+"""
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+
+from api.renderers import dumps
+
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
+def get_config():
+    config = {
+        'CHUNK_SIZE': 500,
+        'GZIP': True,
+        'GZIP_LEVEL': 6,
+    }
+    config.update(getattr(settings, 'STREAMING_LISTS', {}))
+    return config
+
+
+def wants_stream(request):
+    # DRF requests proxy GET; plain Django requests (middleware, async views) work too
+    return request.method == 'GET' and request.GET.get('stream', '').lower() in TRUE_VALUES
+
+
+def accepts_gzip(request):
+    return 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '').lower()
+
+
+def json_array(queryset, serializer_class, context, chunk_size):
+    """Yield a JSON array of the serialized rows, one chunk of rows at a time"""
+    # One serializer for the whole stream: binding fields per chunk is slow
+    # and leaves reference cycles that only the garbage collector frees
+    serializer = serializer_class(many=True, context=context)
+    yield b'['
+    separator = b''
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) == chunk_size:
+            yield separator + dumps(serializer.to_representation(chunk))[1:-1]
+            separator = b','
+            chunk = []
+    if chunk:
+        yield separator + dumps(serializer.to_representation(chunk))[1:-1]
+    yield b']'
+
+
+def gzipped(chunks, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def on_request_thread(chunks):
+    """
+    Pull ``chunks`` on the request's sync thread. The database cursor stays
+    on its own connection, and Django doesn't buffer a sync iterator under ASGI.
+    """
+    step = sync_to_async(next)
+    try:
+        while True:
+            chunk = await step(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        # Releases the cursor when the client disconnects mid-stream
+        await sync_to_async(chunks.close)()
+
+
+def stream_list(request, queryset, serializer_class, context=None, chunk_size=None):
+    """A ``StreamingHttpResponse`` with the serialized ``queryset`` as one JSON array"""
+    config = get_config()
+    chunks = json_array(queryset, serializer_class, context or {}, chunk_size or config['CHUNK_SIZE'])
+    compress = config['GZIP'] and accepts_gzip(request)
+    if compress:
+        chunks = gzipped(chunks, config['GZIP_LEVEL'])
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        chunks = on_request_thread(chunks)
+
+    response = StreamingHttpResponse(chunks, content_type='application/json')
+    if compress:
+        response['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+class StreamingListMixin:
+    """
+    ``?stream=1`` on ``list`` streams all rows instead of a page.
+
+    ``stream_select_related``/``stream_prefetch_related`` name the relations
+    the serializer reads, so each chunk costs a fixed number of queries.
+    Viewsets that nest many children per row can lower ``stream_chunk_size``.
+    """
+    stream_select_related = ()
+    stream_prefetch_related = ()
+    stream_chunk_size = None
+
+    def list(self, request, *args, **kwargs):
+        if not wants_stream(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.stream_select_related:
+            queryset = queryset.select_related(*self.stream_select_related)
+        if self.stream_prefetch_related:
+            queryset = queryset.prefetch_related(*self.stream_prefetch_related)
+        return self.stream(queryset)
+
+    def stream(self, queryset, serializer_class=None):
+        return stream_list(
+            self.request, queryset, serializer_class or self.get_serializer_class(), self.get_serializer_context(),
+            chunk_size=self.stream_chunk_size,
+        )
@@ -0,0 +1,11 @@
+from django.test.runner import DiscoverRunner
+
+from .middleware import uninstall_serializer_timing
+
+
+class TestRunner(DiscoverRunner):
+    """Runs tests against DRF as shipped; tests of the serializer timing install it themselves"""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        uninstall_serializer_timing()
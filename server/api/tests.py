@@ -1,3 +1,364 @@
-from django.test import TestCase
+"""
+Smoke tests for SQL that differs between backends, and for the tiered
+cache. Run them against both databases:
 
-# Create your tests here.
+    python manage.py test api.tests
+    DATABASE_URL=postgres://... python manage.py test api.tests
+"""
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+from django.core.cache import caches
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import BaseSerializer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.benchmarks.runner import compare
+from api.cache import CounterFileCache, TieredCache
+from api.db.middleware import ReplicaPinningMiddleware
+from api.db.routers import ReplicaRouter, use_primary
+from api.middleware import RequestMetrics, _current, install_serializer_timing, uninstall_serializer_timing
+from api.profiling import load_profile
+from api.renderers import ORJSONRenderer
+from api.users.models import User
+from api.users.serializers import UserListSerializer
+from api.projects.models import Project
+from api.vendors.models import ArtisanBooking, ArtisanProfile, Review
+from api.vendors.stats import measure_drift, refresh_artisan_stats
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'api-tests'}}
+
+
+def make_user(email, **extra):
+    return User.objects.create_user(email=email, first_name=extra.pop('first_name', 'Test'), last_name='User', **extra)
+
+
+def make_artisan(email, **extra):
+    return ArtisanProfile.objects.create(
+        user=make_user(email), business_name=extra.pop('business_name', email), description='-', phone='0', email=email,
+        **extra,
+    )
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ArtisanStatsRefreshTests(TestCase):
+    def setUp(self):
+        self.rated = make_artisan('rated@example.com', total_projects=12)
+        self.unrated = make_artisan('unrated@example.com', average_rating=Decimal('4.00'), total_reviews=3)
+        for index, rating in enumerate([5, 4, 4]):
+            Review.objects.create(
+                artisan=self.rated, reviewer=make_user(f'reviewer{index}@example.com'), rating=rating, comment='-',
+            )
+        owner = make_user('owner@example.com')
+        first, second, upcoming = (
+            Project.objects.create(user=owner, name=name, client_name='-') for name in ('first', 'second', 'upcoming')
+        )
+        past, future = date.today() - timedelta(days=10), date.today() + timedelta(days=10)
+        for project, kind, end in [
+            (first, 'booked', past), (first, 'booked', past), (second, 'booked', past),
+            (upcoming, 'booked', future), (None, 'booked', past), (second, 'blocked', past),
+        ]:
+            ArtisanBooking.objects.create(
+                artisan=self.rated, project=project, kind=kind, start_date=end - timedelta(days=2), end_date=end,
+            )
+
+    def test_refresh_recomputes_stats(self):
+        self.assertEqual(measure_drift()['drifted'], 2)
+        self.assertEqual(refresh_artisan_stats(), 2)
+        self.rated.refresh_from_db()
+        self.unrated.refresh_from_db()
+        self.assertEqual((self.rated.average_rating, self.rated.total_reviews), (Decimal('4.33'), 3))
+        self.assertEqual((self.unrated.average_rating, self.unrated.total_reviews), (Decimal('0.00'), 0))
+        # Distinct projects of bookings that have ended
+        self.assertEqual(self.rated.total_projects, 2)
+        self.assertEqual(measure_drift()['drifted'], 0)
+
+    def test_cached_listings_are_invalidated_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            refresh_artisan_stats()
+        self.assertEqual(len(callbacks), 1)
+
+    def test_refresh_subset(self):
+        refresh_artisan_stats(ArtisanProfile.objects.filter(pk=self.rated.pk))
+        self.unrated.refresh_from_db()
+        self.assertEqual(self.unrated.total_reviews, 3)
+        self.assertEqual(refresh_artisan_stats(ArtisanProfile.objects.none()), 0)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class UserPrefixSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(make_user('admin@example.com', first_name='Admin'))
+        make_user('alice@example.com', first_name='Zed')
+        make_user('bob@example.com', first_name='Alicia')
+        make_user('carol@example.com', first_name='Carol')
+
+    def search(self, q):
+        response = self.client.get('/api/users/', {'q': q, 'page_size': 100})
+        self.assertEqual(response.status_code, 200)
+        return sorted(user['email'] for user in response.data['results'])
+
+    def test_prefix_matches_email_and_names_case_insensitively(self):
+        self.assertEqual(self.search('ALI'), ['alice@example.com', 'bob@example.com'])
+        self.assertEqual(self.search('carol'), ['carol@example.com'])
+        self.assertEqual(self.search('lice'), [])
+
+    def test_pattern_indexes_exist_on_postgresql(self):
+        if connection.vendor != 'postgresql':
+            self.skipTest('text_pattern_ops indexes are PostgreSQL only')
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE indexname LIKE 'users_%%_pattern_idx'")
+            names = {row[0] for row in cursor.fetchall()}
+        self.assertEqual(names, {f'users_{field}_pattern_idx' for field in ('email', 'first_name', 'last_name')})
+
+
+@override_settings(CACHES={
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tiered-shared'},
+    'counters': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tiered-counters'},
+})
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        caches['counters'].clear()
+
+    def worker(self):
+        """A TieredCache as another process would have it, with its own local tier"""
+        return TieredCache(None, {'OPTIONS': {
+            'SHARED': 'shared', 'COUNTERS': 'counters', 'CHECK_INTERVAL': 0,
+            'LOCAL_KEY_PREFIXES': ['version:', 'page:'], 'COUNTER_KEY_PREFIXES': ['version:'],
+        }})
+
+    def test_writes_reach_other_workers_through_generations(self):
+        first, second = self.worker(), self.worker()
+        self.assertIsNone(second.get('page:home'))
+        first.set('page:home', 'v1')
+        self.assertEqual(second.get('page:home'), 'v1')
+        first.set('page:home', 'v2')
+        self.assertEqual(second.get('page:home'), 'v2')
+        self.assertEqual(first.get('page:home'), 'v2')
+
+    def test_counters_live_in_the_counters_alias(self):
+        cache = self.worker()
+        cache.add('version:a', 1, timeout=None)
+        self.assertEqual(cache.incr('version:a'), 2)
+        cache.set('page:home', 'body')
+        self.assertEqual(caches['counters'].get('version:a'), 2)
+        self.assertIsNone(caches['shared'].get('version:a'))
+        self.assertEqual(caches['shared'].get('page:home'), 'body')
+        self.assertEqual(cache.get_many(['version:a', 'page:home', 'other']), {'version:a': 2, 'page:home': 'body'})
+
+    def test_lost_generation_restarts_above_previous_values(self):
+        cache = self.worker()
+        cache.set('page:home', 'v1')
+        before = caches['counters'].get('tiered:generation:page:')
+        caches['counters'].clear()
+        cache.set('page:home', 'v2')
+        self.assertGreater(caches['counters'].get('tiered:generation:page:'), before)
+
+
+class CounterFileCacheTests(SimpleTestCase):
+    def test_concurrent_increments_are_not_lost(self):
+        with tempfile.TemporaryDirectory() as directory:
+            counters = CounterFileCache(directory, {})
+            counters.add('n', 0, timeout=None)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(lambda _: counters.incr('n'), range(200)))
+            self.assertEqual(counters.get('n'), 200)
+
+
+class BenchmarkCompareTests(SimpleTestCase):
+    baselines = {'routes': {'route': {'min_ms': 10.0, 'p50_ms': 12.0, 'p95_ms': 20.0, 'queries': 3, 'peak_kb': 100.0}}}
+
+    def result(self, **changes):
+        return {'route': {**self.baselines['routes']['route'], **changes}}
+
+    def test_extra_queries_fail(self):
+        regressions, _ = compare(self.result(queries=4), self.baselines)
+        self.assertEqual(regressions, ['route: 4 queries (baseline 3)'])
+
+    def test_slower_timings_only_warn_unless_strict(self):
+        slow = self.result(min_ms=30.0, p50_ms=40.0, p95_ms=500.0)
+        regressions, warnings = compare(slow, self.baselines)
+        self.assertEqual((len(regressions), len(warnings)), (0, 2))
+        self.assertEqual(len(compare(slow, self.baselines, strict_latency=True)[0]), 2)
+        # p95 is too noisy to compare at all
+        self.assertEqual(compare(self.result(p95_ms=500.0), self.baselines, strict_latency=True), ([], []))
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def assertSameAsDRF(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_output_matches_drf(self):
+        cases = {
+            'decimal': [Decimal('12.50'), Decimal('0.1'), Decimal('1E+3'), Decimal('-0')],
+            'utc': datetime(2030, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            'utc_whole_seconds': datetime(2030, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc),
+            'offset': datetime(2030, 1, 2, 3, 4, 5, tzinfo=ZoneInfo('Africa/Lagos')),
+            'naive': datetime(2030, 1, 2, 3, 4, 5, 123),
+            'date': date(2030, 1, 2),
+            'time': time(3, 4, 5, 6),
+            'timedelta': timedelta(days=1, seconds=5),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Not found.'),
+            'separators': 'a\u2028b\u2029',
+            'unicode': 'Ọ̀yọ́',
+            'int_keys': {1: 'x'},
+            'big_int': 2 ** 64,
+        }
+        for name, value in cases.items():
+            with self.subTest(name):
+                self.assertSameAsDRF({name: value})
+
+    def test_non_finite_floats_render_as_null(self):
+        # Documented difference: DRF raises instead
+        for value in (float('nan'), float('inf'), Decimal('NaN')):
+            with self.subTest(value=value):
+                self.assertEqual(ORJSONRenderer().render({'x': value}), b'{"x":null}')
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render({'x': value})
+
+
+REPLICAS = ['replica_1', 'replica_2', 'replica_3']
+
+
+# SimpleTestCase: the router sends reads inside TestCase's transaction to the primary
+@override_settings(CACHES=LOCMEM_CACHES, DATABASE_REPLICAS=REPLICAS)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def request(self, method='get', user=None, view=None, status=200, **extra):
+        """Run a request through the middleware; returns the response and the view's result"""
+        request = getattr(self.factory, method)('/api/artisans/', **extra)
+        if user is not None:
+            request.user = user
+        result = []
+
+        def get_response(request):
+            result.append(view() if view else self.router.db_for_read(ArtisanProfile))
+            return HttpResponse(status=status)
+
+        return ReplicaPinningMiddleware(get_response)(request), result[0]
+
+    def test_reads_stay_on_one_replica_per_request(self):
+        chosen = set()
+        for _ in range(20):
+            _, replicas = self.request(view=lambda: {self.router.db_for_read(ArtisanProfile) for _ in range(10)})
+            self.assertEqual(len(replicas), 1)
+            chosen |= replicas
+        self.assertLessEqual(chosen, set(REPLICAS))
+        self.assertGreater(len(chosen), 1)
+
+    def test_primary_reads(self):
+        def view():
+            reads = [self.router.db_for_read(User)]
+            with use_primary():
+                reads.append(self.router.db_for_read(ArtisanProfile))
+            reads.append(self.router.db_for_read(ArtisanProfile))
+            self.router.db_for_write(ArtisanProfile)
+            reads.append(self.router.db_for_read(ArtisanProfile))
+            return reads
+
+        _, reads = self.request(view=view)
+        # Other apps, use_primary() and after a write; the replica in between
+        self.assertEqual([read in REPLICAS for read in reads], [False, False, True, False])
+        self.assertIsNone(self.router.db_for_read(ArtisanProfile))
+        _, read = self.request(method='post')
+        self.assertIsNone(read)
+
+    def test_writes_pin_the_user_to_the_primary(self):
+        user, other = SimpleNamespace(pk=1, is_authenticated=True), SimpleNamespace(pk=2, is_authenticated=True)
+        self.request(method='post', user=user, status=400)
+        self.assertIn(self.request(user=user)[1], REPLICAS)
+        self.request(method='post', user=user, status=201)
+        self.assertIsNone(self.request(user=user)[1])
+        self.assertIn(self.request(user=other)[1], REPLICAS)
+
+    def test_anonymous_writers_are_pinned_by_cookie(self):
+        response, _ = self.request(method='post', status=201)
+        cookie = response.cookies['db_pin']
+        self.assertEqual(cookie['max-age'], 5)
+        self.assertIsNone(self.request(HTTP_COOKIE='db_pin=1')[1])
+        self.assertIn(self.request()[1], REPLICAS)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RequestMetricsTests(TestCase):
+    def test_all_queries_counted_but_only_the_cap_kept(self):
+        metrics = RequestMetrics(max_queries=2)
+        token = _current.set(metrics)
+        try:
+            for _ in range(5):
+                User.objects.exists()
+        finally:
+            _current.reset(token)
+        self.assertEqual(metrics.query_count, 5)
+        self.assertEqual(len(metrics.queries), 2)
+
+    def test_server_timing_only_for_staff(self):
+        client = APIClient()
+        client.force_authenticate(make_user('member@example.com'))
+        self.assertNotIn('Server-Timing', client.get('/api/projects/'))
+        client.force_authenticate(make_user('staff@example.com', is_staff=True))
+        self.assertIn('db;dur=', client.get('/api/projects/')['Server-Timing'])
+        with self.settings(DEBUG=True):
+            self.assertIn('Server-Timing', APIClient().get('/api/service-categories/'))
+
+    def test_serializer_timing_patch_is_undone(self):
+        original = BaseSerializer.data.fget
+        install_serializer_timing()
+        self.addCleanup(uninstall_serializer_timing)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            UserListSerializer(make_user('timed@example.com')).data
+        finally:
+            _current.reset(token)
+        self.assertGreater(metrics.serialize_time, 0)
+        uninstall_serializer_timing()
+        self.assertIs(BaseSerializer.data.fget, original)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RequestProfilerTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.headers = {'Authorization': f'Bearer {AccessToken.for_user(make_user("staff@example.com", is_staff=True))}'}
+
+    def profiler(self, **config):
+        return override_settings(REQUEST_PROFILER={'ENABLED': True, 'DIRECTORY': self.directory, **config})
+
+    def test_off_by_default(self):
+        response = self.client.get('/api/projects/', headers={**self.headers, 'X-Profile': '1'})
+        self.assertNotIn('X-Profile-Id', response)
+
+    def test_cprofile_stops_at_the_deadline(self):
+        with self.profiler(MAX_SECONDS=0):
+            response = self.client.get('/api/projects/', headers={**self.headers, 'X-Profile': 'cprofile'})
+            summary, _ = load_profile(response['X-Profile-Id'])
+        self.assertTrue(summary['truncated'])
+
+    async def test_async_requests_profile_the_view(self):
+        with self.profiler():
+            response = await AsyncClient().get('/api/projects/', headers={**self.headers, 'X-Profile': 'cprofile'})
+            summary, artifact = load_profile(response['X-Profile-Id'])
+        self.assertTrue(artifact.is_file())
+        self.assertFalse(summary['truncated'])
+        self.assertTrue(any('rest_framework/viewsets.py' in line for line in summary['hotspots']))
@@ -1,13 +1,16 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from api.users.views import UserViewSet
+from api.views import CacheStatsView, ProfileDetailView, ProfileListView
+from api.users.views import UserViewSet, LogoutView
 from api.projects.views import ProjectViewSet, TaskViewSet
 from api.moodboards.views import MoodboardViewSet, MoodboardItemViewSet
 from api.vendors.views import (
     ServiceCategoryViewSet,
-    ArtisanProfileViewSet, PortfolioItemViewSet, ReviewViewSet
+    ArtisanProfileViewSet, PortfolioItemViewSet, ReviewViewSet,
+    ArtisanBookingViewSet, MarketplaceCacheStatsView
 )
 
 # Create router and register viewsets
@@ -23,12 +26,27 @@ router.register(r'service-categories', ServiceCategoryViewSet, basename='service
 router.register(r'artisans', ArtisanProfileViewSet, basename='artisan')
 router.register(r'portfolio', PortfolioItemViewSet, basename='portfolio-item')
 router.register(r'reviews', ReviewViewSet, basename='review')
+router.register(r'artisan-bookings', ArtisanBookingViewSet, basename='artisan-booking')
+
+router_urls = router.urls
+if settings.ASYNC_READS:
+    from api.async_views import async_read_urls
+    router_urls = async_read_urls(router_urls)
 
 urlpatterns = [
     # JWT Authentication
     path('auth/login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('auth/logout/', LogoutView.as_view(), name='token_logout'),
+    
+    # Marketplace cache metrics (admin only)
+    path('marketplace/cache-stats/', MarketplaceCacheStatsView.as_view(), name='marketplace_cache_stats'),
+    path('cache/stats/', CacheStatsView.as_view(), name='cache_stats'),
+
+    # Stored request profiles (admin only, see api/profiling.py)
+    path('profiles/', ProfileListView.as_view(), name='profile_list'),
+    path('profiles/<str:profile_id>/', ProfileDetailView.as_view(), name='profile_detail'),
     
     # API routes
-    path('', include(router.urls)),
+    path('', include(router_urls)),
 ]
@@ -0,0 +1,151 @@
+"""
+JWT authentication that resolves ``request.user`` without a query per request.
+
+Users are kept in a bounded per-process LRU with a TTL. Every entry records
+the user's auth stamp, a random token held in the shared cache and
+replaced whenever the user row is saved or deleted (see
+``api/users/signals.py``) or bulk-updated (``UserQuerySet.update``).
+A cached user is only reused while its stamp is current, so a password,
+role or ``is_active`` change made by any worker takes effect everywhere
+within the stamp cache's ``CHECK_INTERVAL`` (see ``api/cache.py``).
+
+Stamps are bumped when the change commits. Bumping earlier would let a
+request in between cache the old row under the new stamp for the full TTL.
+A bump writes a fresh token rather than incrementing, so the shared tier
+needn't increment atomically: concurrent bumps can't end on a value a
+worker already cached under. Stamps expire after ``STAMP_TTL`` seconds of
+no bumps; a missing stamp is simply reseeded, which costs cached users of
+that id one reload.
+"""
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .revocation import is_token_revoked
+
+STAMP_KEY = 'auth:user-stamp:{}'
+
+
+def get_config():
+    config = {'MAX_SIZE': 10000, 'TTL': 300, 'CACHE_ALIAS': 'default', 'STAMP_TTL': 86400}
+    config.update(getattr(settings, 'AUTH_USER_CACHE', {}))
+    return config
+
+
+def _stamp_cache():
+    return caches[get_config()['CACHE_ALIAS']]
+
+
+def _new_stamp():
+    return uuid.uuid4().hex
+
+
+def _seed_stamp(cache, key):
+    # Missing (never set, expired or evicted) stamps get a fresh token, so
+    # a stamp recorded before the loss can't match again
+    cache.add(key, _new_stamp(), timeout=get_config()['STAMP_TTL'])
+    return cache.get(key)
+
+
+def get_auth_stamp(user_id):
+    cache = _stamp_cache()
+    key = STAMP_KEY.format(user_id)
+    stamp = cache.get(key)
+    return stamp if stamp is not None else _seed_stamp(cache, key)
+
+
+def bump_auth_stamp(user_id, using=None):
+    """Invalidate cached copies of this user in every worker once the current transaction commits"""
+    transaction.on_commit(lambda: _bump(user_id), using=using)
+
+
+def _bump(user_id):
+    _stamp_cache().set(STAMP_KEY.format(user_id), _new_stamp(), timeout=get_config()['STAMP_TTL'])
+    user_cache.invalidate(user_id)
+
+
+class UserCache:
+    """Thread-safe bounded LRU of user instances with a TTL and stamp check"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id, stamp):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] != stamp or entry[2] < now:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, user_id, user, stamp):
+        config = get_config()
+        with self._lock:
+            self._entries[user_id] = (user, stamp, time.monotonic() + config['TTL'])
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > config['MAX_SIZE']:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` backed by the per-process user cache"""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        stamp = get_auth_stamp(user_id)
+        user = user_cache.get(user_id, stamp)
+        if user is None:
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user_cache.put(user_id, user, stamp)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        if is_token_revoked(validated_token, user):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        # Each request gets its own instance so views can't leak state into the cache
+        return copy.copy(user)
@@ -0,0 +1,77 @@
+"""
+A concurrency cap for signup password hashing.
+
+``make_password`` (PBKDF2 by default) is CPU-bound and deliberately slow.
+Hashing runs on a small shared pool so a signup burst uses at most
+``WORKERS`` cores; further signups wait their turn. That is all this does:
+the request thread still blocks until its hash is done, so it neither
+frees request workers nor rejects signups. ``hashlib`` releases the GIL
+while hashing, so a thread pool is enough for real parallelism. The
+process pool option is for hashers that don't.
+"""
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+
+def get_config():
+    config = {'OFFLOAD': True, 'EXECUTOR': 'thread', 'WORKERS': 2}
+    config.update(getattr(settings, 'PASSWORD_HASHING', {}))
+    return config
+
+
+def _init_process():
+    import django
+    django.setup()
+
+
+_lock = threading.Lock()
+_executor = None
+
+
+def _get_pool():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                config = get_config()
+                if config['EXECUTOR'] == 'process':
+                    _executor = ProcessPoolExecutor(max_workers=config['WORKERS'], initializer=_init_process)
+                else:
+                    _executor = ThreadPoolExecutor(max_workers=config['WORKERS'], thread_name_prefix='password-hasher')
+    return _executor
+
+
+def hash_password(raw_password):
+    """Hash on the shared pool, waiting for a free worker if need be"""
+    if not get_config()['OFFLOAD']:
+        return make_password(raw_password)
+    return _get_pool().submit(make_password, raw_password).result()
+
+
+def import_pool(workers, executor='process'):
+    """A dedicated pool of ``workers`` for bulk hashing; the caller shuts it down"""
+    if executor == 'process':
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_process)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-import')
+
+
+def hash_many(raw_passwords, pool, workers):
+    """
+    Hash a batch of passwords in parallel on a ``workers``-sized ``import_pool``.
+
+    ``None`` entries produce unusable passwords without touching the pool.
+    """
+    raw_passwords = list(raw_passwords)
+    hashes = [make_password(None) if raw is None else None for raw in raw_passwords]
+    pending = [i for i, raw in enumerate(raw_passwords) if raw is not None]
+    if not pending:
+        return hashes
+
+    chunksize = max(1, len(pending) // (workers * 4))
+    results = pool.map(make_password, (raw_passwords[i] for i in pending), chunksize=chunksize)
+    for i, password_hash in zip(pending, results):
+        hashes[i] = password_hash
+    return hashes
@@ -0,0 +1,317 @@
+"""
+Bulk onboarding of users (and artisan profiles) from CSV or JSON Lines.
+
+Rows are validated without per-row queries, passwords are hashed in
+parallel on one pool per import, and each chunk is inserted with
+``bulk_create`` inside its own transaction. A bad row is reported with its
+line number and skipped; it never aborts the rest of the import. If a
+chunk's insert fails, its rows are retried one at a time so only the
+failing rows are reported.
+
+Uploads of ``QUEUE_MIN_BYTES`` or more are not imported in the request.
+They are saved to ``DIRECTORY`` and imported by a job on the ``imports``
+queue (see ``api/users/jobs.py``), which writes the report next to the
+upload. ``DIRECTORY`` must be shared by the web and job workers.
+
+Columns / keys: ``email``, ``password`` (blank for an unusable password),
+``first_name``, ``last_name``, ``role``, ``phone``, ``bio``, ``location``,
+``business_name``, ``is_verified``. Artisan rows with a ``description``
+also get an ``ArtisanProfile`` from ``description``, ``experience_level``,
+``years_of_experience``, ``address``, ``city``, ``state``, ``country``,
+``website``, ``instagram``, ``facebook``, ``hourly_rate``,
+``min_project_budget``, ``is_available`` and ``services`` (category names,
+``;``-separated in CSV or a list in JSONL).
+"""
+import csv
+import io
+import json
+import shutil
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
+from rest_framework import serializers
+
+from api.vendors.autocomplete import INDEX_VERSION
+from api.vendors.cache import bump_version
+from api.vendors.models import ArtisanProfile, ServiceCategory
+from .hashing import get_config as get_hashing_config, hash_many, import_pool
+
+User = get_user_model()
+
+
+def get_config():
+    config = {
+        'QUEUE_MIN_BYTES': 256 * 1024,
+        'DIRECTORY': Path(settings.BASE_DIR) / 'imports',
+        'EXECUTOR': 'process',
+    }
+    config.update(getattr(settings, 'USER_IMPORT', {}))
+    return config
+
+PROFILE_FIELDS = [
+    'description', 'experience_level', 'years_of_experience', 'address', 'city', 'state', 'country',
+    'website', 'instagram', 'facebook', 'hourly_rate', 'min_project_budget', 'is_available',
+]
+
+
+class ImportRowSerializer(serializers.Serializer):
+    """Field-level validation only; uniqueness is checked per chunk in bulk"""
+    email = serializers.EmailField()
+    password = serializers.CharField(required=False, allow_blank=True, default='')
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    role = serializers.ChoiceField(choices=User.USER_ROLES, required=False, default='designer')
+    phone = serializers.CharField(max_length=20, required=False, allow_blank=True, default='')
+    bio = serializers.CharField(required=False, allow_blank=True, default='')
+    location = serializers.CharField(max_length=200, required=False, allow_blank=True, default='')
+    business_name = serializers.CharField(max_length=200, required=False, allow_blank=True, default='')
+    is_verified = serializers.BooleanField(required=False, default=False)
+
+    # Artisan profile
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+    experience_level = serializers.ChoiceField(choices=ArtisanProfile.EXPERIENCE_LEVELS, required=False, default='intermediate')
+    years_of_experience = serializers.IntegerField(min_value=0, required=False, default=0)
+    address = serializers.CharField(required=False, allow_blank=True, default='')
+    city = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    state = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    country = serializers.CharField(max_length=100, required=False, allow_blank=True, default='Nigeria')
+    website = serializers.URLField(required=False, allow_blank=True, default='')
+    instagram = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    facebook = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    hourly_rate = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, allow_null=True, default=None)
+    min_project_budget = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, allow_null=True, default=None)
+    is_available = serializers.BooleanField(required=False, default=True)
+    services = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+
+    def to_internal_value(self, data):
+        data = {key: value for key, value in data.items() if value not in ('', None) or key == 'password'}
+        services = data.get('services')
+        if isinstance(services, str):
+            data['services'] = [name.strip() for name in services.split(';') if name.strip()]
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        if attrs['description'] and attrs['role'] != 'artisan':
+            raise serializers.ValidationError({'description': 'Only artisan rows can have a profile.'})
+        if attrs['role'] == 'artisan' and attrs['description'] and not attrs['business_name']:
+            raise serializers.ValidationError({'business_name': 'Required for artisan profiles.'})
+        return attrs
+
+
+def read_rows(stream, fmt):
+    """Yield ``(line_number, dict)`` from a text stream in ``csv`` or ``jsonl`` format"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == 'jsonl':
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_number, e
+                continue
+            yield line_number, row if isinstance(row, dict) else ValueError('Expected a JSON object')
+    else:
+        raise ValueError(f'Unsupported format: {fmt}')
+
+
+def guess_format(filename):
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+class UserImporter:
+    def __init__(self, chunk_size=1000, workers=None, executor='process', dry_run=False):
+        self.chunk_size = chunk_size
+        self.workers = workers or get_hashing_config()['WORKERS']
+        self.executor = executor
+        self.pool = None
+        self.dry_run = dry_run
+        self.services = {name.casefold(): pk for pk, name in ServiceCategory.objects.values_list('pk', 'name')}
+        self.seen_emails = set()
+        self.report = {'rows': 0, 'created': 0, 'artisans': 0, 'errors': []}
+
+    def error(self, line, errors):
+        self.report['errors'].append({'line': line, 'errors': errors})
+
+    def run(self, rows):
+        chunk = []
+        try:
+            for line, data in rows:
+                self.report['rows'] += 1
+                if isinstance(data, Exception):
+                    self.error(line, {'row': [str(data)]})
+                    continue
+                chunk.append((line, data))
+                if len(chunk) >= self.chunk_size:
+                    self.import_chunk(chunk)
+                    chunk = []
+            if chunk:
+                self.import_chunk(chunk)
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+                self.pool = None
+        if self.report['artisans']:
+            # bulk_create sends no post_save; refresh cached marketplace listings
+            bump_version(ArtisanProfile)
+            bump_version(INDEX_VERSION)
+        self.report['errors'].sort(key=lambda error: error['line'])
+        return self.report
+
+    def validate_chunk(self, chunk):
+        valid = []
+        for line, data in chunk:
+            serializer = ImportRowSerializer(data=data)
+            if not serializer.is_valid():
+                self.error(line, serializer.errors)
+                continue
+            row = serializer.validated_data
+            row['email'] = User.objects.normalize_email(row['email'])
+            key = row['email'].lower()
+            if key in self.seen_emails:
+                self.error(line, {'email': ['Duplicate email in this import.']})
+                continue
+            unknown = [name for name in row['services'] if name.casefold() not in self.services]
+            if unknown:
+                self.error(line, {'services': [f"Unknown service category: {', '.join(unknown)}"]})
+                continue
+            self.seen_emails.add(key)
+            valid.append((line, row))
+
+        existing = {
+            email.lower() for email in
+            User.objects.filter(email__in=[row['email'] for _, row in valid]).values_list('email', flat=True)
+        }
+        if not existing:
+            return valid
+        result = []
+        for line, row in valid:
+            if row['email'].lower() in existing:
+                self.error(line, {'email': ['A user with this email already exists.']})
+            else:
+                result.append((line, row))
+        return result
+
+    def import_chunk(self, chunk):
+        rows = self.validate_chunk(chunk)
+        if self.dry_run:
+            # Report what would be created without hashing or writing
+            self.report['created'] += len(rows)
+            self.report['artisans'] += sum(1 for _, row in rows if row['role'] == 'artisan' and row['description'])
+            return
+        if not rows:
+            return
+
+        if self.pool is None:
+            # One pool for the whole import; starting processes per chunk costs more than small chunks hash
+            self.pool = import_pool(self.workers, self.executor)
+        hashes = hash_many([row['password'] or None for _, row in rows], self.pool, self.workers)
+        try:
+            self.insert(rows, hashes)
+        except DatabaseError:
+            # Find the rows at fault, e.g. an email registered since validation
+            for row, password_hash in zip(rows, hashes):
+                try:
+                    self.insert([row], [password_hash])
+                except DatabaseError as e:
+                    self.error(row[0], {'row': [f'Insert failed: {e}']})
+
+    def insert(self, rows, hashes):
+        """Insert users (and profiles) for ``rows`` in one transaction"""
+        users = []
+        for (_, row), password_hash in zip(rows, hashes):
+            users.append(User(
+                email=row['email'], password=password_hash,
+                **{field: row[field] for field in (
+                    'first_name', 'last_name', 'role', 'phone', 'bio', 'location', 'business_name', 'is_verified'
+                )}
+            ))
+
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            profiles = []
+            service_ids = []
+            for (_, row), user in zip(rows, users):
+                if row['role'] == 'artisan' and row['description']:
+                    profiles.append(ArtisanProfile(
+                        user=user, business_name=row['business_name'], phone=row['phone'], email=row['email'],
+                        **{field: row[field] for field in PROFILE_FIELDS}
+                    ))
+                    service_ids.append([self.services[name.casefold()] for name in row['services']])
+            ArtisanProfile.objects.bulk_create(profiles)
+            Through = ArtisanProfile.services.through
+            Through.objects.bulk_create([
+                Through(artisanprofile_id=profile.pk, servicecategory_id=service_id)
+                for profile, ids in zip(profiles, service_ids) for service_id in set(ids)
+            ])
+
+        self.report['created'] += len(users)
+        self.report['artisans'] += len(profiles)
+
+
+def import_users(stream, fmt='csv', **options):
+    """Import rows from a text stream and return the report"""
+    return UserImporter(**options).run(read_rows(stream, fmt))
+
+
+def import_uploaded_file(uploaded, fmt=None, **options):
+    fmt = fmt or guess_format(uploaded.name)
+    stream = io.TextIOWrapper(uploaded.file, encoding='utf-8-sig', newline='')
+    return import_users(stream, fmt, **options)
+
+
+def _path(import_id, suffix):
+    # Ids are generated here; anything else is not one of ours
+    if not isinstance(import_id, str) or len(import_id) != 32 or not import_id.isalnum():
+        return None
+    return Path(get_config()['DIRECTORY']) / f'{import_id}{suffix}'
+
+
+def queue_uploaded_file(uploaded, fmt=None, dry_run=False):
+    """Save the upload for the ``imports`` queue and return its import id"""
+    from .jobs import run_queued_import
+
+    fmt = fmt or guess_format(uploaded.name)
+    import_id = uuid.uuid4().hex
+    path = _path(import_id, '.upload')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        uploaded.file.seek(0)
+        shutil.copyfileobj(uploaded.file, f)
+    run_queued_import.enqueue(import_id, fmt, dry_run, dedupe_key=f'user-import:{import_id}')
+    return import_id
+
+
+def import_saved_file(import_id, fmt, dry_run=False):
+    """Import a queued upload, store its report and remove the upload"""
+    path = _path(import_id, '.upload')
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        report = import_users(stream, fmt, executor=get_config()['EXECUTOR'], dry_run=dry_run)
+    _path(import_id, '.json').write_text(json.dumps(report, default=str))
+    path.unlink()
+    return report
+
+
+def import_status(import_id):
+    """Status of a queued import, with its report once done; None if unknown"""
+    from api.jobs.models import Job
+
+    path = _path(import_id, '.json')
+    if path is None:
+        return None
+    if path.is_file():
+        return {'id': import_id, 'status': Job.DONE, 'report': json.loads(path.read_text())}
+    queued = Job.objects.filter(dedupe_key=f'user-import:{import_id}').order_by('-id').first()
+    if queued is None:
+        return None
+    status = {'id': import_id, 'status': queued.status}
+    if queued.status == Job.FAILED:
+        # The exception line of the stored traceback
+        status['error'] = queued.last_error.strip().splitlines()[-1]
+    return status
@@ -0,0 +1,10 @@
+from api.jobs.queue import job
+
+from . import importer
+
+
+@job(queue='imports', max_attempts=1)
+def run_queued_import(import_id, fmt, dry_run=False):
+    """Import a large upload saved by ``importer.queue_uploaded_file``"""
+    # One attempt: a rerun would report rows created the first time as duplicates
+    importer.import_saved_file(import_id, fmt, dry_run)
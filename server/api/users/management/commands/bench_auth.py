@@ -0,0 +1,62 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+from api.projects.views import ProjectViewSet, TaskViewSet
+from api.users.authentication import CachedJWTAuthentication, user_cache
+
+User = get_user_model()
+
+ENDPOINTS = [
+    ('projects', ProjectViewSet, '/api/projects/'),
+    ('tasks', TaskViewSet, '/api/tasks/'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request queries and latency of stock vs cached JWT authentication'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', help='User to authenticate as (default: the user with most projects)')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint and auth class')
+
+    def handle(self, *args, **options):
+        if options['email']:
+            user = User.objects.filter(email=options['email']).first()
+        else:
+            user = User.objects.annotate(n=Count('projects')).order_by('-n').first()
+        if user is None:
+            raise CommandError('No user found; run seed_data first.')
+
+        token = str(AccessToken.for_user(user))
+        factory = APIRequestFactory()
+        self.stdout.write(f'Authenticating as {user.email}, {options["requests"]} requests per run\n')
+
+        for name, viewset, path in ENDPOINTS:
+            for auth_class in (JWTAuthentication, CachedJWTAuthentication):
+                user_cache.clear()
+                view = viewset.as_view({'get': 'list'}, authentication_classes=[auth_class])
+                timings = []
+                queries = 0
+                for _ in range(options['requests']):
+                    request = factory.get(path, HTTP_AUTHORIZATION=f'Bearer {token}')
+                    with CaptureQueriesContext(connection) as captured:
+                        started = time.perf_counter()
+                        response = view(request)
+                        response.render()
+                        timings.append(time.perf_counter() - started)
+                    queries += len(captured)
+                    if response.status_code != 200:
+                        raise CommandError(f'{path} returned {response.status_code}')
+                self.stdout.write(
+                    f'{name:<9} {auth_class.__name__:<24} '
+                    f'{queries / options["requests"]:5.2f} queries/request  '
+                    f'p50 {statistics.median(timings) * 1000:6.2f}ms'
+                )
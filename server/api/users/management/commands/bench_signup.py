@@ -0,0 +1,70 @@
+import math
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings
+from api.users import hashing
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Measure signup throughput under concurrency, hashing inline vs on the hashing pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--signups', type=int, default=100, help='Signups per mode')
+        parser.add_argument('--concurrency', type=int, default=16, help='Concurrent client threads')
+        parser.add_argument('--workers', type=int, default=None, help='Hashing pool size (default: setting)')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{options['signups']} signups per mode, {options['concurrency']} concurrent clients, "
+            f"hasher {self.hasher_name()}\n"
+        )
+        for offload in (False, True):
+            config = {**hashing.get_config(), 'OFFLOAD': offload}
+            if options['workers']:
+                config['WORKERS'] = options['workers']
+            with override_settings(PASSWORD_HASHING=config):
+                # Pool is sized on first use; rebuild it for this run's settings
+                hashing._executor = None
+                self.run(offload, options['signups'], options['concurrency'])
+
+    def hasher_name(self):
+        from django.contrib.auth.hashers import get_hasher
+        return get_hasher().algorithm
+
+    def run(self, offload, signups, concurrency):
+        prefix = f'bench-signup-{uuid.uuid4().hex[:8]}'
+
+        def signup(i):
+            started = time.perf_counter()
+            response = Client().post('/api/users/', {
+                'email': f'{prefix}-{i}@example.com',
+                'password': 'Bench-pass-1234', 'password2': 'Bench-pass-1234',
+                'first_name': 'Bench', 'last_name': 'User', 'role': 'artisan',
+            }, HTTP_HOST='localhost')
+            connections.close_all()
+            return response.status_code, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(signup, range(signups)))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for code, latency in results if code == 201)
+        created = len(latencies)
+        User.objects.filter(email__startswith=prefix).delete()
+
+        p95 = latencies[max(0, math.ceil(len(latencies) * 0.95) - 1)] if latencies else 0
+        self.stdout.write(
+            f"{'pool' if offload else 'inline':<7} {created / elapsed:7.1f} signups/s  "
+            f"p50 {statistics.median(latencies) * 1000 if latencies else 0:7.1f}ms  "
+            f"p95 {p95 * 1000:7.1f}ms  created {created}  failed {len(results) - created}"
+        )
@@ -0,0 +1,47 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.users.importer import guess_format, import_users
+
+
+class Command(BaseCommand):
+    help = 'Bulk import users and artisan profiles from a CSV or JSON Lines file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help='Path to a .csv or .jsonl file')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], default=None, help='Default: from the file extension')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows validated and inserted per transaction')
+        parser.add_argument('--workers', type=int, default=None, help='Hashing processes (default: PASSWORD_HASHING WORKERS)')
+        parser.add_argument('--executor', choices=['process', 'thread'], default='process')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only; nothing is hashed or written')
+        parser.add_argument('--report', default=None, help='Write the full JSON report to this path')
+
+    def handle(self, *args, **options):
+        path = options['file']
+        fmt = options['format'] or guess_format(path)
+        started = time.perf_counter()
+        try:
+            with open(path, encoding='utf-8-sig', newline='') as stream:
+                report = import_users(
+                    stream, fmt, chunk_size=options['chunk_size'], workers=options['workers'],
+                    executor=options['executor'], dry_run=options['dry_run'],
+                )
+        except OSError as e:
+            raise CommandError(e)
+        elapsed = time.perf_counter() - started
+
+        if options['report']:
+            with open(options['report'], 'w') as f:
+                json.dump(report, f, indent=2, default=str)
+        for error in report['errors'][:20]:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'], default=str)}")
+        if len(report['errors']) > 20:
+            self.stderr.write(f"... {len(report['errors']) - 20} more errors")
+
+        verb = 'Would create' if options['dry_run'] else 'Created'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['created']} users ({report['artisans']} artisan profiles) from {report['rows']} rows "
+            f"in {elapsed:.2f}s, {len(report['errors'])} rejected"
+        ))
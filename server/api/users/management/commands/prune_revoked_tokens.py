@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from api.users.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = 'Delete revoked-token rows whose tokens have expired anyway'
+
+    def handle(self, *args, **kwargs):
+        deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired revocations'))
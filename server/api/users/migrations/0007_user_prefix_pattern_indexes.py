@@ -0,0 +1,32 @@
+from django.db import migrations
+
+FIELDS = ['email', 'first_name', 'last_name']
+
+
+def create_pattern_indexes(apps, schema_editor):
+    # PostgreSQL only uses an index for LIKE 'prefix%' under a non-C collation
+    # with text_pattern_ops; SQLite serves prefix ranges from users_*_lower_idx
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field in FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS users_{field}_pattern_idx ON users_user (lower({field}) text_pattern_ops)'
+        )
+
+
+def drop_pattern_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field in FIELDS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS users_{field}_pattern_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_directory_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_pattern_indexes, drop_pattern_indexes),
+    ]
@@ -1,8 +1,28 @@
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 
-class UserManager(BaseUserManager):
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        Bulk updates (admin actions, scripts, bulk_update) send no post_save,
+        so bump the auth stamps of the affected users here (see signals.py)
+        """
+        if set(kwargs) <= {'last_login'}:
+            return super().update(**kwargs)
+        from .authentication import bump_auth_stamp
+
+        user_ids = list(self.values_list('pk', flat=True))
+        updated = super().update(**kwargs)
+        for user_id in user_ids:
+            bump_auth_stamp(user_id, self.db)
+        return updated
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     """Custom user manager for email-based authentication"""
     
     def create_user(self, email, password=None, **extra_fields):
@@ -14,6 +34,14 @@ class UserManager(BaseUserManager):
         user.save(using=self._db)
         return user
     
+    def create_user_with_hash(self, email, password_hash, **extra_fields):
+        """Create a user whose password was already hashed with make_password"""
+        if not email:
+            raise ValueError('Email is required')
+        user = self.model(email=self.normalize_email(email), password=password_hash, **extra_fields)
+        user.save(using=self._db)
+        return user
+    
     def create_superuser(self, email, password=None, **extra_fields):
         extra_fields.setdefault('is_staff', True)
         extra_fields.setdefault('is_superuser', True)
@@ -55,9 +83,27 @@ class User(AbstractUser):
     is_verified = models.BooleanField(default=False, help_text='Verified artisan/vendor')
     business_name = models.CharField(max_length=200, blank=True, help_text='Business or company name')
     
+    # JWTs issued before this moment are rejected (password change, admin disable)
+    tokens_valid_after = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Directory filters; id last so filtered pages come back in index order
+            models.Index(fields=['role', 'is_verified', 'id'], name='users_role_verified_idx'),
+            # Case-insensitive prefix search (see UserViewSet.get_queryset)
+            models.Index(Lower('email'), name='users_email_lower_idx'),
+            models.Index(Lower('last_name'), name='users_last_name_lower_idx'),
+            models.Index(Lower('first_name'), name='users_first_name_lower_idx'),
+        ]
+    
     def __str__(self):
         return self.email
     
+    def set_password(self, raw_password):
+        super().set_password(raw_password)
+        if not self._state.adding:
+            self.tokens_valid_after = timezone.now()
+    
     @property
     def is_designer(self):
         return self.role == 'designer'
@@ -69,3 +115,27 @@ class User(AbstractUser):
     @property
     def is_artisan(self):
         return self.role == 'artisan'
+
+
+class RevokedToken(models.Model):
+    """Individually revoked JWTs, mirrored into each worker's Bloom filter"""
+    
+    REASON_CHOICES = [
+        ('logout', 'Logout'),
+        ('rotation', 'Refresh token rotation'),
+        ('admin', 'Revoked by admin'),
+    ]
+    
+    jti = models.CharField(max_length=255, unique=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True, related_name='revoked_tokens')
+    token_type = models.CharField(max_length=20)
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES, default='logout')
+    expires_at = models.DateTimeField(db_index=True)
+    # Workers load recent revocations by time (see api/users/revocation.py)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        ordering = ['-revoked_at']
+    
+    def __str__(self):
+        return f"{self.token_type} {self.jti} ({self.reason})"
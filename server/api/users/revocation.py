@@ -0,0 +1,193 @@
+"""
+Token revocation checked against a per-worker Bloom filter.
+
+Revoked ``jti`` values live in the ``RevokedToken`` table. Each worker
+mirrors the unexpired ones into a Bloom filter. Every revocation bumps a
+revision counter in the shared cache (``incr``, once committed), so a
+worker only queries when something was actually revoked. It then loads
+the rows revoked since its previous load, less ``OVERLAP`` seconds. Row
+ids aren't used as a high-water mark, because on PostgreSQL a lower id
+can commit after a higher one. The overlap covers transactions that
+commit late and clock skew between servers. As a backstop, each worker
+rebuilds its filter from the table every ``REBUILD_INTERVAL`` seconds.
+
+A token whose ``jti`` is not in the filter is definitely not revoked; the
+table is consulted only on filter hits.
+
+Password changes and admin disables don't enumerate tokens. They set
+``User.tokens_valid_after``, which is compared with the token's ``iat``
+on the (cached) user.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from .bloom import BloomFilter
+
+REVISION_KEY = 'auth:revocation:revision'
+
+
+def get_config():
+    config = {
+        'CAPACITY': 100000, 'ERROR_RATE': 0.001, 'CACHE_ALIAS': 'default',
+        'OVERLAP': 60, 'REBUILD_INTERVAL': 3600,
+    }
+    config.update(getattr(settings, 'TOKEN_REVOCATION', {}))
+    return config
+
+
+def _cache():
+    return caches[get_config()['CACHE_ALIAS']]
+
+
+def _seed_revision(cache):
+    # Restart a lost counter from the clock so it can't repeat a revision
+    # a worker has already seen
+    cache.add(REVISION_KEY, time.time_ns(), timeout=None)
+    return cache.get(REVISION_KEY)
+
+
+def publish_revision():
+    cache = _cache()
+    try:
+        cache.incr(REVISION_KEY)
+    except ValueError:
+        _seed_revision(cache)
+        cache.incr(REVISION_KEY)
+
+
+class RevocationList:
+    """This worker's view of the revoked-token table"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bloom = None
+        # Revision seen before the last load, and when that load started
+        self.revision = None
+        self.loaded_at = None
+        self.built = 0.0
+        self.stats = {'checks': 0, 'filter_hits': 0, 'false_positives': 0, 'refreshes': 0, 'rebuilds': 0}
+
+    def _load(self, jtis):
+        for jti in jtis:
+            # Overlapping loads see rows again; don't count them twice
+            if jti in self.bloom:
+                continue
+            if self.bloom.is_full:
+                # Grow instead of letting the false-positive rate climb
+                return self.rebuild(capacity=self.bloom.capacity * 2)
+            self.bloom.add(jti)
+
+    def rebuild(self, capacity=None):
+        from .models import RevokedToken
+
+        config = get_config()
+        started = timezone.now()
+        active = RevokedToken.objects.filter(expires_at__gt=started)
+        capacity = max(capacity or config['CAPACITY'], active.count() * 2, 1)
+        self.bloom = BloomFilter(capacity, config['ERROR_RATE'])
+        self._load(active.values_list('jti', flat=True).iterator(chunk_size=10000))
+        self.loaded_at = started
+        self.built = time.monotonic()
+        self.stats['rebuilds'] += 1
+
+    def stale(self):
+        return self.bloom is None or time.monotonic() - self.built >= get_config()['REBUILD_INTERVAL']
+
+    def refresh(self):
+        """Pull rows revoked since the last load, if the revision moved"""
+        from .models import RevokedToken
+
+        published = _cache().get(REVISION_KEY)
+        if published is not None and published == self.revision and not self.stale():
+            return
+        with self._lock:
+            if published is None:
+                # Cache was cleared or never populated
+                published = _seed_revision(_cache())
+            # The revision is read before loading: rows it covers were
+            # committed before it was bumped, so the load sees them
+            if self.stale():
+                self.rebuild()
+            else:
+                started = timezone.now()
+                since = self.loaded_at - timedelta(seconds=get_config()['OVERLAP'])
+                self._load(RevokedToken.objects.filter(revoked_at__gte=since).values_list('jti', flat=True))
+                # Also right if the load grew the filter: a rebuild starts later
+                self.loaded_at = started
+            self.revision = published
+            self.stats['refreshes'] += 1
+
+    def is_revoked(self, jti):
+        from .models import RevokedToken
+
+        self.refresh()
+        self.stats['checks'] += 1
+        if jti not in self.bloom:
+            return False
+        self.stats['filter_hits'] += 1
+        if RevokedToken.objects.filter(jti=jti).exists():
+            return True
+        self.stats['false_positives'] += 1
+        return False
+
+    def added(self, jti):
+        with self._lock:
+            if self.bloom is not None and jti not in self.bloom:
+                self.bloom.add(jti)
+        # Other workers must not look before the row is visible to them
+        transaction.on_commit(publish_revision)
+
+    def describe(self):
+        bloom = self.bloom
+        return {
+            **self.stats,
+            'entries': len(bloom) if bloom else 0,
+            'capacity': bloom.capacity if bloom else 0,
+            'memory_bytes': bloom.memory_bytes if bloom else 0,
+            'hash_functions': bloom.num_hashes if bloom else 0,
+        }
+
+
+revocation_list = RevocationList()
+
+
+def revoke_token(token, user=None, reason='logout'):
+    """Revoke a single validated token by its ``jti``"""
+    from .models import RevokedToken
+
+    jti = token[api_settings.JTI_CLAIM]
+    expires_at = datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(
+                jti=jti, user=user, token_type=token.get(api_settings.TOKEN_TYPE_CLAIM, ''),
+                reason=reason, expires_at=expires_at,
+            )
+    except IntegrityError:
+        # Already revoked
+        return
+    revocation_list.added(jti)
+
+
+def revoke_user_tokens(user):
+    """Reject every token issued to ``user`` so far"""
+    from .models import User
+
+    user.tokens_valid_after = timezone.now()
+    # UserQuerySet.update() bumps the user's auth stamp
+    User.objects.filter(pk=user.pk).update(tokens_valid_after=user.tokens_valid_after)
+
+
+def is_token_revoked(token, user):
+    """True if ``token`` was revoked individually or by a user-wide cutoff"""
+    cutoff = user.tokens_valid_after
+    if cutoff is not None and token.get('iat', 0) < int(cutoff.timestamp()):
+        return True
+    return revocation_list.is_revoked(token[api_settings.JTI_CLAIM])
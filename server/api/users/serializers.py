@@ -1,5 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import CachedJWTAuthentication
+from .hashing import hash_password
+from .revocation import revoke_token
 
 User = get_user_model()
 
@@ -14,6 +20,16 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'is_verified']
 
 
+class UserListSerializer(serializers.ModelSerializer):
+    """Directory listing: only the columns the list query loads"""
+    class Meta:
+        model = User
+        fields = [
+            'id', 'email', 'first_name', 'last_name', 'role', 'location', 'profile_image', 'is_verified', 'business_name'
+        ]
+        read_only_fields = fields
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, style={'input_type': 'password'})
     password2 = serializers.CharField(write_only=True, required=True, style={'input_type': 'password'}, label='Confirm Password')
@@ -38,5 +54,37 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.pop('password2')
-        user = User.objects.create_user(**validated_data)
+        password_hash = hash_password(validated_data.pop('password'))
+        user = User.objects.create_user_with_hash(password_hash=password_hash, **validated_data)
         return user
+
+
+class PasswordChangeSerializer(serializers.Serializer):
+    old_password = serializers.CharField(write_only=True, style={'input_type': 'password'})
+    new_password = serializers.CharField(write_only=True, style={'input_type': 'password'})
+
+    def validate_old_password(self, value):
+        if not self.context['request'].user.check_password(value):
+            raise serializers.ValidationError('Current password is incorrect.')
+        return value
+
+    def validate_new_password(self, value):
+        validate_password(value, self.context['request'].user)
+        return value
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField(required=False, help_text='Refresh token to revoke along with the access token')
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """Refresh that rejects revoked tokens and revokes rotated refresh tokens"""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        # Raises for unknown, inactive or revoked users/tokens (user comes from the cache)
+        user = CachedJWTAuthentication().get_user(refresh)
+        data = super().validate(attrs)
+        if api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION:
+            revoke_token(refresh, user, reason='rotation')
+        return data
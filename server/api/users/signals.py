@@ -0,0 +1,22 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .authentication import bump_auth_stamp
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user(sender, instance, created, using, update_fields=None, **kwargs):
+    """Cached request users must see password/role/is_active and profile edits"""
+    if created:
+        return
+    # Login timestamps don't affect authentication or serialized profiles
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_auth_stamp(instance.pk, using)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user(sender, instance, using, **kwargs):
+    bump_auth_stamp(instance.pk, using)
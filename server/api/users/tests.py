@@ -0,0 +1,311 @@
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.jobs import queue as jobs
+from api.tests import make_user
+from api.vendors.models import ArtisanProfile, ServiceCategory
+from . import importer
+from .authentication import STAMP_KEY, CachedJWTAuthentication, _stamp_cache, get_auth_stamp, user_cache
+from .bloom import BloomFilter
+from .models import RevokedToken, User
+from .revocation import REVISION_KEY, RevocationList, _cache, publish_revision, revocation_list, revoke_token
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'users-tests'}}
+
+
+class BloomFilterTests(TestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        items = [f'jti-{i}' for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+
+    def test_false_positive_rate_near_target(self):
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f'jti-{i}')
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.03)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, TOKEN_REVOCATION={'CAPACITY': 4})
+class RevocationTests(TestCase):
+    def setUp(self):
+        _cache().clear()
+        # The module-level list outlives test transactions; start it empty
+        revocation_list.bloom = None
+        self.user = User.objects.create_user(email='revoke@example.com', password='pw', first_name='R', last_name='T')
+
+    def revoke(self):
+        token = AccessToken.for_user(self.user)
+        # The revision is published when the revocation commits
+        with self.captureOnCommitCallbacks(execute=True):
+            revoke_token(token, self.user)
+        return token['jti']
+
+    def insert(self, jti, revoked_ago):
+        """A revoked row written without publishing, revoked ``revoked_ago`` seconds back"""
+        row = RevokedToken.objects.create(jti=jti, token_type='access', expires_at=timezone.now() + timedelta(hours=1))
+        RevokedToken.objects.filter(pk=row.pk).update(revoked_at=timezone.now() - timedelta(seconds=revoked_ago))
+
+    def test_revoked_tokens_are_never_missed(self):
+        # More revocations than the filter's capacity forces it to grow
+        revoked = [self.revoke() for _ in range(10)]
+        self.assertTrue(all(revocation_list.is_revoked(jti) for jti in revoked))
+        self.assertFalse(revocation_list.is_revoked(AccessToken.for_user(self.user)['jti']))
+        self.assertGreaterEqual(revocation_list.bloom.capacity, 10)
+
+    def test_other_workers_catch_up_through_published_revision(self):
+        other = RevocationList()
+        self.assertFalse(other.is_revoked('unknown'))
+        jti = self.revoke()
+        self.assertNotEqual(_cache().get(REVISION_KEY), other.revision)
+        self.assertTrue(other.is_revoked(jti))
+
+    def test_revisions_only_move_forward(self):
+        self.revoke()
+        revision = _cache().get(REVISION_KEY)
+        self.revoke()
+        self.revoke()
+        self.assertEqual(_cache().get(REVISION_KEY), revision + 2)
+
+    def test_late_commits_within_the_overlap_are_loaded(self):
+        other = RevocationList()
+        other.refresh()
+        # Written before the worker's last load but committed after it,
+        # e.g. a lower id committing late on PostgreSQL
+        self.insert('late', revoked_ago=30)
+        publish_revision()
+        self.assertTrue(other.is_revoked('late'))
+
+    def test_periodic_rebuild_catches_anything_missed(self):
+        other = RevocationList()
+        other.refresh()
+        self.insert('missed', revoked_ago=3600)
+        publish_revision()
+        self.assertFalse(other.is_revoked('missed'))
+        with self.settings(TOKEN_REVOCATION={'CAPACITY': 4, 'REBUILD_INTERVAL': 0}):
+            self.assertTrue(other.is_revoked('missed'))
+        self.assertEqual(other.stats['rebuilds'], 2)
+
+    def test_up_to_date_worker_skips_the_database(self):
+        other = RevocationList()
+        other.refresh()
+        with self.assertNumQueries(0):
+            other.refresh()
+
+    def test_cleared_cache_is_reseeded(self):
+        revocation_list.refresh()
+        jti = self.revoke()
+        _cache().clear()
+        self.assertTrue(revocation_list.is_revoked(jti))
+        self.assertEqual(_cache().get(REVISION_KEY), revocation_list.revision)
+
+    def test_filter_hits_are_confirmed_in_the_table(self):
+        other = RevocationList()
+        other.refresh()
+        other.bloom.add('not-revoked')
+        self.assertFalse(other.is_revoked('not-revoked'))
+        self.assertEqual(other.stats['false_positives'], 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        _stamp_cache().clear()
+        user_cache.clear()
+        revocation_list.bloom = None
+        self.user = User.objects.create_user(email='cached@example.com', password='pw', first_name='C', last_name='U')
+        self.token = AccessToken.for_user(self.user)
+        # Issued before any change the tests make
+        self.token['iat'] -= 10
+
+    def authenticate(self):
+        return CachedJWTAuthentication().get_user(self.token)
+
+    def test_cached_user_skips_the_user_query(self):
+        self.authenticate()
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertEqual(user.pk, self.user.pk)
+        # Each request gets its own copy
+        user.first_name = 'Changed'
+        self.assertEqual(self.authenticate().first_name, 'C')
+
+    def test_lost_stamps_only_cost_a_reload(self):
+        self.authenticate()
+        # Expired or evicted from the shared cache
+        _stamp_cache().delete(STAMP_KEY.format(self.user.pk))
+        with self.assertNumQueries(1):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            self.authenticate()
+
+    def test_deactivation_applies_once_committed(self):
+        self.authenticate()
+        stamp = get_auth_stamp(self.user.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.is_active = False
+            self.user.save()
+        # Other requests still see the committed row until then
+        self.assertEqual(get_auth_stamp(self.user.pk), stamp)
+        for callback in callbacks:
+            callback()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_password_change_rejects_older_tokens(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('new-password')
+            self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_bulk_updates_invalidate_cached_users(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_login_timestamps_keep_the_cache(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            User.objects.filter(pk=self.user.pk).update(last_login=self.user.date_joined)
+            self.user.save(update_fields=['last_login'])
+        self.assertEqual(callbacks, [])
+
+
+class SignupHashingTests(TestCase):
+    def test_signup_hashes_on_the_pool(self):
+        response = self.client.post('/api/users/', {
+            'email': 'signup@example.com', 'password': 'Signup-pass-1234', 'password2': 'Signup-pass-1234',
+            'first_name': 'S', 'last_name': 'U', 'role': 'designer',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.get(email='signup@example.com').check_password('Signup-pass-1234'))
+
+
+CSV_HEADER = 'email,password,first_name,role,business_name,description,services\n'
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserImporterTests(TestCase):
+    def setUp(self):
+        ServiceCategory.objects.create(name='Carpentry')
+        make_user('taken@example.com')
+
+    def run_import(self, text, fmt='csv', **options):
+        return importer.import_users(io.StringIO(text), fmt, executor='thread', workers=2, **options)
+
+    def test_valid_rows_are_created_and_bad_rows_reported(self):
+        report = self.run_import(CSV_HEADER + (
+            'ada@example.com,Secret-pass-1,Ada,designer,,,\n'
+            'wood@example.com,,Wole,artisan,Wole Woodworks,Stairs and doors,carpentry\n'
+            'not-an-email,,X,designer,,,\n'
+            'ADA@example.com,,Dup,designer,,,\n'
+            'taken@example.com,,T,designer,,,\n'
+            'tiles@example.com,,T,artisan,Tiles,Floors,Tiling\n'
+        ))
+        self.assertEqual((report['rows'], report['created'], report['artisans']), (6, 2, 1))
+        self.assertEqual([(error['line'], list(error['errors'])) for error in report['errors']], [
+            (4, ['email']), (5, ['email']), (6, ['email']), (7, ['services']),
+        ])
+        self.assertTrue(User.objects.get(email='ada@example.com').check_password('Secret-pass-1'))
+        self.assertFalse(User.objects.get(email='wood@example.com').has_usable_password())
+        profile = ArtisanProfile.objects.get(user__email='wood@example.com')
+        self.assertEqual([service.name for service in profile.services.all()], ['Carpentry'])
+
+    def test_jsonl_reports_unparseable_lines(self):
+        report = self.run_import(
+            '{"email": "one@example.com"}\n\nnot json\n["a list"]\n{"email": "two@example.com"}\n', 'jsonl',
+        )
+        self.assertEqual(report['created'], 2)
+        self.assertEqual([error['line'] for error in report['errors']], [3, 4])
+
+    def test_dry_run_writes_nothing(self):
+        report = self.run_import(CSV_HEADER + 'ada@example.com,pw,Ada,designer,,,\n', dry_run=True)
+        self.assertEqual(report['created'], 1)
+        self.assertFalse(User.objects.filter(email='ada@example.com').exists())
+
+    def test_one_hashing_pool_per_import(self):
+        rows = ''.join(f'user{i}@example.com,pw-{i},U,designer,,,\n' for i in range(5))
+        with mock.patch.object(importer, 'import_pool', wraps=importer.import_pool) as import_pool:
+            report = self.run_import(CSV_HEADER + rows, chunk_size=2)
+        self.assertEqual(report['created'], 5)
+        import_pool.assert_called_once_with(2, 'thread')
+
+    def test_insert_failures_are_reported_against_the_failing_row(self):
+        validate_chunk = importer.UserImporter.validate_chunk
+
+        def signup_meanwhile(self, chunk):
+            valid = validate_chunk(self, chunk)
+            make_user('racer@example.com')
+            return valid
+
+        with mock.patch.object(importer.UserImporter, 'validate_chunk', signup_meanwhile):
+            report = self.run_import(CSV_HEADER + (
+                'first@example.com,,F,designer,,,\n'
+                'racer@example.com,,R,designer,,,\n'
+                'third@example.com,,T,designer,,,\n'
+            ))
+        self.assertEqual(report['created'], 2)
+        self.assertEqual([error['line'] for error in report['errors']], [3])
+        self.assertEqual(User.objects.filter(email__in=['first@example.com', 'third@example.com']).count(), 2)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'], JOBS={'ALWAYS_EAGER': False})
+class ImportEndpointTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.client = APIClient()
+        self.client.force_authenticate(make_user('admin@example.com', is_staff=True))
+
+    def upload(self, rows, **data):
+        csv = SimpleUploadedFile('users.csv', (CSV_HEADER + rows).encode(), content_type='text/csv')
+        return self.client.post('/api/users/import/', {'file': csv, **data}, format='multipart')
+
+    def settings_queueing_over(self, size):
+        return self.settings(USER_IMPORT={'QUEUE_MIN_BYTES': size, 'DIRECTORY': self.directory, 'EXECUTOR': 'thread'})
+
+    def test_small_files_import_in_the_request(self):
+        with self.settings_queueing_over(1024):
+            response = self.upload('ada@example.com,,Ada,designer,,,\nbad,,B,designer,,,\n')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], len(response.data['errors'])), (1, 1))
+        self.assertEqual(self.upload('', dry_run='true').status_code, 200)
+
+    def test_admins_only(self):
+        self.client.force_authenticate(make_user('user@example.com'))
+        self.assertEqual(self.upload('ada@example.com,,Ada,designer,,,\n').status_code, 403)
+
+    def test_large_files_are_queued(self):
+        with self.settings_queueing_over(1):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.upload('ada@example.com,,Ada,designer,,,\n')
+            self.assertEqual(response.status_code, 202)
+            path = f"/api/users/import/{response.data['id']}/"
+            self.assertEqual(self.client.get(path).data['status'], 'queued')
+            self.assertFalse(User.objects.filter(email='ada@example.com').exists())
+
+            self.assertTrue(jobs.run(jobs.claim('imports', 1, 'worker')))
+            result = self.client.get(path).data
+        self.assertEqual((result['status'], result['report']['created']), ('done', 1))
+        self.assertTrue(User.objects.filter(email='ada@example.com').exists())
+
+    def test_unknown_imports_are_not_found(self):
+        with self.settings_queueing_over(1):
+            self.assertEqual(self.client.get(f'/api/users/import/{"0" * 32}/').status_code, 404)
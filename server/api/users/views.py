@@ -1,18 +1,72 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
+from rest_framework.parsers import MultiPartParser
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.contrib.auth import get_user_model
-from .serializers import UserSerializer, UserRegistrationSerializer
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Lower
+from .importer import get_config as get_import_config, import_status, import_uploaded_file, queue_uploaded_file
+from .revocation import revoke_token
+from .serializers import UserSerializer, UserListSerializer, UserRegistrationSerializer, PasswordChangeSerializer, LogoutSerializer
 
 User = get_user_model()
 
 
+def prefix_match(field, prefix, vendor):
+    """``field`` (already lowercased) starts with ``prefix``, in an index-friendly form"""
+    if vendor == 'postgresql':
+        # LIKE 'prefix%' is served by the text_pattern_ops indexes
+        return Q(**{f'{field}__startswith': prefix})
+    # SQLite's LIKE is case-insensitive and can't use the expression index; a range can
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': upper})
+
+
 class UserViewSet(viewsets.ModelViewSet):
-    queryset = User.objects.all()
+    queryset = User.objects.order_by('id')
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            return queryset
+        params = self.request.query_params
+        
+        # Filter by role and verification (users_role_verified_idx)
+        role = params.get('role', None)
+        if role:
+            queryset = queryset.filter(role=role)
+        
+        verified = params.get('is_verified', None)
+        if verified is not None:
+            queryset = queryset.filter(is_verified=verified.lower() == 'true')
+        
+        location = params.get('location', None)
+        if location:
+            queryset = queryset.filter(location__icontains=location)
+        
+        # Prefix search on email, first or last name
+        q = params.get('q', '').strip().lower()
+        if q:
+            queryset = queryset.alias(
+                email_lower=Lower('email'), first_name_lower=Lower('first_name'), last_name_lower=Lower('last_name'),
+            )
+            vendor = connections[queryset.db].vendor
+            queryset = queryset.filter(
+                prefix_match('email_lower', q, vendor)
+                | prefix_match('first_name_lower', q, vendor)
+                | prefix_match('last_name_lower', q, vendor)
+            )
+        
+        return queryset.only(*UserListSerializer.Meta.fields)
+
     def get_permissions(self):
         if self.action == 'create':
             return [AllowAny()]
@@ -21,9 +75,76 @@ class UserViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action == 'create':
             return UserRegistrationSerializer
+        if self.action == 'change_password':
+            return PasswordChangeSerializer
+        if self.action == 'list':
+            return UserListSerializer
         return UserSerializer
 
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def me(self, request):
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def change_password(self, request):
+        """Change the current user's password and revoke all their existing tokens"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = request.user
+        user.set_password(serializer.validated_data['new_password'])
+        user.save()
+        # Hand back a fresh session since every earlier token is now rejected
+        refresh = RefreshToken.for_user(user)
+        return Response({'refresh': str(refresh), 'access': str(refresh.access_token)})
+
+    @action(detail=False, methods=['post'], url_path='import', permission_classes=[IsAdminUser], parser_classes=[MultiPartParser])
+    def import_users(self, request):
+        """
+        Bulk onboard users from an uploaded CSV/JSONL ``file``; returns a per-row report.
+
+        Large files are queued instead (202 with an import id to poll).
+        """
+        uploaded = request.FILES.get('file')
+        if uploaded is None:
+            return Response({'file': ['This field is required.']}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.data.get('format') or None
+        if fmt not in (None, 'csv', 'jsonl'):
+            return Response({'format': ['Must be csv or jsonl.']}, status=status.HTTP_400_BAD_REQUEST)
+        dry_run = request.data.get('dry_run') in ('1', 'true', 'True')
+        if uploaded.size >= get_import_config()['QUEUE_MIN_BYTES']:
+            import_id = queue_uploaded_file(uploaded, fmt, dry_run=dry_run)
+            return Response({'id': import_id, 'status': 'queued'}, status=status.HTTP_202_ACCEPTED)
+        # Threads, not processes: don't fork a request worker
+        report = import_uploaded_file(uploaded, fmt, executor='thread', dry_run=dry_run)
+        return Response(report, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path=r'import/(?P<import_id>[0-9a-f]{32})', permission_classes=[IsAdminUser])
+    def import_detail(self, request, import_id):
+        """Progress of a queued import, and its report once done"""
+        result = import_status(import_id)
+        if result is None:
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(result)
+
+
+class LogoutView(APIView):
+    """Revoke the access token used for this request and, optionally, a refresh token"""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = LogoutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        raw_refresh = serializer.validated_data.get('refresh')
+        if raw_refresh:
+            try:
+                refresh = RefreshToken(raw_refresh)
+            except TokenError as e:
+                return Response({'refresh': [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+            if str(refresh.get(jwt_settings.USER_ID_CLAIM)) != str(request.user.pk):
+                return Response({'refresh': ['Token belongs to another user.']}, status=status.HTTP_400_BAD_REQUEST)
+            revoke_token(refresh, request.user)
+
+        revoke_token(request.auth, request.user)
+        return Response(status=status.HTTP_205_RESET_CONTENT)
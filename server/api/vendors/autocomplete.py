@@ -0,0 +1,128 @@
+"""
+In-memory prefix index for marketplace typeahead.
+
+Each worker keeps a sorted array of normalized search keys (one per word
+position, so "wood" matches "Adeyemi Woodworks") over business names,
+cities, states and service category names. Lookups are a binary search
+plus a short forward scan.
+
+The index has its own version, ``INDEX_VERSION``. Signals bump it only when
+an indexed field changes (see ``INDEXED_FIELDS``), so rating refreshes and
+other profile edits don't make every worker rebuild it. Ranking weights
+(ratings, artisan counts) are refreshed by a lazy rebuild after
+``MAX_AGE`` seconds.
+"""
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from django.db.models import Count, Q
+
+from .cache import get_versions
+from .models import ArtisanProfile, ServiceCategory
+
+# Upper bound on keys inspected per lookup, keeps short prefixes cheap
+MAX_SCAN = 500
+# Seconds before ranking weights are refreshed without an index change
+MAX_AGE = 300
+INDEX_VERSION = 'vendors.autocomplete'
+# ArtisanProfile fields that decide which entries the index holds
+INDEXED_FIELDS = ('business_name', 'city', 'state', 'is_available', 'is_featured')
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.casefold().split())
+
+
+class PrefixIndex:
+    """Sorted-array prefix index over ``(kind, value, object_id, weight)`` entries"""
+
+    def __init__(self, entries):
+        self.entries = []
+        pairs = []
+        seen = set()
+        for kind, value, object_id, weight in entries:
+            normalized = normalize(value)
+            if not normalized or (kind, normalized, object_id) in seen:
+                continue
+            seen.add((kind, normalized, object_id))
+            entry_id = len(self.entries)
+            self.entries.append((kind, value.strip(), object_id, weight, normalized))
+            words = normalized.split(' ')
+            for position in range(len(words)):
+                pairs.append((' '.join(words[position:]), entry_id))
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.entry_ids = array('I', (entry_id for _, entry_id in pairs))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, query, limit=10):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        matches = {}
+        position = bisect_left(self.keys, prefix)
+        end = min(len(self.keys), position + MAX_SCAN)
+        while position < end and self.keys[position].startswith(prefix):
+            entry_id = self.entry_ids[position]
+            entry = self.entries[entry_id]
+            # Prefer matches at the start of the value over mid-value words
+            rank = (entry[4].startswith(prefix), entry[3])
+            if entry_id not in matches or rank > matches[entry_id][0]:
+                matches[entry_id] = (rank, entry)
+            position += 1
+        ranked = sorted(matches.values(), key=lambda match: match[0], reverse=True)
+        return [
+            {'type': kind, 'value': value, 'id': object_id}
+            for _, (kind, value, object_id, _, _) in ranked[:limit]
+        ]
+
+
+def load_entries():
+    """Rows for the index: two queries over available artisans and services"""
+    artisans = ArtisanProfile.objects.filter(is_available=True).order_by().values_list(
+        'id', 'business_name', 'city', 'state', 'average_rating', 'is_featured'
+    )
+    # Spellings of each normalized city and state, e.g. "Lagos" and "lagos "
+    places = {'city': {}, 'state': {}}
+    for artisan_id, business_name, city, state, rating, featured in artisans:
+        yield 'business_name', business_name, artisan_id, float(rating or 0) + (5 if featured else 0)
+        for kind, value in (('city', city), ('state', state)):
+            if normalize(value):
+                places[kind].setdefault(normalize(value), Counter())[value.strip()] += 1
+    for kind, spellings in places.items():
+        for counts in spellings.values():
+            # Show the most common spelling, counting every artisan
+            yield kind, counts.most_common(1)[0][0], None, sum(counts.values())
+    services = ServiceCategory.objects.annotate(
+        available_artisans=Count('artisans', filter=Q(artisans__is_available=True))
+    ).values_list('id', 'name', 'available_artisans')
+    for service_id, name, count in services:
+        yield 'service', name, service_id, count
+
+
+_lock = threading.Lock()
+_index = None
+_stamp = None
+_built = 0.0
+
+
+def get_index():
+    """This worker's index, rebuilt if indexed values changed or it is older than ``MAX_AGE``"""
+    global _index, _stamp, _built
+    stamp = get_versions((INDEX_VERSION,))[0]
+    if _index is not None and stamp == _stamp and time.monotonic() - _built < MAX_AGE:
+        return _index
+    with _lock:
+        if _index is None or stamp != _stamp or time.monotonic() - _built >= MAX_AGE:
+            _index = PrefixIndex(load_entries())
+            _stamp = stamp
+            _built = time.monotonic()
+    return _index
@@ -0,0 +1,182 @@
+"""
+Versioned response cache for anonymous marketplace reads.
+
+Every cached response key embeds the current version of each model the
+response depends on. Writes bump the model's version counter (a single
+``incr``), which makes all older keys unreachable without scanning or
+deleting them; stale entries simply age out through the cache timeout.
+"""
+import hashlib
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from api.db.routers import use_primary
+from api.streaming import wants_stream
+
+VERSION_KEY = 'marketplace:version:{}'
+RESPONSE_KEY = 'marketplace:response:{}:{}:{}:{}'
+
+
+def get_cache():
+    return caches[getattr(settings, 'MARKETPLACE_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    return getattr(settings, 'MARKETPLACE_CACHE_TIMEOUT', 300)
+
+
+def model_label(model):
+    """Version name of a model; plain strings name versions of derived data"""
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def bump_version(model):
+    """Invalidate every cached response that depends on ``model``"""
+    cache = get_cache()
+    key = VERSION_KEY.format(model_label(model))
+    try:
+        return cache.incr(key)
+    except ValueError:
+        seed_version(cache, key)
+        return cache.incr(key)
+
+
+def seed_version(cache, key):
+    """
+    Start a missing (never set or evicted) counter from the clock. Restarting
+    from a small number would repeat versions handed out before the loss, and
+    responses cached under them would match again.
+    """
+    cache.add(key, time.time_ns(), timeout=None)
+    return cache.get(key)
+
+
+def get_versions(models):
+    """Current version of each model, fetched in a single cache round trip"""
+    cache = get_cache()
+    keys = [VERSION_KEY.format(model_label(model)) for model in models]
+    values = cache.get_many(keys)
+    return [values[key] if key in values else seed_version(cache, key) for key in keys]
+
+
+def normalize_query(request):
+    """Stable representation of the query string: sorted, empty values dropped"""
+    items = []
+    for key in sorted(request.query_params):
+        values = sorted(v for v in request.query_params.getlist(key) if v != '')
+        if values:
+            items.append((key, values))
+    return repr(items)
+
+
+def request_fingerprint(request, extra=''):
+    """Hash of everything besides model versions that shapes a response"""
+    raw = '|'.join([request.get_host(), request.path, normalize_query(request), extra])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class CacheStats:
+    """Per-process hit/miss counters for the marketplace response cache"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, name, outcome):
+        with self._lock:
+            counts = self._counts.setdefault(name, {'hits': 0, 'misses': 0, 'bypass': 0})
+            counts[outcome] += 1
+
+    def snapshot(self):
+        with self._lock:
+            result = {name: dict(counts) for name, counts in self._counts.items()}
+        for counts in result.values():
+            lookups = counts['hits'] + counts['misses']
+            counts['hit_ratio'] = round(counts['hits'] / lookups, 4) if lookups else 0.0
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+stats = CacheStats()
+
+
+class VersionedCacheMixin:
+    """
+    Cache ``list`` and ``retrieve`` responses for anonymous users.
+
+    ``cache_models`` lists every model whose rows appear in the response;
+    a write to any of them invalidates the cached entry.
+    """
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def is_cacheable(self, request):
+        # Streamed lists (?stream=1) are never cached
+        return request.method == 'GET' and not request.user.is_authenticated and not wants_stream(request)
+
+    def get_response_cache_key(self, request, **kwargs):
+        versions = '.'.join(str(v) for v in get_versions(self.cache_models))
+        extra = repr(sorted(kwargs.items()))
+        return RESPONSE_KEY.format(self.basename, self.action, versions, request_fingerprint(request, extra))
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        name = f'{self.basename}-{self.action}'
+        if not self.is_cacheable(request):
+            stats.record(name, 'bypass')
+            return handler(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = self.get_response_cache_key(request, **kwargs)
+        data = cache.get(key)
+        if data is not None:
+            stats.record(name, 'hits')
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        stats.record(name, 'misses')
+        # Fill from the primary: a lagging replica would pin stale data
+        # under the current version until the next write
+        with use_primary():
+            response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, get_timeout())
+        response['X-Cache'] = 'MISS'
+        return response
+
+    async def acached_response(self, handler, request, **kwargs):
+        """``cached_response`` for async views; ``handler`` is a coroutine function"""
+        name = f'{self.basename}-{self.action}'
+        if not self.is_cacheable(request):
+            stats.record(name, 'bypass')
+            return await handler()
+
+        cache = get_cache()
+        key = await sync_to_async(self.get_response_cache_key)(request, **kwargs)
+        data = await cache.aget(key)
+        if data is not None:
+            stats.record(name, 'hits')
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        stats.record(name, 'misses')
+        with use_primary():
+            response = await handler()
+        if response.status_code == 200:
+            await cache.aset(key, response.data, get_timeout())
+        response['X-Cache'] = 'MISS'
+        return response
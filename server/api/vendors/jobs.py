@@ -0,0 +1,15 @@
+from api.jobs.queue import job
+
+from .models import ArtisanProfile
+from .stats import refresh_artisan_stats
+
+
+@job(queue='stats')
+def refresh_artisan(artisan_id):
+    """Recompute one artisan's rating, review and project counts"""
+    refresh_artisan_stats(ArtisanProfile.objects.filter(pk=artisan_id))
+
+
+def schedule_stats_refresh(artisan_id):
+    # One queued refresh per artisan covers any number of review or booking writes
+    refresh_artisan.enqueue(artisan_id, dedupe_key=f'artisan-stats:{artisan_id}')
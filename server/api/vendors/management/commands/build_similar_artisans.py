@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from api.vendors.models import ArtisanProfile, SimilarArtisan, ServiceCategory
+
+
+class Command(BaseCommand):
+    help = 'Precompute top-K similar artisans from service overlap, location and rating'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=10, help='Recommendations stored per artisan')
+        parser.add_argument('--metric', choices=['jaccard', 'cosine'], default='jaccard')
+        parser.add_argument('--block-size', type=int, default=None, help='Artisan rows scored per matrix product')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        try:
+            import numpy as np
+            from api.vendors import similarity
+        except ImportError:
+            raise CommandError('NumPy is required: pip install numpy')
+
+        started = time.perf_counter()
+        profiles = list(
+            ArtisanProfile.objects.order_by('id')
+            .values_list('id', 'city', 'state', 'average_rating', 'is_available')
+        )
+        if not profiles:
+            self.stdout.write('No artisan profiles found.')
+            return
+
+        ids = np.array([p[0] for p in profiles], dtype=np.int64)
+        row_of = {artisan_id: row for row, artisan_id in enumerate(ids.tolist())}
+        col_of = {service_id: col for col, service_id in enumerate(
+            ServiceCategory.objects.order_by('id').values_list('id', flat=True)
+        )}
+
+        rows, cols = [], []
+        through = ArtisanProfile.services.through.objects.values_list('artisanprofile_id', 'servicecategory_id')
+        for artisan_id, service_id in through.iterator(chunk_size=10000):
+            rows.append(row_of[artisan_id])
+            cols.append(col_of[service_id])
+
+        matrix = similarity.build_matrix(rows, cols, len(ids), len(col_of))
+        cities = similarity.encode_labels([p[1] for p in profiles])
+        states = similarity.encode_labels([p[2] for p in profiles])
+        ratings = [float(p[3] or 0) for p in profiles]
+        available = [p[4] for p in profiles]
+        loaded = time.perf_counter()
+
+        results = []
+        for row, matches in similarity.top_k_similar(
+            matrix, cities, states, ratings, available,
+            top_k=options['top_k'], metric=options['metric'], block_size=options['block_size'],
+        ):
+            artisan_id = int(ids[row])
+            for rank, (candidate, score) in enumerate(matches, start=1):
+                results.append((artisan_id, int(ids[candidate]), rank, round(score, 6)))
+        computed = time.perf_counter()
+
+        batch_size = options['batch_size']
+        with transaction.atomic():
+            SimilarArtisan.objects.all().delete()
+            for start in range(0, len(results), batch_size):
+                SimilarArtisan.objects.bulk_create([
+                    SimilarArtisan(artisan_id=artisan_id, similar_id=similar_id, rank=rank, score=score)
+                    for artisan_id, similar_id, rank, score in results[start:start + batch_size]
+                ])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Stored {len(results)} recommendations for {len(ids)} artisans '
+            f'(load {loaded - started:.2f}s, score {computed - loaded:.2f}s, '
+            f'write {time.perf_counter() - computed:.2f}s)'
+        ))
@@ -0,0 +1,70 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.db.models import Max, Min
+from api.vendors.models import ArtisanProfile
+from api.vendors.stats import STAT_FIELDS, drifted_rows, measure_drift, refresh_artisan_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute average_rating, total_reviews and total_projects for all artisans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without updating')
+        parser.add_argument('--chunk-size', type=int, default=0,
+                            help='Update artisans in id ranges of this size (default: one UPDATE)')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Run chunks in parallel threads; SQLite serializes writers anyway')
+        parser.add_argument('--sample', type=int, default=10, help='Drifted rows to print with -v 2')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        drift = measure_drift()
+        self.stdout.write(
+            f"{drift['drifted']} of {drift['artisans']} artisans out of date "
+            f"(rating {drift['average_rating']}, reviews {drift['total_reviews']}, "
+            f"projects {drift['total_projects']})"
+        )
+        if options['verbosity'] > 1 and drift['drifted']:
+            for row in drifted_rows(limit=options['sample']):
+                changes = ', '.join(
+                    f"{field} {row[field]} -> {row[f'computed_{field}']}" for field in STAT_FIELDS
+                    if row[field] != row[f'computed_{field}']
+                )
+                self.stdout.write(f"  #{row['pk']} {row['business_name']}: {changes}")
+
+        if options['dry_run'] or not drift['drifted']:
+            return
+
+        updated = self.reconcile(options['chunk_size'], options['workers'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled {updated} artisans in {time.perf_counter() - started:.2f}s'
+        ))
+
+    def reconcile(self, chunk_size, workers):
+        if chunk_size <= 0:
+            with transaction.atomic():
+                return refresh_artisan_stats()
+
+        bounds = ArtisanProfile.objects.aggregate(low=Min('pk'), high=Max('pk'))
+        if bounds['low'] is None:
+            return 0
+        ranges = [
+            (start, start + chunk_size - 1)
+            for start in range(bounds['low'], bounds['high'] + 1, chunk_size)
+        ]
+        if workers <= 1:
+            return sum(self.reconcile_range(*bounds) for bounds in ranges)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return sum(pool.map(lambda bounds: self.reconcile_range(*bounds, close=True), ranges))
+
+    def reconcile_range(self, low, high, close=False):
+        try:
+            with transaction.atomic():
+                return refresh_artisan_stats(ArtisanProfile.objects.filter(pk__range=(low, high)))
+        finally:
+            if close:
+                # Worker threads own their connections
+                connections.close_all()
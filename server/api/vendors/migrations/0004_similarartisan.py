@@ -0,0 +1,31 @@
+# Generated by Django 5.0.1 on 2026-10-19 16:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0003_alter_portfolioitem_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarArtisan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('artisan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_artisans', to='vendors.artisanprofile')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='vendors.artisanprofile')),
+            ],
+            options={
+                'ordering': ['artisan', 'rank'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='similarartisan',
+            constraint=models.UniqueConstraint(fields=('artisan', 'rank'), name='vendors_similar_artisan_rank_uniq'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-19 16:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        ('vendors', '0004_similarartisan'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['artisan', 'rating', 'project'], name='vendors_review_stats_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.1 on 2026-10-19 16:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        ('vendors', '0005_review_stats_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtisanBooking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('booked', 'Booked'), ('blocked', 'Blocked')], default='booked', max_length=10)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('note', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('artisan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='vendors.artisanprofile')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='artisan_bookings', to='projects.project')),
+            ],
+            options={
+                'ordering': ['start_date'],
+                'indexes': [models.Index(fields=['artisan', 'end_date', 'start_date'], name='vendors_booking_overlap_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='artisanbooking',
+            constraint=models.CheckConstraint(check=models.Q(('end_date__gte', models.F('start_date'))), name='vendors_booking_valid_range'),
+        ),
+    ]
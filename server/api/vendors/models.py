@@ -1,6 +1,5 @@
 from django.db import models
 from django.conf import settings
-from cloudinary.models import CloudinaryField
 
 
 class ServiceCategory(models.Model):
@@ -108,6 +107,60 @@ class Review(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = ['artisan', 'reviewer', 'project']  # One review per project
+        indexes = [
+            # Covers the per-artisan rating aggregates in api/vendors/stats.py
+            models.Index(fields=['artisan', 'rating', 'project'], name='vendors_review_stats_idx'),
+        ]
     
     def __str__(self):
         return f"Review for {self.artisan.business_name} by {self.reviewer.get_full_name() or self.reviewer.username}"
+
+
+class ArtisanBooking(models.Model):
+    """Date range (inclusive) during which an artisan is booked or unavailable"""
+    
+    KIND_CHOICES = [
+        ('booked', 'Booked'),
+        ('blocked', 'Blocked'),
+    ]
+    
+    artisan = models.ForeignKey(ArtisanProfile, on_delete=models.CASCADE, related_name='bookings')
+    project = models.ForeignKey('projects.Project', on_delete=models.SET_NULL, null=True, blank=True, related_name='artisan_bookings')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default='booked')
+    start_date = models.DateField()
+    end_date = models.DateField()
+    note = models.CharField(max_length=200, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['start_date']
+        indexes = [
+            # Overlap probe: seek the artisan, then end_date >= free_from skips past
+            # bookings, and start_date is checked from the index without a table read
+            models.Index(fields=['artisan', 'end_date', 'start_date'], name='vendors_booking_overlap_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(check=models.Q(end_date__gte=models.F('start_date')), name='vendors_booking_valid_range'),
+        ]
+    
+    def __str__(self):
+        return f"{self.artisan.business_name}: {self.kind} {self.start_date} - {self.end_date}"
+
+
+class SimilarArtisan(models.Model):
+    """Precomputed "similar artisans" recommendations (see build_similar_artisans)"""
+    artisan = models.ForeignKey(ArtisanProfile, on_delete=models.CASCADE, related_name='similar_artisans')
+    similar = models.ForeignKey(ArtisanProfile, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    
+    class Meta:
+        ordering = ['artisan', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['artisan', 'rank'], name='vendors_similar_artisan_rank_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.artisan_id} -> {self.similar_id} ({self.score:.3f})"
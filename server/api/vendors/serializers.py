@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import ServiceCategory, ArtisanProfile, PortfolioItem, Review
+from django.db.models import Q
+from api.projects.models import Project
+from .models import ServiceCategory, ArtisanProfile, PortfolioItem, Review, ArtisanBooking, SimilarArtisan
 
 User = get_user_model()
 
@@ -71,3 +73,56 @@ class ArtisanProfileListSerializer(serializers.ModelSerializer):
             'city', 'state', 'is_available', 'average_rating', 'total_reviews',
             'total_projects', 'hourly_rate', 'created_at'
         ]
+
+
+class EngagedProjectField(serializers.PrimaryKeyRelatedField):
+    """
+    Projects the requesting artisan may book against: their own, ones whose
+    owner has reviewed them for it, and ones already on their bookings
+    """
+    def get_queryset(self):
+        user = self.context['request'].user
+        return Project.objects.filter(
+            Q(user=user) | Q(reviews__artisan__user=user) | Q(artisan_bookings__artisan__user=user)
+        ).distinct()
+
+
+class ArtisanBookingSerializer(serializers.ModelSerializer):
+    project = EngagedProjectField(allow_null=True, required=False)
+    
+    class Meta:
+        model = ArtisanBooking
+        fields = ['id', 'artisan', 'project', 'kind', 'start_date', 'end_date', 'note', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'artisan', 'created_at', 'updated_at']
+    
+    def validate(self, attrs):
+        start_date = attrs.get('start_date', getattr(self.instance, 'start_date', None))
+        end_date = attrs.get('end_date', getattr(self.instance, 'end_date', None))
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError({'end_date': 'End date cannot be before start date.'})
+        return attrs
+
+
+class ArtisanBusySerializer(serializers.ModelSerializer):
+    """Public view of an artisan's busy ranges, without notes or projects"""
+    class Meta:
+        model = ArtisanBooking
+        fields = ['kind', 'start_date', 'end_date']
+
+
+class SimilarArtisanSerializer(serializers.ModelSerializer):
+    """Flat recommendation entry; reads only the joined artisan row"""
+    id = serializers.IntegerField(source='similar.id', read_only=True)
+    business_name = serializers.CharField(source='similar.business_name', read_only=True)
+    city = serializers.CharField(source='similar.city', read_only=True)
+    state = serializers.CharField(source='similar.state', read_only=True)
+    average_rating = serializers.DecimalField(source='similar.average_rating', max_digits=3, decimal_places=2, read_only=True)
+    total_reviews = serializers.IntegerField(source='similar.total_reviews', read_only=True)
+    hourly_rate = serializers.DecimalField(source='similar.hourly_rate', max_digits=10, decimal_places=2, read_only=True)
+    
+    class Meta:
+        model = SimilarArtisan
+        fields = [
+            'id', 'business_name', 'city', 'state', 'average_rating', 'total_reviews',
+            'hourly_rate', 'rank', 'score'
+        ]
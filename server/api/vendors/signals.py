@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from .autocomplete import INDEX_VERSION, INDEXED_FIELDS
+from .models import ServiceCategory, ArtisanProfile, PortfolioItem, Review, ArtisanBooking
+from .cache import bump_version
+
+User = get_user_model()
+
+
+def bump_on_commit(model, using):
+    # Bumping before commit would let a concurrent cache miss store the
+    # old rows under the new version
+    transaction.on_commit(lambda: bump_version(model), using=using)
+
+
+@receiver(post_save, sender=ServiceCategory)
+@receiver(post_delete, sender=ServiceCategory)
+@receiver(post_save, sender=ArtisanProfile)
+@receiver(post_delete, sender=ArtisanProfile)
+@receiver(post_save, sender=PortfolioItem)
+@receiver(post_delete, sender=PortfolioItem)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=ArtisanBooking)
+@receiver(post_delete, sender=ArtisanBooking)
+def invalidate_marketplace_cache(sender, using, **kwargs):
+    """Bump the model's cache version so dependent cached responses expire"""
+    bump_on_commit(sender, using)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_marketplace_users(sender, using, update_fields=None, created=False, **kwargs):
+    """Artisan and reviewer names and emails are part of cached responses"""
+    # New users appear in no response yet; login timestamps in none at all
+    if created or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    bump_on_commit(User, using)
+
+
+@receiver(m2m_changed, sender=ArtisanProfile.services.through)
+def invalidate_artisan_services(sender, action, using, **kwargs):
+    """Service assignments are part of the artisan listing and the typeahead counts"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_on_commit(ArtisanProfile, using)
+        bump_on_commit(INDEX_VERSION, using)
+
+
+@receiver(pre_save, sender=ArtisanProfile)
+def note_indexed_changes(sender, instance, using, update_fields=None, **kwargs):
+    """Whether the save changes what the typeahead index holds"""
+    if update_fields is not None and not set(update_fields) & set(INDEXED_FIELDS):
+        instance._index_changed = False
+    elif instance.pk is None:
+        instance._index_changed = True
+    else:
+        stored = sender._base_manager.using(using).filter(pk=instance.pk).values_list(*INDEXED_FIELDS).first()
+        instance._index_changed = stored != tuple(getattr(instance, field) for field in INDEXED_FIELDS)
+
+
+@receiver(post_save, sender=ArtisanProfile)
+def invalidate_typeahead_artisan(sender, instance, using, **kwargs):
+    if getattr(instance, '_index_changed', True):
+        bump_on_commit(INDEX_VERSION, using)
+
+
+@receiver(post_delete, sender=ArtisanProfile)
+@receiver(post_save, sender=ServiceCategory)
+@receiver(post_delete, sender=ServiceCategory)
+def invalidate_typeahead(sender, using, **kwargs):
+    bump_on_commit(INDEX_VERSION, using)
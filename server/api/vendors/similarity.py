@@ -0,0 +1,93 @@
+"""
+Vectorized "similar artisans" scoring.
+
+Artisans are rows of a binary artisan x service matrix built from the
+``ArtisanProfile.services`` M2M coordinates. Service overlap (Jaccard or
+cosine) is computed block-wise with one matrix product per block, then
+blended with same-city/same-state bonuses and the candidate's rating.
+"""
+import numpy as np
+
+DEFAULT_WEIGHTS = {
+    'overlap': 0.7,
+    'city': 0.15,
+    'state': 0.05,
+    'rating': 0.1,
+}
+
+# Approximate bytes of float32 scratch space allowed per block
+BLOCK_MEMORY_BUDGET = 256 * 1024 * 1024
+
+
+def encode_labels(values):
+    """Map strings to integer codes; blank values get -1 so they never match"""
+    codes = {}
+    result = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        value = (value or '').strip().lower()
+        result[i] = codes.setdefault(value, len(codes)) if value else -1
+    return result
+
+
+def build_matrix(rows, cols, n_artisans, n_services):
+    """Binary artisan x service matrix from (row, col) index pairs"""
+    matrix = np.zeros((n_artisans, n_services), dtype=np.float32)
+    if len(rows):
+        matrix[np.asarray(rows), np.asarray(cols)] = 1.0
+    return matrix
+
+
+def top_k_similar(matrix, cities, states, ratings, available, top_k=10,
+                  metric='jaccard', weights=None, block_size=None):
+    """
+    Yield ``(row, [(candidate_row, score), ...])`` for every artisan row.
+
+    Only available artisans sharing at least one service are candidates,
+    and an artisan is never similar to itself.
+    """
+    weights = {name: np.float32(value) for name, value in {**DEFAULT_WEIGHTS, **(weights or {})}.items()}
+    n = matrix.shape[0]
+    if n < 2:
+        return
+
+    k = min(top_k, n - 1)
+    degree = matrix.sum(axis=1)
+    rating_bonus = weights['rating'] * (np.asarray(ratings, dtype=np.float32) / np.float32(5))
+    # Unavailable artisans are never recommended
+    rating_bonus[~np.asarray(available, dtype=bool)] = -np.inf
+    if block_size is None:
+        block_size = max(1, min(n, BLOCK_MEMORY_BUDGET // (n * 4 * 6)))
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block = slice(start, stop)
+
+        overlap = matrix[block] @ matrix.T
+        if metric == 'cosine':
+            norm = np.sqrt(np.outer(degree[block], degree))
+        else:
+            norm = degree[block, None] + degree[None, :] - overlap
+        np.divide(overlap, norm, out=norm, where=overlap > 0)
+
+        city = cities[block, None]
+        state = states[block, None]
+        score = weights['overlap'] * norm
+        score += weights['city'] * ((city == cities[None, :]) & (city >= 0))
+        score += weights['state'] * ((state == states[None, :]) & (state >= 0))
+        score += rating_bonus[None, :]
+        score[overlap == 0] = -np.inf
+        score[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+        # Selecting the k smallest of the negated scores is far cheaper than
+        # partitioning around kth=n-k
+        np.negative(score, out=score)
+        candidates = np.argpartition(score, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(score, candidates, axis=1)
+        order = np.argsort(candidate_scores, axis=1, kind='stable')
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_scores = -np.take_along_axis(candidate_scores, order, axis=1)
+
+        for offset in range(stop - start):
+            keep = np.isfinite(candidate_scores[offset])
+            yield start + offset, list(zip(candidates[offset][keep].tolist(),
+                                           candidate_scores[offset][keep].tolist()))
@@ -0,0 +1,90 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one in-flight computation
+instead of each running it. ``do`` coordinates threads (WSGI workers run
+one request per thread) and ``ado`` coordinates coroutines on an event loop
+(ASGI). Results are never retained once the computation finishes; pair this
+with the response cache for reuse across time.
+"""
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Deduplicate concurrent work per key within one worker process"""
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+
+    def do(self, key, fn):
+        """
+        Run ``fn()`` once for all threads concurrently asking for ``key``.
+
+        Returns ``(result, shared)`` where ``shared`` is True for callers that
+        received another thread's result. If the leader takes longer than
+        ``timeout`` seconds, waiting callers give up and compute their own.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if call.done.wait(self.timeout):
+                if call.error is not None:
+                    raise call.error
+                return call.result, True
+            return fn(), False
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    async def ado(self, key, coro_fn):
+        """Coroutine counterpart of ``do``; ``coro_fn()`` must return an awaitable"""
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        future = self._async_calls.get(slot)
+        if future is not None:
+            try:
+                result = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+            except asyncio.TimeoutError:
+                return await coro_fn(), False
+            return result, True
+
+        future = self._async_calls[slot] = loop.create_future()
+        try:
+            result = await coro_fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so an unobserved failure doesn't log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._async_calls[slot]
+        return result, False
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
@@ -0,0 +1,139 @@
+"""
+Set-based maintenance of the denormalized artisan statistics.
+
+``average_rating`` and ``total_reviews`` are derived from ``Review`` rows.
+``total_projects`` counts the distinct projects of the artisan's completed
+bookings: ``booked`` ranges linked to a project that ended before today.
+It grows as bookings end without any write, so run
+``reconcile_artisan_stats`` periodically to keep it current.
+
+Instead of loading rows per artisan, the values are computed as correlated
+grouped aggregates inside a single UPDATE statement, so refreshing one
+artisan or all of them costs one query. On PostgreSQL the UPDATE joins one
+grouped pass over the reviews and one over the bookings instead
+(``UPDATE ... FROM``), which is cheaper for large refreshes than
+evaluating three correlated subqueries per artisan.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, transaction
+from django.db.models import Avg, Count, DecimalField, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, Round
+
+from .cache import bump_version
+from .models import ArtisanBooking, ArtisanProfile, Review
+
+STAT_FIELDS = ('average_rating', 'total_reviews', 'total_projects')
+
+
+def _aggregate(rows, expression):
+    rows = rows.filter(artisan=OuterRef('pk')).order_by().values('artisan')
+    return Subquery(rows.annotate(value=expression).values('value')[:1])
+
+
+def completed_bookings():
+    return ArtisanBooking.objects.filter(kind='booked', project__isnull=False, end_date__lt=date.today())
+
+
+def stat_expressions():
+    """Expressions computing each statistic from the artisan's reviews and bookings"""
+    rating_field = DecimalField(max_digits=3, decimal_places=2)
+    reviews = Review.objects.all()
+    return {
+        'average_rating': Coalesce(
+            Cast(Round(_aggregate(reviews, Avg('rating')), 2), rating_field),
+            Value(Decimal('0.00')),
+            output_field=rating_field,
+        ),
+        'total_reviews': Coalesce(_aggregate(reviews, Count('id')), 0, output_field=IntegerField()),
+        'total_projects': Coalesce(
+            _aggregate(completed_bookings(), Count('project', distinct=True)), 0, output_field=IntegerField(),
+        ),
+    }
+
+
+def _computed():
+    return {f'computed_{field}': expression for field, expression in stat_expressions().items()}
+
+
+def _mismatches():
+    return {field: ~Q(**{field: F(f'computed_{field}')}) for field in STAT_FIELDS}
+
+
+def measure_drift(queryset=None):
+    """Count out-of-date rows per statistic with one aggregate query"""
+    queryset = ArtisanProfile.objects.all() if queryset is None else queryset
+    mismatches = _mismatches()
+    return queryset.order_by().annotate(**_computed()).aggregate(
+        artisans=Count('pk'),
+        drifted=Count('pk', filter=Q(*mismatches.values(), _connector=Q.OR)),
+        **{field: Count('pk', filter=condition) for field, condition in mismatches.items()},
+    )
+
+
+def drifted_rows(queryset=None, limit=20):
+    """Sample of out-of-date rows with stored and recomputed values"""
+    queryset = ArtisanProfile.objects.all() if queryset is None else queryset
+    computed = _computed()
+    return list(
+        queryset.annotate(**computed)
+        .filter(Q(*_mismatches().values(), _connector=Q.OR))
+        .order_by('pk')
+        .values('pk', 'business_name', *STAT_FIELDS, *computed)[:limit]
+    )
+
+
+def _refresh_postgresql(queryset, connection):
+    qn = connection.ops.quote_name
+    profiles = qn(ArtisanProfile._meta.db_table)
+    reviews = qn(Review._meta.db_table)
+    bookings = qn(ArtisanBooking._meta.db_table)
+    try:
+        ids_sql, ids_params = queryset.order_by().values('pk').query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {profiles} AS a SET
+                average_rating = s.average_rating,
+                total_reviews = s.total_reviews,
+                total_projects = s.total_projects
+            FROM (
+                SELECT p.id,
+                       COALESCE(ROUND(AVG(r.rating)::numeric, 2), 0) AS average_rating,
+                       COUNT(r.id) AS total_reviews,
+                       COALESCE(MAX(b.total_projects), 0) AS total_projects
+                FROM {profiles} p
+                LEFT JOIN {reviews} r ON r.artisan_id = p.id
+                LEFT JOIN (
+                    SELECT artisan_id, COUNT(DISTINCT project_id) AS total_projects
+                    FROM {bookings}
+                    WHERE kind = 'booked' AND project_id IS NOT NULL AND end_date < %s
+                    GROUP BY artisan_id
+                ) b ON b.artisan_id = p.id
+                WHERE p.id IN ({ids_sql})
+                GROUP BY p.id
+            ) s
+            WHERE a.id = s.id
+            """,
+            [date.today(), *ids_params],
+        )
+        return cursor.rowcount
+
+
+def refresh_artisan_stats(queryset=None):
+    """Recompute statistics for ``queryset`` (default: all artisans) in one UPDATE"""
+    queryset = ArtisanProfile.objects.all() if queryset is None else queryset
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        updated = _refresh_postgresql(queryset, connection)
+    else:
+        updated = queryset.order_by().update(**stat_expressions())
+    if updated:
+        # QuerySet.update() sends no post_save, so invalidate cached listings
+        # here, once the new values are visible to other connections
+        transaction.on_commit(lambda: bump_version(ArtisanProfile), using=queryset.db)
+    return updated
@@ -0,0 +1,169 @@
+from datetime import date
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.tests import LOCMEM_CACHES, make_artisan, make_user
+from . import autocomplete
+from .cache import get_cache
+from .models import ArtisanBooking, Review
+from .stats import refresh_artisan_stats
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class MarketplaceCacheTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        self.artisan = make_artisan('artisan@example.com')
+
+    def get(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_anonymous_reads_are_cached(self):
+        path = f'/api/artisans/{self.artisan.pk}/'
+        self.assertEqual(self.get(path)['X-Cache'], 'MISS')
+        self.assertEqual(self.get(path)['X-Cache'], 'HIT')
+        self.client.force_authenticate(self.artisan.user)
+        self.assertNotIn('X-Cache', self.get(path))
+
+    def test_user_edits_invalidate_cached_names(self):
+        path = f'/api/artisans/{self.artisan.pk}/'
+        self.get(path)
+        user = self.artisan.user
+        with self.captureOnCommitCallbacks(execute=True):
+            user.first_name = 'Renamed'
+            user.save()
+        response = self.get(path)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['user_name'], 'Renamed User')
+
+    def test_login_timestamps_keep_the_cache(self):
+        path = f'/api/artisans/{self.artisan.pk}/'
+        self.get(path)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.artisan.user.save(update_fields=['last_login'])
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.get(path)['X-Cache'], 'HIT')
+
+    def test_nested_relations_are_loaded_with_the_rows(self):
+        for i in range(3):
+            artisan = make_artisan(f'more-{i}@example.com')
+            Review.objects.create(artisan=artisan, reviewer=make_user(f'r{i}@example.com'), rating=4, comment='-')
+        # Count and page; services
+        with self.assertNumQueries(3):
+            self.get('/api/artisans/')
+        # Profile with its user; services, portfolio, reviews with reviewers
+        with self.assertNumQueries(4):
+            self.get(f'/api/artisans/{artisan.pk}/')
+        with self.assertNumQueries(2):
+            self.get('/api/reviews/')
+
+    def test_versions_bump_only_after_commit(self):
+        path = f'/api/reviews/?artisan={self.artisan.pk}'
+        self.get(path)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Review.objects.create(artisan=self.artisan, reviewer=make_user('r@example.com'), rating=5, comment='-')
+            # Not committed yet: a miss here would cache the old rows under a new version
+            self.assertEqual(self.get(path)['X-Cache'], 'HIT')
+        for callback in callbacks:
+            callback()
+        response = self.get(path)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        autocomplete._index = None
+        self.woodworks = make_artisan('wood@example.com', business_name='Adeyemi Woodworks', city='Lagos')
+        make_artisan('tiles@example.com', business_name='Tile Masters', city=' lagos ')
+        make_artisan('ikeja@example.com', business_name='Ikeja Paints', city='Ikeja')
+
+    def search(self, query):
+        return autocomplete.get_index().search(query)
+
+    def test_prefixes_match_any_word(self):
+        self.assertEqual(self.search('WOOD'), [{'type': 'business_name', 'value': 'Adeyemi Woodworks', 'id': self.woodworks.pk}])
+        self.assertEqual([match['value'] for match in self.search('ade')], ['Adeyemi Woodworks'])
+        self.assertEqual(self.search(' '), [])
+
+    def test_cities_are_deduplicated_ignoring_case(self):
+        cities = [match for match in self.search('lag') if match['type'] == 'city']
+        self.assertEqual(len(cities), 1)
+        self.assertEqual(cities[0]['value'].casefold(), 'lagos')
+
+    def test_stats_refreshes_keep_the_index(self):
+        index = autocomplete.get_index()
+        Review.objects.create(artisan=self.woodworks, reviewer=make_user('r@example.com'), rating=5, comment='-')
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh_artisan_stats()
+            self.woodworks.description = 'Now with stairs'
+            self.woodworks.save()
+        self.assertIs(autocomplete.get_index(), index)
+
+    def test_renames_rebuild_the_index(self):
+        index = autocomplete.get_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.woodworks.business_name = 'Zed Carpentry'
+            self.woodworks.save()
+        self.assertIsNot(autocomplete.get_index(), index)
+        self.assertEqual(self.search('wood'), [])
+        self.assertEqual(self.search('zed')[0]['id'], self.woodworks.pk)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AvailabilityTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        self.booked = make_artisan('booked@example.com')
+        self.free = make_artisan('free@example.com')
+        # Inclusive on both ends: busy on the 10th, 11th and 12th
+        ArtisanBooking.objects.create(artisan=self.booked, start_date=date(2030, 1, 10), end_date=date(2030, 1, 12))
+        ArtisanBooking.objects.create(
+            artisan=self.booked, kind='blocked', start_date=date(2030, 2, 1), end_date=date(2030, 2, 3),
+        )
+
+    def free_artisans(self, **params):
+        response = self.client.get('/api/artisans/', params)
+        self.assertEqual(response.status_code, 200)
+        return {artisan['id'] for artisan in response.data['results']}
+
+    def test_overlapping_bookings_exclude_the_artisan(self):
+        both, free = {self.booked.pk, self.free.pk}, {self.free.pk}
+        cases = [
+            ('2030-01-11', '2030-01-11', free),  # inside
+            ('2030-01-05', '2030-01-20', free),  # covering
+            ('2030-01-12', '2030-01-14', free),  # shares the last day
+            ('2030-01-08', '2030-01-10', free),  # shares the first day
+            ('2030-01-13', '2030-01-15', both),  # starts the day after
+            ('2030-01-01', '2030-01-09', both),  # ends the day before
+            ('2030-02-02', '', free),  # single day, blocked
+        ]
+        for free_from, free_to, expected in cases:
+            with self.subTest(free_from=free_from, free_to=free_to):
+                self.assertEqual(self.free_artisans(free_from=free_from, free_to=free_to), expected)
+
+    def test_invalid_ranges_are_rejected(self):
+        for params in ({'free_from': '2024-02-30'}, {'free_from': 'soon'},
+                       {'free_from': '2030-01-15', 'free_to': '2030-01-14'}):
+            with self.subTest(**params):
+                self.assertEqual(self.client.get('/api/artisans/', params).status_code, 400)
+
+    def test_availability_lists_busy_ranges_in_the_window(self):
+        path = f'/api/artisans/{self.booked.pk}/availability/'
+        response = self.client.get(path, {'from': '2030-01-12', 'to': '2030-02-01'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(busy['kind'], busy['start_date']) for busy in response.data],
+            [('booked', '2030-01-10'), ('blocked', '2030-02-01')],
+        )
+        self.assertEqual(self.client.get(path, {'from': '2030-01-13', 'to': '2030-01-31'}).data, [])
+        self.assertEqual(self.client.get(path, {'from': '2024-02-30'}).status_code, 400)
+        self.assertEqual(self.client.get(path, {'from': '2030-02-01', 'to': '2030-01-01'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/artisans/999999/availability/').status_code, 404)
@@ -1,31 +1,83 @@
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, status, filters, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny, IsAuthenticatedOrReadOnly
-from django.db.models import Q, Avg
-from .models import ServiceCategory, ArtisanProfile, PortfolioItem, Review
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAuthenticatedOrReadOnly, IsAdminUser
+from rest_framework.views import APIView
+from django.contrib.auth import get_user_model
+from django.db.models import Q, Avg, Exists, OuterRef, Prefetch
+from django.utils.dateparse import parse_date
+from api.streaming import StreamingListMixin, wants_stream
+from .autocomplete import get_index as get_autocomplete_index
+from .cache import VersionedCacheMixin, request_fingerprint, stats as cache_stats
+from .models import ServiceCategory, ArtisanProfile, PortfolioItem, Review, ArtisanBooking, SimilarArtisan
+from .jobs import schedule_stats_refresh
+from .singleflight import SingleFlight
 from .serializers import (
     ServiceCategorySerializer,
     ArtisanProfileSerializer, ArtisanProfileListSerializer,
-    PortfolioItemSerializer, ReviewSerializer
+    PortfolioItemSerializer, ReviewSerializer, SimilarArtisanSerializer,
+    ArtisanBookingSerializer, ArtisanBusySerializer
 )
 
+User = get_user_model()
 
-class ServiceCategoryViewSet(viewsets.ModelViewSet):
+
+def query_date(params, name):
+    """Optional ``YYYY-MM-DD`` query parameter; 400 if given but not a valid date"""
+    value = params.get(name) or ''
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        # Well-formed but impossible, e.g. 2024-02-30
+        parsed = None
+    if value and parsed is None:
+        raise serializers.ValidationError({name: 'Enter a valid date (YYYY-MM-DD).'})
+    return parsed
+
+
+def query_date_range(params, start, end):
+    """``(start, end)`` dates of the query, or None for each one that's missing"""
+    date_from, date_to = query_date(params, start), query_date(params, end)
+    if date_from and date_to and date_to < date_from:
+        raise serializers.ValidationError({end: f'Must not be before {start}.'})
+    return date_from, date_to
+
+
+class ServiceCategoryViewSet(VersionedCacheMixin, viewsets.ModelViewSet):
     """Service categories for artisan marketplace"""
+    cache_models = (ServiceCategory,)
     queryset = ServiceCategory.objects.all()
     serializer_class = ServiceCategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]  # Anyone can view, only authenticated can modify
 
 
-class ArtisanProfileViewSet(viewsets.ModelViewSet):
+class ArtisanProfileViewSet(StreamingListMixin, VersionedCacheMixin, viewsets.ModelViewSet):
     """Artisan profiles for marketplace - public viewing, authenticated editing"""
+    cache_models = (ArtisanProfile, ServiceCategory, PortfolioItem, Review, ArtisanBooking, User)
     queryset = ArtisanProfile.objects.filter(is_available=True)
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['business_name', 'description', 'city', 'state', 'services__name']
     ordering_fields = ['average_rating', 'total_reviews', 'total_projects', 'created_at', 'hourly_rate']
     ordering = ['-is_featured', '-average_rating']
+    # Relations each serializer reads, loaded with the rows
+    list_prefetch_related = ['services']
+    detail_prefetch_related = ['services', 'portfolio', Prefetch('reviews', queryset=Review.objects.select_related('reviewer'))]
+    
+    # Coalesces concurrent identical searches within this worker
+    list_flight = SingleFlight(timeout=10)
+    
+    def list(self, request, *args, **kwargs):
+        if wants_stream(request):
+            # Streams can't be shared between callers
+            return super().list(request, *args, **kwargs)
+        key = request_fingerprint(request, str(request.user.is_authenticated))
+        response, shared = self.list_flight.do(key, lambda: super(ArtisanProfileViewSet, self).list(request, *args, **kwargs))
+        if shared:
+            # Each caller needs its own response object to render
+            response = Response(response.data, status=response.status_code)
+            response['X-Coalesced'] = '1'
+        return response
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -34,6 +86,10 @@ class ArtisanProfileViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.select_related('user').prefetch_related(*self.list_prefetch_related)
+        elif self.action in ('retrieve', 'update', 'partial_update'):
+            queryset = queryset.select_related('user').prefetch_related(*self.detail_prefetch_related)
         
         # Filter by service category
         service = self.request.query_params.get('service', None)
@@ -72,6 +128,16 @@ class ArtisanProfileViewSet(viewsets.ModelViewSet):
             except ValueError:
                 pass
         
+        # Filter by availability for a date range (inclusive): anti-join on
+        # bookings that overlap [free_from, free_to]
+        free_from, free_to = query_date_range(self.request.query_params, 'free_from', 'free_to')
+        free_to = free_to or free_from
+        if free_from:
+            overlapping = ArtisanBooking.objects.filter(
+                artisan=OuterRef('pk'), end_date__gte=free_from, start_date__lte=free_to
+            )
+            queryset = queryset.filter(~Exists(overlapping))
+        
         return queryset.distinct()
     
     def perform_create(self, serializer):
@@ -82,7 +148,10 @@ class ArtisanProfileViewSet(viewsets.ModelViewSet):
     def my_profile(self, request):
         """Get the artisan profile for the current user"""
         try:
-            profile = ArtisanProfile.objects.get(user=request.user)
+            profile = (
+                ArtisanProfile.objects.select_related('user').prefetch_related(*self.detail_prefetch_related)
+                .get(user=request.user)
+            )
             serializer = self.get_serializer(profile)
             return Response(serializer.data)
         except ArtisanProfile.DoesNotExist:
@@ -91,11 +160,49 @@ class ArtisanProfileViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
     
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Typeahead suggestions for business names, cities, states and services"""
+        query = request.query_params.get('q', '')
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 25)
+        except ValueError:
+            limit = 10
+        results = get_autocomplete_index().search(query, limit=limit)
+        return Response({'query': query, 'results': results})
+    
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """Get precomputed similar artisans (built by build_similar_artisans)"""
+        artisan = self.get_object()
+        recommendations = (
+            SimilarArtisan.objects.filter(artisan=artisan, similar__is_available=True)
+            .select_related('similar')
+            .order_by('rank')
+        )
+        serializer = SimilarArtisanSerializer(recommendations, many=True)
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def availability(self, request, pk=None):
+        """Get booked/blocked ranges for an artisan, optionally within ?from=&to="""
+        artisan = self.get_object()
+        bookings = ArtisanBooking.objects.filter(artisan=artisan)
+        date_from, date_to = query_date_range(request.query_params, 'from', 'to')
+        if date_from:
+            bookings = bookings.filter(end_date__gte=date_from)
+        if date_to:
+            bookings = bookings.filter(start_date__lte=date_to)
+        serializer = ArtisanBusySerializer(bookings, many=True)
+        return Response(serializer.data)
+    
     @action(detail=True, methods=['get'])
     def portfolio(self, request, pk=None):
         """Get portfolio items for an artisan"""
         artisan = self.get_object()
         portfolio_items = artisan.portfolio.all()
+        if wants_stream(request):
+            return self.stream(portfolio_items, PortfolioItemSerializer)
         serializer = PortfolioItemSerializer(portfolio_items, many=True)
         return Response(serializer.data)
     
@@ -103,13 +210,16 @@ class ArtisanProfileViewSet(viewsets.ModelViewSet):
     def reviews(self, request, pk=None):
         """Get reviews for an artisan"""
         artisan = self.get_object()
-        reviews = artisan.reviews.all()
+        reviews = artisan.reviews.select_related('reviewer')
+        if wants_stream(request):
+            return self.stream(reviews, ReviewSerializer)
         serializer = ReviewSerializer(reviews, many=True)
         return Response(serializer.data)
 
 
-class PortfolioItemViewSet(viewsets.ModelViewSet):
+class PortfolioItemViewSet(StreamingListMixin, VersionedCacheMixin, viewsets.ModelViewSet):
     """Portfolio items for artisans"""
+    cache_models = (PortfolioItem,)
     queryset = PortfolioItem.objects.all()
     serializer_class = PortfolioItemSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -139,9 +249,38 @@ class PortfolioItemViewSet(viewsets.ModelViewSet):
             )
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ArtisanBookingViewSet(StreamingListMixin, viewsets.ModelViewSet):
+    """Booked/blocked date ranges managed by the artisan who owns them"""
+    serializer_class = ArtisanBookingSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return ArtisanBooking.objects.filter(artisan__user=self.request.user)
+    
+    def perform_create(self, serializer):
+        if hasattr(self.request.user, 'artisan_profile'):
+            booking = serializer.save(artisan=self.request.user.artisan_profile)
+        else:
+            raise serializers.ValidationError(
+                {'detail': 'You must create an artisan profile before adding bookings.'}
+            )
+        # Completed bookings count towards total_projects
+        schedule_stats_refresh(booking.artisan_id)
+    
+    def perform_update(self, serializer):
+        booking = serializer.save()
+        schedule_stats_refresh(booking.artisan_id)
+    
+    def perform_destroy(self, instance):
+        artisan_id = instance.artisan_id
+        instance.delete()
+        schedule_stats_refresh(artisan_id)
+
+
+class ReviewViewSet(StreamingListMixin, VersionedCacheMixin, viewsets.ModelViewSet):
     """Reviews for artisans"""
-    queryset = Review.objects.all()
+    cache_models = (Review, User)
+    queryset = Review.objects.select_related('reviewer')
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     
@@ -158,10 +297,29 @@ class ReviewViewSet(viewsets.ModelViewSet):
         # Automatically set the reviewer to the current user
         review = serializer.save(reviewer=self.request.user)
         
-        # Update artisan's average rating and review count
-        artisan = review.artisan
-        reviews = artisan.reviews.all()
-        artisan.average_rating = reviews.aggregate(Avg('rating'))['rating__avg'] or 0
-        artisan.total_reviews = reviews.count()
-        artisan.save()
+        # Artisan's average rating and review counts are refreshed in the background
+        schedule_stats_refresh(review.artisan_id)
+    
+    def perform_update(self, serializer):
+        previous_artisan_id = serializer.instance.artisan_id
+        review = serializer.save()
+        schedule_stats_refresh(review.artisan_id)
+        if review.artisan_id != previous_artisan_id:
+            schedule_stats_refresh(previous_artisan_id)
+    
+    def perform_destroy(self, instance):
+        artisan_id = instance.artisan_id
+        instance.delete()
+        schedule_stats_refresh(artisan_id)
+
+
+class MarketplaceCacheStatsView(APIView):
+    """Hit/miss counters of the marketplace response cache for this worker"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats.snapshot())
 
+    def delete(self, request):
+        cache_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,3 +1,48 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.core.cache import caches
+from django.http import FileResponse, Http404
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from api import profiling
+
+
+class CacheStatsView(APIView):
+    """Per-tier hit/miss counters of the tiered caches in this worker"""
+    permission_classes = [IsAdminUser]
+
+    def tiered_caches(self):
+        return {alias: caches[alias] for alias in settings.CACHES if hasattr(caches[alias], 'describe')}
+
+    def get(self, request):
+        return Response({alias: cache.describe() for alias, cache in self.tiered_caches().items()})
+
+    def delete(self, request):
+        for cache in self.tiered_caches().values():
+            cache.reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileListView(APIView):
+    """Ids of the stored request profiles, newest first"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(profiling.list_profiles())
+
+
+class ProfileDetailView(APIView):
+    """A stored profile's summary and SQL timeline; ``?download=1`` for its .prof/.folded file"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id):
+        summary, artifact = profiling.load_profile(profile_id)
+        if summary is None:
+            raise Http404
+        if request.query_params.get('download'):
+            if artifact is None or not artifact.is_file():
+                raise Http404
+            return FileResponse(artifact.open('rb'), as_attachment=True, filename=artifact.name)
+        return Response(summary)
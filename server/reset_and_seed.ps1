@@ -1,4 +1,9 @@
 # DreamSpace PM - Database Reset and Seed Script
+# Usage: .\reset_and_seed.ps1 [-Fresh]
+#   Restores the seeded snapshot when one exists; -Fresh rebuilds it from
+#   migrations and seed_data.
+
+param([switch]$Fresh)
 
 Write-Host "DreamSpace PM - Resetting Database and Seeding Data" -ForegroundColor Cyan
 Write-Host ""
@@ -9,49 +14,37 @@ if (-not (Test-Path "manage.py")) {
     exit 1
 }
 
+if (-not $Fresh -and (Test-Path "db.snapshot.sqlite3")) {
+    Write-Host "Restoring seeded snapshot..." -ForegroundColor Yellow
+    python manage.py db_snapshot restore
+    if ($LASTEXITCODE -ne 0) { exit 1 }
+    # Apply any migrations added since the snapshot was taken
+    python manage.py migrate
+    Write-Host ""
+    Write-Host "Database reset complete! (run with -Fresh to rebuild the snapshot)" -ForegroundColor Green
+    exit 0
+}
+
 # Remove existing database
 Write-Host "Removing existing database..." -ForegroundColor Yellow
 if (Test-Path "db.sqlite3") {
-    Remove-Item "db.sqlite3" -Force
+    Remove-Item "db.sqlite3*" -Force
     Write-Host "  Database removed" -ForegroundColor Green
 } else {
     Write-Host "  No existing database found" -ForegroundColor Gray
 }
 
-# Remove existing migrations (except __init__.py)
-Write-Host ""
-Write-Host "Removing old migrations..." -ForegroundColor Yellow
-
-$apps = @("api\users", "api\projects", "api\moodboards", "api\vendors")
-foreach ($app in $apps) {
-    $migrationsPath = "$app\migrations"
-    if (Test-Path $migrationsPath) {
-        Get-ChildItem $migrationsPath -Filter "*.py" | Where-Object { $_.Name -ne "__init__.py" } | ForEach-Object {
-            Remove-Item $_.FullName -Force
-            Write-Host "  Removed $($_.Name)" -ForegroundColor Gray
-        }
-        # Also remove __pycache__
-        $pycachePath = "$migrationsPath\__pycache__"
-        if (Test-Path $pycachePath) {
-            Remove-Item $pycachePath -Recurse -Force
-        }
-    }
-}
-
-# Create new migrations
-Write-Host ""
-Write-Host "Creating new migrations..." -ForegroundColor Yellow
-python manage.py makemigrations
-
 # Run migrations
 Write-Host ""
 Write-Host "Running migrations..." -ForegroundColor Yellow
 python manage.py migrate
+if ($LASTEXITCODE -ne 0) { exit 1 }
 
-# Seed data
+# Seed data and snapshot it for fast resets
 Write-Host ""
 Write-Host "Seeding database with sample data..." -ForegroundColor Yellow
-python manage.py seed_data
+python manage.py seed_data --snapshot
+if ($LASTEXITCODE -ne 0) { exit 1 }
 
 Write-Host ""
 Write-Host "Database reset and seeding complete!" -ForegroundColor Green
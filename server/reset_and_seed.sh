@@ -1,4 +1,7 @@
 #!/bin/bash
+# Usage: ./reset_and_seed.sh [--fresh]
+#   Restores the seeded snapshot when one exists; --fresh rebuilds it from
+#   migrations and seed_data.
 
 echo "DreamSpace PM - Resetting Database and Seeding Data"
 echo ""
@@ -9,41 +12,34 @@ if [ ! -f "manage.py" ]; then
     exit 1
 fi
 
+if [ "$1" != "--fresh" ] && [ -f "db.snapshot.sqlite3" ]; then
+    echo "Restoring seeded snapshot..."
+    python manage.py db_snapshot restore || exit 1
+    # Apply any migrations added since the snapshot was taken
+    python manage.py migrate
+    echo ""
+    echo "Database reset complete! (run with --fresh to rebuild the snapshot)"
+    exit 0
+fi
+
 # Remove existing database
 echo "Removing existing database..."
 if [ -f "db.sqlite3" ]; then
-    rm -f db.sqlite3
+    rm -f db.sqlite3 db.sqlite3-wal db.sqlite3-shm
     echo "  Database removed"
 else
     echo "  No existing database found"
 fi
 
-# Remove existing migrations (except __init__.py)
-echo ""
-echo "Removing old migrations..."
-
-for app in "api/users" "api/projects" "api/moodboards" "api/vendors"; do
-    migrations_path="$app/migrations"
-    if [ -d "$migrations_path" ]; then
-        find "$migrations_path" -name "*.py" ! -name "__init__.py" -delete
-        find "$migrations_path" -name "__pycache__" -type d -exec rm -rf {} + 2>/dev/null
-    fi
-done
-
-# Create new migrations
-echo ""
-echo "Creating new migrations..."
-python manage.py makemigrations
-
 # Run migrations
 echo ""
 echo "Running migrations..."
-python manage.py migrate
+python manage.py migrate || exit 1
 
-# Seed data
+# Seed data and snapshot it for fast resets
 echo ""
 echo "Seeding database with sample data..."
-python manage.py seed_data
+python manage.py seed_data --snapshot || exit 1
 
 echo ""
 echo "Database reset and seeding complete!"